@@ -0,0 +1,85 @@
+import argparse
+import gzip
+import json
+import os
+import tempfile
+import time
+
+import ijson
+
+from kgx.source import JsonSource
+from kgx.transformer import Transformer
+
+"""
+A script comparing the throughput of JsonSource.parse, which reads the
+nodes and then the edges of a KGX JSON in separate passes over the file,
+against JsonSource.read_json, which reads both in a single pass.
+"""
+
+
+parser = argparse.ArgumentParser(description='Benchmark the reading of a KGX JSON')
+parser.add_argument('--nodes', type=int, default=100000, help='Number of nodes of the generated graph')
+parser.add_argument('--edges', type=int, default=200000, help='Number of edges of the generated graph')
+parser.add_argument('--compression', help="Compression of the generated graph ('gz')")
+parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs of each method')
+args = parser.parse_args()
+
+
+def write_graph(filename: str):
+    opener = gzip.open if args.compression == 'gz' else open
+    with opener(filename, 'wt') as f:
+        json.dump(
+            {
+                'nodes': [
+                    {
+                        'id': f'HGNC:{i}',
+                        'name': f'gene {i}',
+                        'category': ['biolink:Gene'],
+                        'provided_by': ['benchmark'],
+                    }
+                    for i in range(args.nodes)
+                ],
+                'edges': [
+                    {
+                        'id': f'e{i}',
+                        'subject': f'HGNC:{i % args.nodes}',
+                        'predicate': 'biolink:interacts_with',
+                        'object': f'HGNC:{(i * 7) % args.nodes}',
+                        'relation': 'RO:0002434',
+                    }
+                    for i in range(args.edges)
+                ],
+            },
+            f,
+        )
+
+
+def two_pass(filename: str) -> int:
+    s = JsonSource(Transformer())
+    return sum(1 for _ in s.parse(filename, compression=args.compression))
+
+
+def single_pass(filename: str) -> int:
+    s = JsonSource(Transformer())
+    return sum(1 for _ in s.read_json(filename, compression=args.compression))
+
+
+def timed(method, filename: str) -> float:
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        count = method(filename)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    assert count == args.nodes + args.edges
+    return best
+
+
+with tempfile.TemporaryDirectory() as directory:
+    filename = os.path.join(directory, 'graph.json')
+    write_graph(filename)
+    print(f"ijson backend: {ijson.backend}")
+    print(f"{args.nodes} nodes, {args.edges} edges, {os.path.getsize(filename)} bytes")
+    for name, method in (('two passes', two_pass), ('single pass', single_pass)):
+        elapsed = timed(method, filename)
+        print(f"{name:>12}: {elapsed:.2f}s, {(args.nodes + args.edges) / elapsed:.0f} records/s")
@@ -0,0 +1,81 @@
+import argparse
+import os
+import tempfile
+import time
+
+from kgx.parsers.ntriples_parser import CustomNTriplesParser, FastNTriplesParser
+from kgx.source import RdfSource
+from kgx.transformer import Transformer
+
+"""
+A script comparing the throughput of the CustomNTriplesParser, based on the
+rdflib N-Triples parser, against the FastNTriplesParser, both tokenizing
+alone and feeding an RdfSource. An existing N-Triples file (e.g. a multi-GB
+ingest) may be given with --filename, in place of a generated one.
+"""
+
+
+parser = argparse.ArgumentParser(description='Benchmark the parsing of N-Triples')
+parser.add_argument('--filename', help='N-Triples file to parse (generated if not given)')
+parser.add_argument('--triples', type=int, default=300000, help='Number of triples of the generated file')
+parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs of each parser')
+parser.add_argument('--tokenize-only', action='store_true', help='Only time the tokenization of the triples')
+args = parser.parse_args()
+
+
+def write_triples(filename: str):
+    with open(filename, 'w') as f:
+        for i in range(args.triples // 3):
+            s = f'<http://identifiers.org/hgnc/{i}>'
+            f.write(f'{s} <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <https://w3id.org/biolink/vocab/Gene> .\n')
+            f.write(f'{s} <http://www.w3.org/2000/01/rdf-schema#label> "gene {i}" .\n')
+            f.write(f'{s} <https://w3id.org/biolink/vocab/interacts_with> <http://identifiers.org/hgnc/{(i * 7) % 1000}> .\n')
+
+
+class CountingSink(object):
+    def __init__(self):
+        self.count = 0
+
+    def triple(self, s, p, o):
+        self.count += 1
+        yield None
+
+
+def tokenize(parser_class, filename: str) -> int:
+    sink = CountingSink()
+    with open(filename, 'rb') as FH:
+        for _ in parser_class(sink).parse(FH):
+            pass
+    return sink.count
+
+
+def ingest(parser_class, filename: str) -> int:
+    source = RdfSource(Transformer())
+    source.set_provenance_map({})
+    with open(filename, 'rb') as FH:
+        for _ in parser_class(source).parse(FH):
+            pass
+    return source.count
+
+
+def timed(method, parser_class, filename: str) -> float:
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        count = method(parser_class, filename)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count
+
+
+with tempfile.TemporaryDirectory() as directory:
+    filename = args.filename
+    if not filename:
+        filename = os.path.join(directory, 'graph.nt')
+        write_triples(filename)
+    print(f"{os.path.getsize(filename)} bytes")
+    methods = (('tokenize', tokenize),) if args.tokenize_only else (('tokenize', tokenize), ('ingest', ingest))
+    for name, method in methods:
+        for parser_class in (CustomNTriplesParser, FastNTriplesParser):
+            elapsed, count = timed(method, parser_class, filename)
+            print(f"{name:>8} {parser_class.__name__:>20}: {elapsed:.2f}s, {count / elapsed:.0f} triples/s")
@@ -0,0 +1,80 @@
+import argparse
+import os
+import tempfile
+import time
+
+from kgx.sink import RdfSink, TsvSink
+from kgx.transformer import Transformer
+
+"""
+A script comparing the throughput of the RdfSink, writing N-Triples with
+one or more processes, against the TsvSink, for a generated graph.
+"""
+
+
+parser = argparse.ArgumentParser(description='Benchmark the writing of N-Triples')
+parser.add_argument('--nodes', type=int, default=100000, help='Number of nodes (and edges) of the generated graph')
+parser.add_argument('--processes', type=int, nargs='*', default=[1, 4], help='Numbers of processes of the RdfSink')
+parser.add_argument('--reify-all-edges', action='store_true', help='Reify every edge of the graph')
+args = parser.parse_args()
+
+
+def nodes():
+    for i in range(args.nodes):
+        yield {
+            'id': f'HGNC:{i}',
+            'name': f'gene {i}',
+            'category': ['biolink:Gene'],
+            'provided_by': ['infores:hgnc'],
+        }
+
+
+def edges():
+    for i in range(args.nodes):
+        yield {
+            'id': f'urn:uuid:{i}',
+            'subject': f'HGNC:{i}',
+            'predicate': 'biolink:interacts_with',
+            'object': f'HGNC:{(i * 7) % args.nodes}',
+            'primary_knowledge_source': 'infores:string',
+            'knowledge_level': 'knowledge_assertion',
+            'agent_type': 'manual_agent',
+            'publications': [f'PMID:{i}'],
+        }
+
+
+def write(sink) -> float:
+    start = time.perf_counter()
+    for record in nodes():
+        sink.write_node(record)
+    for record in edges():
+        sink.write_edge(record)
+    sink.finalize()
+    return time.perf_counter() - start
+
+
+with tempfile.TemporaryDirectory() as directory:
+    records = 2 * args.nodes
+    elapsed = write(
+        TsvSink(
+            Transformer(),
+            os.path.join(directory, 'graph'),
+            'tsv',
+            node_properties={'id', 'name', 'category', 'provided_by'},
+            edge_properties={
+                'id', 'subject', 'predicate', 'object', 'primary_knowledge_source',
+                'knowledge_level', 'agent_type', 'publications',
+            },
+        )
+    )
+    print(f"{'TsvSink':>20}: {elapsed:.2f}s, {records / elapsed:.0f} records/s")
+    for processes in args.processes:
+        elapsed = write(
+            RdfSink(
+                Transformer(),
+                os.path.join(directory, 'graph.nt'),
+                reify_all_edges=args.reify_all_edges,
+                processes=processes,
+            )
+        )
+        print(f"{f'RdfSink ({processes})':>20}: {elapsed:.2f}s, {records / elapsed:.0f} records/s")
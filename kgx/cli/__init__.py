@@ -11,6 +11,7 @@ from kgx.cli.cli_utils import (
     apply_operations,
     graph_summary,
     validate,
+    inspect_graph,
     neo4j_download,
     neo4j_upload,
     arango_download,
@@ -91,6 +92,20 @@ def cli():
     type=click.Path(exists=False),
     help='File within which to get_errors graph data parsing errors (default: "stderr")',
 )
+@click.option(
+    "--processes",
+    "-p",
+    required=False,
+    type=int,
+    default=1,
+    help="Number of processes to use",
+)
+@click.option(
+    "--node-catalog-directory",
+    required=False,
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory in which to spill the catalog of nodes (default: held in memory)",
+)
 def graph_summary_wrapper(
     inputs: List[str],
     input_format: str,
@@ -101,7 +116,9 @@ def graph_summary_wrapper(
     graph_name: str,
     node_facet_properties: Optional[List],
     edge_facet_properties: Optional[List],
-    error_log: str = ''
+    error_log: str = '',
+    processes: int = 1,
+    node_catalog_directory: Optional[str] = None,
 ):
     """
     Loads and summarizes a knowledge graph from a set of input files.
@@ -131,6 +148,10 @@ def graph_summary_wrapper(
         For example, ``['original_knowledge_source', 'aggregator_knowledge_source']``
     error_log: str
         Where to write any graph processing error message (stderr, by default, for empty argument)
+    processes: int
+        Number of processes to use
+    node_catalog_directory: Optional[str]
+        Directory in which to spill the catalog of nodes (held in memory, by default)
     """
     try:
         graph_summary(
@@ -144,6 +165,8 @@ def graph_summary_wrapper(
             node_facet_properties=list(node_facet_properties),
             edge_facet_properties=list(edge_facet_properties),
             error_log=error_log,
+            processes=processes,
+            node_catalog_directory=node_catalog_directory,
         )
         exit(0)
     except Exception as gse:
@@ -215,6 +238,140 @@ def validate_wrapper(
         exit(0)
 
 
+@cli.command(name="inspect")
+@click.argument("inputs", required=True, type=click.Path(exists=True), nargs=-1)
+@click.option(
+    "--input-format",
+    "-i",
+    required=True,
+    help=f"The input format. Can be one of {get_input_file_types()}",
+)
+@click.option(
+    "--input-compression", "-c", required=False, help="The input compression type"
+)
+@click.option(
+    "--validation-output",
+    required=False,
+    type=click.Path(exists=False),
+    help="File to write the validation report to",
+)
+@click.option(
+    "--graph-summary-output",
+    required=False,
+    type=click.Path(exists=False),
+    help="File to write the graph summary ('kgx-map') report to",
+)
+@click.option(
+    "--meta-knowledge-graph-output",
+    required=False,
+    type=click.Path(exists=False),
+    help="File to write the meta knowledge graph report to",
+)
+@click.option(
+    "--biolink-release",
+    "-b",
+    required=False,
+    help="Biolink Model Release (SemVer) used for validation (default: latest Biolink Model Toolkit version)",
+)
+@click.option(
+    "--graph-name",
+    "-n",
+    required=False,
+    help="User specified name of graph being summarized (default: 'Graph')",
+)
+@click.option(
+    "--node-facet-properties",
+    required=False,
+    multiple=True,
+    help="A list of node properties from which to generate counts per value for those properties",
+)
+@click.option(
+    "--edge-facet-properties",
+    required=False,
+    multiple=True,
+    help="A list of edge properties from which to generate counts per value for those properties",
+)
+@click.option(
+    "--error-log",
+    "-l",
+    required=False,
+    type=click.Path(exists=False),
+    help='File within which to get_errors graph data parsing errors (default: "stderr")',
+)
+@click.option(
+    "--inspector-workers",
+    required=False,
+    type=click.Choice(["thread", "process"]),
+    help="Run each inspector in a worker thread or process of its own",
+)
+def inspect_wrapper(
+    inputs: List[str],
+    input_format: str,
+    input_compression: Optional[str],
+    validation_output: Optional[str],
+    graph_summary_output: Optional[str],
+    meta_knowledge_graph_output: Optional[str],
+    biolink_release: Optional[str],
+    graph_name: Optional[str],
+    node_facet_properties: Optional[List],
+    edge_facet_properties: Optional[List],
+    error_log: str = '',
+    inspector_workers: Optional[str] = None,
+):
+    """
+    Validate and summarize a knowledge graph in a single pass over a set of input files.
+    \f
+
+    Parameters
+    ----------
+    inputs: List[str]
+        Input files
+    input_format: str
+        The input format
+    input_compression: Optional[str]
+        The input compression type
+    validation_output: Optional[str]
+        Path to the validation report
+    graph_summary_output: Optional[str]
+        Path to the graph summary (YAML) report
+    meta_knowledge_graph_output: Optional[str]
+        Path to the meta knowledge graph (JSON) report
+    biolink_release: Optional[str]
+        SemVer version of Biolink Model Release used for validation (default: latest Biolink Model Toolkit version)
+    graph_name: str
+        User specified name of graph being summarized
+    node_facet_properties: Optional[List]
+        A list of node properties from which to generate counts per value for those properties.
+        For example, ``['provided_by']``
+    edge_facet_properties: Optional[List]
+        A list of edge properties from which to generate counts per value for those properties.
+        For example, ``['original_knowledge_source', 'aggregator_knowledge_source']``
+    error_log: str
+        Where to write any graph processing error message (stderr, by default, for empty argument)
+    inspector_workers: Optional[str]
+        Optional 'thread' or 'process', to run each inspector in a worker of its own
+    """
+    try:
+        inspect_graph(
+            inputs,
+            input_format,
+            input_compression,
+            validation_output=validation_output,
+            graph_summary_output=graph_summary_output,
+            meta_knowledge_graph_output=meta_knowledge_graph_output,
+            biolink_release=biolink_release,
+            graph_name=graph_name,
+            node_facet_properties=list(node_facet_properties),
+            edge_facet_properties=list(edge_facet_properties),
+            error_log=error_log,
+            inspector_workers=inspector_workers,
+        )
+        exit(0)
+    except Exception as ie:
+        get_logger().error(f"kgx.inspect error: {str(ie)}")
+        exit(1)
+
+
 @cli.command(name="neo4j-download")
 @click.option(
     "--uri",
@@ -731,6 +888,21 @@ def arangodb_upload_wrapper(
     default=1,
     help="Number of processes to use",
 )
+@click.option(
+    "--discover-properties",
+    is_flag=True,
+    help="Discover the columns of a streamed TSV/CSV output from its records",
+)
+@click.option(
+    "--pipelined",
+    is_flag=True,
+    help="Read the records on a background thread, overlapping parsing with writing (with --stream)",
+)
+@click.option(
+    "--deduplicate",
+    is_flag=True,
+    help="Merge the records of the same node (or edge) into a single record (with --stream)",
+)
 def transform_wrapper(
     inputs: List[str],
     input_format: str,
@@ -746,6 +918,9 @@ def transform_wrapper(
     knowledge_sources: Optional[List[Tuple[str, str]]],
     processes: int,
     infores_catalog: Optional[str] = None,
+    discover_properties: bool = False,
+    pipelined: bool = False,
+    deduplicate: bool = False,
 ):
     """
     Transform a Knowledge Graph from one serialization form to another.
@@ -781,6 +956,12 @@ def transform_wrapper(
         Optional dump of a TSV file of InfoRes CURIE to Knowledge Source mappings
     processes: int
         Number of processes to use
+    discover_properties: bool
+        Whether to discover the columns of a streamed TSV/CSV output from its records
+    pipelined: bool
+        Whether to read the records on a background thread, when streaming
+    deduplicate: bool
+        Whether to merge the records of the same node (or edge), when streaming
 
     """
     try:
@@ -799,6 +980,9 @@ def transform_wrapper(
             knowledge_sources=knowledge_sources,
             processes=processes,
             infores_catalog=infores_catalog,
+            discover_properties=discover_properties,
+            pipelined=pipelined,
+            deduplicate=deduplicate,
         )
         exit(0)
     except Exception as te:
@@ -5,7 +5,7 @@ from os.path import dirname, abspath
 
 from sys import stdout
 from multiprocessing import Pool
-from typing import List, Tuple, Optional, Dict, Set, Union
+from typing import List, Tuple, Optional, Dict, Set, Union, Generator
 import yaml
 
 from kgx.validator import Validator
@@ -15,7 +15,12 @@ from kgx.config import get_logger
 from kgx.graph.base_graph import BaseGraph
 from kgx.graph_operations.graph_merge import merge_all_graphs
 from kgx.graph_operations import summarize_graph, meta_knowledge_graph
-from kgx.utils.kgx_utils import apply_graph_operations, knowledge_provenance_properties
+from kgx.utils.node_index import NodeCatalog
+from kgx.utils.kgx_utils import (
+    apply_graph_operations,
+    knowledge_provenance_properties,
+    GraphEntityType,
+)
 from pprint import pprint
 
 summary_report_types = {
@@ -76,10 +81,19 @@ def graph_summary(
     node_facet_properties: Optional[List] = None,
     edge_facet_properties: Optional[List] = None,
     error_log: str = "",
+    processes: int = 1,
+    node_catalog_directory: Optional[str] = None,
 ) -> Dict:
     """
     Loads and summarizes a knowledge graph from a set of input files.
 
+    With more than one process, the input files are summarized in parallel:
+    first the node files (one file per process), then, once the resulting node
+    catalogs are merged and shared with each process, the edge files. The
+    partial summaries are merged into the final summary. Input files named
+    as node (e.g. ``*nodes.tsv``) or edge (e.g. ``*edges.tsv``) files are
+    only read in the respective phase; any other file is read in both.
+
     Parameters
     ----------
     inputs: List[str]
@@ -104,6 +118,11 @@ def graph_summary(
         For example, ``['original_knowledge_source', 'aggregator_knowledge_source']``
     error_log: str
         Where to write any graph processing error message (stderr, by default)
+    processes: int
+        Number of processes to use
+    node_catalog_directory: Optional[str]
+        Directory in which to spill the catalog of nodes, as memory-mapped files
+        (the catalog is held in memory, by default)
 
     Returns
     -------
@@ -132,27 +151,44 @@ def graph_summary(
             node_facet_properties=node_facet_properties,
             edge_facet_properties=edge_facet_properties,
             error_log=error_log,
+            node_catalog_directory=node_catalog_directory,
         )
     else:
         raise ValueError(f"report_type must be one of {summary_report_types.keys()}")
 
-    # streaming assumed, throwing away the output graph
-    output_args = {"format": "null"}
+    if processes > 1 and len(inputs) > 1:
+        _parallel_graph_summary(
+            inspector,
+            inputs,
+            input_format,
+            input_compression,
+            report_type,
+            summary_args={
+                "name": graph_name,
+                "node_facet_properties": node_facet_properties,
+                "edge_facet_properties": edge_facet_properties,
+                "node_catalog_directory": node_catalog_directory,
+            },
+            processes=processes,
+        )
+    else:
+        # streaming assumed, throwing away the output graph
+        output_args = {"format": "null"}
 
-    # default here is for Streaming to be applied
-    transformer = Transformer(stream=True)
+        # default here is for Streaming to be applied
+        transformer = Transformer(stream=True)
 
-    transformer.transform(
-        input_args={
-            "filename": inputs,
-            "format": input_format,
-            "compression": input_compression,
-        },
-        output_args=output_args,
-        # ... Second, we inject the Inspector into the transform() call,
-        # for the underlying Transformer.process() to use...
-        inspector=inspector,
-    )
+        transformer.transform(
+            input_args={
+                "filename": inputs,
+                "format": input_format,
+                "compression": input_compression,
+            },
+            output_args=output_args,
+            # ... Second, we inject the Inspector into the transform() call,
+            # for the underlying Transformer.process() to use...
+            inspector=inspector,
+        )
 
     if output:
         with open(output, "w") as gsr:
@@ -164,6 +200,127 @@ def graph_summary(
     return inspector.get_graph_summary()
 
 
+# node catalog of the summarized node files, shared
+# with the processes summarizing the edge files
+_shared_node_catalog = None
+
+
+def _share_node_catalog(node_catalog) -> None:
+    global _shared_node_catalog
+    _shared_node_catalog = node_catalog
+
+
+def _summarize_shard(
+    report_type: str,
+    summary_args: Dict,
+    filename: str,
+    input_format: str,
+    input_compression: Optional[str],
+    entity_type: GraphEntityType,
+):
+    """
+    Summarize either the nodes or the edges of one input file.
+    """
+    shard = summary_report_types[report_type](**summary_args)
+    if entity_type == GraphEntityType.EDGE:
+        shard.share_node_catalog(_shared_node_catalog)
+
+    def shard_inspector(record_type: GraphEntityType, rec: List):
+        if record_type == entity_type:
+            shard(record_type, rec)
+
+    transformer = Transformer(stream=True)
+    transformer.transform(
+        input_args={
+            "filename": [filename],
+            "format": input_format,
+            "compression": input_compression,
+        },
+        output_args={"format": "null"},
+        inspector=shard_inspector,
+    )
+
+    if entity_type == GraphEntityType.EDGE:
+        # no need to send the shared node catalog back
+        shard.node_catalog = NodeCatalog()
+    else:
+        # the node catalog (spilled to disk, perhaps) is sent back to the parent process
+        shard.node_catalog.hand_over()
+    return shard
+
+
+def _read_nodes(
+    filename: str, input_format: str, input_compression: Optional[str]
+) -> Generator:
+    """
+    Read the node records of one input file, as a transform streams them.
+    """
+    source = Transformer(stream=True).get_source(input_format)
+    for rec in source.parse(
+        filename,
+        format=input_format,
+        compression=input_compression,
+        default_provenance=os.path.basename(filename),
+    ):
+        if rec and len(rec) == 2:
+            yield rec
+
+
+def _parallel_graph_summary(
+    inspector,
+    inputs: List[str],
+    input_format: str,
+    input_compression: Optional[str],
+    report_type: str,
+    summary_args: Dict,
+    processes: int,
+) -> None:
+    """
+    Summarize input files in parallel, merging the summaries into ``inspector``.
+    """
+    node_files = [
+        f for f in inputs if f"edges.{input_format}" not in os.path.basename(f)
+    ]
+    edge_files = [
+        f for f in inputs if f"nodes.{input_format}" not in os.path.basename(f)
+    ]
+
+    with Pool(processes=processes) as pool:
+        for f, shard in zip(
+            node_files,
+            pool.starmap(
+                _summarize_shard,
+                [
+                    (report_type, summary_args, f, input_format, input_compression, GraphEntityType.NODE)
+                    for f in node_files
+                ],
+            ),
+        ):
+            # the nodes of a file which has nodes of earlier files are read once
+            # again (by the parent process), such that the duplicates are left out
+            inspector.merge(shard, nodes=_read_nodes(f, input_format, input_compression))
+
+    # a bare summary, holding just the node catalog, is broadcast once to each process
+    node_catalog = summary_report_types[report_type](
+        node_catalog_directory=summary_args.get("node_catalog_directory")
+    )
+    node_catalog.share_node_catalog(inspector)
+
+    with Pool(
+        processes=processes,
+        initializer=_share_node_catalog,
+        initargs=(node_catalog,),
+    ) as pool:
+        for shard in pool.starmap(
+            _summarize_shard,
+            [
+                (report_type, summary_args, f, input_format, input_compression, GraphEntityType.EDGE)
+                for f in edge_files
+            ],
+        ):
+            inspector.merge(shard)
+
+
 def validate(
     inputs: List[str],
     input_format: str,
@@ -229,6 +386,132 @@ def validate(
     return validator.get_errors()
 
 
+def inspect_graph(
+    inputs: List[str],
+    input_format: str,
+    input_compression: Optional[str],
+    validation_output: Optional[str] = None,
+    graph_summary_output: Optional[str] = None,
+    meta_knowledge_graph_output: Optional[str] = None,
+    biolink_release: Optional[str] = None,
+    graph_name: Optional[str] = None,
+    node_facet_properties: Optional[List] = None,
+    edge_facet_properties: Optional[List] = None,
+    error_log: str = "",
+    inspector_workers: Optional[str] = None,
+) -> Dict:
+    """
+    Validate and summarize a knowledge graph in a single pass over a set of input files.
+
+    Each one of the validation report, the graph summary ('kgx-map') and the
+    meta knowledge graph is only generated if an output is given for it.
+
+    Parameters
+    ----------
+    inputs: List[str]
+        Input files
+    input_format: str
+        The input format
+    input_compression: Optional[str]
+        The input compression type
+    validation_output: Optional[str]
+        Path to the validation report
+    graph_summary_output: Optional[str]
+        Path to the graph summary (YAML) report
+    meta_knowledge_graph_output: Optional[str]
+        Path to the meta knowledge graph (JSON) report
+    biolink_release: Optional[str] = None
+        SemVer version of Biolink Model Release used for validation (default: latest Biolink Model Toolkit version)
+    graph_name: str
+        User specified name of graph being summarized
+    node_facet_properties: Optional[List]
+        A list of node properties from which to generate counts per value for those properties.
+        For example, ``['provided_by']``
+    edge_facet_properties: Optional[List]
+        A list of edge properties (e.g. knowledge_source tags) to facet on.
+        For example, ``['original_knowledge_source', 'aggregator_knowledge_source']``
+    error_log: str
+        Where to write any graph processing error message of the summaries (stderr, by default),
+        one report after the other
+    inspector_workers: Optional[str]
+        Optional 'thread' or 'process', to run each inspector in a worker of its own
+
+    Returns
+    -------
+    Dict
+        A dictionary with the validation errors ('validation'), the graph summary
+        ('graph_summary') and the meta knowledge graph ('meta_knowledge_graph'), as generated
+
+    """
+    if not (validation_output or graph_summary_output or meta_knowledge_graph_output):
+        raise ValueError("At least one of the validation, graph summary or meta knowledge graph outputs is required")
+
+    if not graph_name:
+        graph_name = "Graph"
+
+    inspectors = dict()
+    if validation_output:
+        Validator.set_biolink_model(biolink_release)
+        inspectors["validation"] = Validator()
+    # the error log is opened once, and shared by the summaries,
+    # as each summary would otherwise truncate the file once again
+    error_log_stream = (
+        open(error_log, "w")
+        if error_log and (graph_summary_output or meta_knowledge_graph_output)
+        else None
+    )
+    try:
+        summary_args = {
+            "name": graph_name,
+            "node_facet_properties": node_facet_properties,
+            "edge_facet_properties": edge_facet_properties,
+            "error_log": error_log_stream,
+        }
+        if graph_summary_output:
+            inspectors["graph_summary"] = summary_report_types["kgx-map"](**summary_args)
+        if meta_knowledge_graph_output:
+            inspectors["meta_knowledge_graph"] = summary_report_types["meta-knowledge-graph"](**summary_args)
+
+        transformer = Transformer(stream=True)
+
+        transformer.transform(
+            input_args={
+                "filename": inputs,
+                "format": input_format,
+                "compression": input_compression,
+            },
+            output_args={
+                "format": "null"
+            },  # streaming processing throws the graph data away
+            inspector=list(inspectors.values()),
+            inspector_workers=inspector_workers,
+        )
+
+        if error_log_stream:
+            for summary in ("graph_summary", "meta_knowledge_graph"):
+                if summary in inspectors:
+                    inspectors[summary].write_report()
+    finally:
+        if error_log_stream:
+            error_log_stream.close()
+
+    results = dict()
+    if validation_output:
+        with open(validation_output, "w") as vr:
+            inspectors["validation"].write_report(vr)
+        results["validation"] = inspectors["validation"].get_errors()
+    if graph_summary_output:
+        with open(graph_summary_output, "w") as gsr:
+            inspectors["graph_summary"].save(gsr)
+        results["graph_summary"] = inspectors["graph_summary"].get_graph_summary()
+    if meta_knowledge_graph_output:
+        with open(meta_knowledge_graph_output, "w") as mkg:
+            inspectors["meta_knowledge_graph"].save(mkg)
+        results["meta_knowledge_graph"] = inspectors["meta_knowledge_graph"].get_graph_summary()
+
+    return results
+
+
 def neo4j_download(
     uri: str,
     username: str,
@@ -567,6 +850,9 @@ def transform(
     # destination: Optional[List] = None,
     processes: int = 1,
     infores_catalog: Optional[str] = None,
+    discover_properties: bool = False,
+    pipelined: bool = False,
+    deduplicate: bool = False,
 ) -> None:
     """
     Transform a Knowledge Graph from one serialization form to another.
@@ -598,10 +884,23 @@ def transform(
     knowledge_sources: Optional[List[Tuple[str, str]]]
         A list of named knowledge sources with (string, boolean or tuple rewrite) specification
     processes: int
-        Number of processes to use
+        Number of processes to use, parsing either the sources of the
+        transform config, the members of TSV/CSV tar archives or the chunks
+        of TSV/CSV, JSON Lines and N-Triples files in parallel (and writing
+        N-Triples in parallel)
     infores_catalog: Optional[str]
         Optional dump of a TSV file of InfoRes CURIE to
         Knowledge Source mappings (not yet available in transform_config calling mode)
+    discover_properties: bool
+        Whether to discover the columns of a streamed TSV/CSV output from its records
+        (set by the ``discover_properties`` entry of a source ``output`` in transform_config mode)
+    pipelined: bool
+        Whether to read the records of the inputs on a background thread, overlapping
+        their parsing with their writing, when streaming (also set, for a single source,
+        by the ``pipelined`` entry of its ``input`` in transform_config mode)
+    deduplicate: bool
+        Whether to merge the records of the same node (or edge) into a single record, when
+        streaming (set by the ``deduplicate`` entry of a source ``output`` in transform_config mode)
 
     """
     if transform_config and inputs:
@@ -640,6 +939,11 @@ def transform(
                     file_paths=source_properties["input"]["filename"],
                     context=s,
                 )
+                if top_level_args.get("cache_directory"):
+                    # the parsed records of unchanged sources are read back from the cache
+                    source_properties["input"].setdefault(
+                        "cache_directory", top_level_args["cache_directory"]
+                    )
 
         source_to_parse = {}
         for key, val in cfg["transform"]["source"].items():
@@ -666,6 +970,7 @@ def transform(
                     False,
                     stream,
                 ),
+                {"pipelined": pipelined},
             )
             results.append(result)
         pool.close()
@@ -709,6 +1014,16 @@ def transform(
                         )
                 else:
                     source_dict["input"][ksf] = ksf_spec
+        if processes > 1 and input_format in {"tsv", "csv", "jsonl", "nt"}:
+            # the members of tar archives, or the chunks of a file, are parsed in parallel
+            source_dict["input"]["processes"] = processes
+        if processes > 1 and output_format == "nt":
+            # the records are turned into N-Triples in parallel
+            source_dict["output"]["processes"] = processes
+        if discover_properties:
+            source_dict["output"]["discover_properties"] = True
+        if deduplicate:
+            source_dict["output"]["deduplicate"] = True
         log.debug("source_dict", source_dict)
         name = os.path.basename(inputs[0])
         transform_source(
@@ -717,6 +1032,7 @@ def transform(
             output_directory=None,
             stream=stream,
             infores_catalog=infores_catalog,
+            pipelined=pipelined,
         )
 
 
@@ -784,6 +1100,11 @@ def merge(
             source_properties["input"]["filename"] = _validate_files(
                 cwd=cwd, file_paths=source_properties["input"]["filename"], context=s
             )
+            if top_level_args.get("cache_directory"):
+                # the parsed records of unchanged sources are read back from the cache
+                source_properties["input"].setdefault(
+                    "cache_directory", top_level_args["cache_directory"]
+                )
 
     sources_to_parse = {}
     for key in cfg["merged_graph"]["source"]:
@@ -976,6 +1297,7 @@ def transform_source(
     preserve_graph: bool = True,
     stream: bool = False,
     infores_catalog: Optional[str] = None,
+    pipelined: bool = False,
 ) -> Sink:
     """
     Transform a source from a transform config YAML.
@@ -1009,6 +1331,9 @@ def transform_source(
         Whether to parse input as a stream
     infores_catalog: Optional[str]
         Optional dump of a TSV file of InfoRes CURIE to Knowledge Source mappings
+    pipelined: bool
+        Whether to read the records on a background thread, when streaming
+        (or else, as set by the ``pipelined`` entry of the source ``input``)
 
     Returns
     -------
@@ -1033,7 +1358,11 @@ def transform_source(
         reverse_predicate_mappings,
         property_types,
     )
-    transformer = Transformer(stream=stream, infores_catalog=infores_catalog)
+    transformer = Transformer(
+        stream=stream,
+        infores_catalog=infores_catalog,
+        pipelined=pipelined or source["input"].get("pipelined", False),
+    )
     transformer.transform(input_args, output_args)
 
     if not preserve_graph:
@@ -1169,6 +1498,24 @@ def prepare_input_args(
         if ksf in source["input"]:
             input_args[ksf] = source["input"][ksf]
 
+    if "remap_node_identifier" in source["input"]:
+        input_args["remap_node_identifier"] = source["input"]["remap_node_identifier"]
+
+    if "processes" in source["input"]:
+        input_args["processes"] = source["input"]["processes"]
+
+    if "archive_directory" in source["input"]:
+        input_args["archive_directory"] = source["input"]["archive_directory"]
+
+    if "edge_id_type" in source["input"]:
+        input_args["edge_id_type"] = source["input"]["edge_id_type"]
+
+    if "cache_directory" in source["input"]:
+        input_args["cache_directory"] = source["input"]["cache_directory"]
+
+    if "node_cache_directory" in source["input"] and input_format in {"nt", "ttl"}:
+        input_args["node_cache_directory"] = source["input"]["node_cache_directory"]
+
     input_args["operations"] = source["input"].get("operations", [])
     for o in input_args["operations"]:
         args = o["args"]
@@ -1265,6 +1612,8 @@ def prepare_output_args(
     elif output_format in get_input_file_types():
         output_args["filename"] = output
         output_args["compression"] = output_compression
+        if output_format in {"tsv", "csv"} and "discover_properties" in source["output"]:
+            output_args["discover_properties"] = source["output"]["discover_properties"]
         if output_format == "nt":
             output_args["reify_all_edges"] = (
                 source["output"]["reify_all_edges"]
@@ -1276,8 +1625,12 @@ def prepare_output_args(
                 source_reverse_predicate_mappings
             )
             output_args["property_types"] = source_property_types
+            if "processes" in source["output"]:
+                output_args["processes"] = source["output"]["processes"]
     else:
         raise ValueError(f"type {output_format} not yet supported for output")
+    if "deduplicate" in source["output"]:
+        output_args["deduplicate"] = source["output"]["deduplicate"]
 
     return output_args
 
@@ -1331,6 +1684,8 @@ def prepare_top_level_args(d: Dict) -> Dict:
         args["checkpoint"] = d["checkpoint"]
     else:
         args["checkpoint"] = False
+    if "cache_directory" in d and d["cache_directory"]:
+        args["cache_directory"] = d["cache_directory"]
     if "node_property_predicates" in d and d["node_property_predicates"]:
         args["node_property_predicates"] = set(d["node_property_predicates"])
     else:
@@ -86,6 +86,17 @@ class ErrorDetecting(object):
         else:
             self.error_log = None
     
+    def __getstate__(self):
+        # the (open) error log stream stays with the original object
+        # and is not carried over to copies, e.g. in other processes
+        state = self.__dict__.copy()
+        state.pop("error_log", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.error_log = None
+
     def clear_errors(self):
         """
         Clears the current error log list
@@ -123,6 +134,24 @@ class ErrorDetecting(object):
         self.errors[level][error][message] = [entity]
         self.errors[level][error][message].append(entity)
 
+    def merge_errors(self, other: "ErrorDetecting"):
+        """
+        Merge the errors captured by another ErrorDetecting
+        object into the errors of this object.
+
+        Parameters
+        ----------
+        other: ErrorDetecting
+            The object whose errors are to be merged in.
+        """
+        for level, errors in other.errors.items():
+            if level not in self.errors:
+                self.errors[level] = dict()
+            for error, messages in errors.items():
+                if error not in self.errors[level]:
+                    self.errors[level][error] = dict()
+                self.errors[level][error].update(messages)
+
     def get_errors(self, level: str = None) -> Dict:
         """
         Get the index list of distinct error messages.
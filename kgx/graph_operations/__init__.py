@@ -11,6 +11,7 @@ from kgx.utils.kgx_utils import (
     generate_edge_key,
     current_time_in_millis,
 )
+from kgx.utils.identifier_map import select_alternative_identifier
 
 log = get_logger()
 
@@ -41,33 +42,12 @@ def remap_node_identifier(
     """
     mapping: Dict = {}
     for nid, data in graph.nodes(data=True):
-        node_data = data.copy()
-        if "category" in node_data and category not in node_data["category"]:
+        # categorized nodes of other categories (all of them, if no category is given) are left as is
+        if "category" in data and category not in data["category"]:
             continue
-
-        if alternative_property in node_data:
-            alternative_values = node_data[alternative_property]
-            if isinstance(alternative_values, (list, set, tuple)):
-                if prefix:
-                    for v in alternative_values:
-                        if prefix in v:
-                            # take the first occurring value that contains the given prefix
-                            mapping[nid] = {"id": v}
-                            break
-                else:
-                    # no prefix defined; pick the 1st one from list
-                    mapping[nid] = {"id": next(iter(alternative_values))}
-            elif isinstance(alternative_values, str):
-                if prefix:
-                    if alternative_values.startswith(prefix):
-                        mapping[nid] = {"id": alternative_values}
-                else:
-                    # no prefix defined
-                    mapping[nid] = {"id": alternative_values}
-            else:
-                log.error(
-                    f"Cannot use {alternative_values} from alternative_property {alternative_property}"
-                )
+        new_id = select_alternative_identifier(data, None, alternative_property, prefix)
+        if new_id:
+            mapping[nid] = {"id": new_id}
 
     graph.set_node_attributes(graph, attributes=mapping)
     graph.relabel_nodes(graph, {k: list(v.values())[0] for k, v in mapping.items()})
@@ -1,7 +1,7 @@
 """
 Translator Reasoner API 'meta-knowledge-graph' endpoint analogous graph summary module.
 """
-from typing import Dict, List, Optional, Any, Callable, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Any, Callable, Set, Tuple
 import re
 
 import yaml
@@ -11,7 +11,8 @@ from json.encoder import JSONEncoder
 from deprecation import deprecated
 
 from kgx.error_detection import ErrorType, MessageLevel, ErrorDetecting
-from kgx.utils.kgx_utils import GraphEntityType
+from kgx.utils.kgx_utils import GraphEntityType, merge_counts
+from kgx.utils.node_index import NodeCatalog
 from kgx.prefix_manager import PrefixManager
 from kgx.graph.base_graph import BaseGraph
 
@@ -72,6 +73,7 @@ class MetaKnowledgeGraph(ErrorDetecting):
             edge_facet_properties: Optional[List] = None,
             progress_monitor: Optional[Callable[[GraphEntityType, List], None]] = None,
             error_log=None,
+            node_catalog_directory: Optional[str] = None,
             **kwargs,
     ):
         """
@@ -90,6 +92,9 @@ class MetaKnowledgeGraph(ErrorDetecting):
             Function given a peek at the current record being stream processed by the class wrapped Callable.
         error_log:
             Where to write any graph processing error message (stderr, by default).
+        node_catalog_directory: Optional[str]
+            Directory in which to spill the catalog of nodes, as memory-mapped files
+            (the catalog is held in memory, by default).
         """
         
         ErrorDetecting.__init__(self, error_log)
@@ -117,9 +122,14 @@ class MetaKnowledgeGraph(ErrorDetecting):
 
         # internal attributes
         # For Nodes...
-        self.node_catalog: Dict[str, List[int]] = dict()
+        self.node_catalog: NodeCatalog = NodeCatalog(node_catalog_directory)
         self.node_stats: Dict[str, MetaKnowledgeGraph.Category] = dict()
 
+        # The 'category map' just associates a unique int catalog
+        # index ('cid') value as a proxy for the full curie string,
+        # to reduce storage in the main node catalog
+        self._category_curie_map: List[str] = list()
+
         # We no longer track 'unknown' categories in meta-knowledge-graph
         # computations since such nodes are not TRAPI 1.1 compliant categories
         # self.node_stats['unknown'] = self.Category('unknown')
@@ -195,9 +205,8 @@ class MetaKnowledgeGraph(ErrorDetecting):
         Internal class for compiling statistics about a distinct category.
         """
 
-        # The 'category map' just associates a unique int catalog
-        # index ('cid') value as a proxy for the full curie string,
-        # to reduce storage in the main node catalog
+        # categories of all the MetaKnowledgeGraph instances, indexed in the
+        # order in which they were first seen, for get_category_curie_from_index()
         _category_curie_map: List[str] = list()
 
         def __init__(self, category_curie: str, mkg):
@@ -216,6 +225,8 @@ class MetaKnowledgeGraph(ErrorDetecting):
             self.category_curie = category_curie
             self.mkg = mkg
 
+            if self.category_curie not in self.mkg._category_curie_map:
+                self.mkg._category_curie_map.append(self.category_curie)
             if self.category_curie not in self._category_curie_map:
                 self._category_curie_map.append(self.category_curie)
             self.category_stats: Dict[str, Any] = dict()
@@ -239,15 +250,18 @@ class MetaKnowledgeGraph(ErrorDetecting):
             int
                 Internal MetaKnowledgeGraph index id for tracking a Category.
             """
-            return self._category_curie_map.index(self.category_curie)
+            return self.mkg._category_curie_map.index(self.category_curie)
 
         @classmethod
         def get_category_curie_from_index(cls, cid: int) -> str:
             """
+            Note that the index ids of categories are now internal to each MetaKnowledgeGraph:
+            prefer ``MetaKnowledgeGraph.get_category_curie_from_index``.
+
             Parameters
             ----------
             cid: int
-                Internal MetaKnowledgeGraph index id for tracking a Category.
+                Index id of a Category, among the categories of all MetaKnowledgeGraph instances.
 
             Returns
             -------
@@ -350,6 +364,20 @@ class MetaKnowledgeGraph(ErrorDetecting):
                 "count_by_source": self.category_stats["count_by_source"],
             }
 
+    def get_category_curie_from_index(self, cid: int) -> str:
+        """
+        Parameters
+        ----------
+        cid: int
+            Internal MetaKnowledgeGraph index id for tracking a Category.
+
+        Returns
+        -------
+        str
+            Curie identifier of the Category.
+        """
+        return self._category_curie_map[cid]
+
     def get_category(self, category_curie: str) -> Category:
         """
         Counts the number of distinct (Biolink) categories encountered
@@ -367,7 +395,9 @@ class MetaKnowledgeGraph(ErrorDetecting):
         """
         return self.node_stats[category_curie]
 
-    def _process_category_field(self, category_field: str, n: str, data: Dict):
+    def _process_category_field(
+        self, category_field: str, n: str, data: Dict, cids: List[int]
+    ):
         # we note here that category_curie *may be*
         # a piped '|' set of Biolink category CURIE values
         category_list = category_field.split("|")
@@ -392,8 +422,8 @@ class MetaKnowledgeGraph(ErrorDetecting):
             category_record = self.node_stats[category_curie]
 
             category_idx: int = category_record.get_cid()
-            if category_idx not in self.node_catalog[n]:
-                self.node_catalog[n].append(category_idx)
+            if category_idx not in cids:
+                cids.append(category_idx)
 
             category_record.analyse_node_category(n, data)
 
@@ -422,8 +452,8 @@ class MetaKnowledgeGraph(ErrorDetecting):
                 message_level=MessageLevel.WARNING
             )
             return
-        else:
-            self.node_catalog[n] = list()
+
+        cids: List[int] = list()
 
         if "category" not in data or not data["category"]:
             # we now simply exclude nodes with missing categories from the count, since a category
@@ -436,13 +466,16 @@ class MetaKnowledgeGraph(ErrorDetecting):
                 error_type=error_type,
                 message="Missing node 'category'"
             )
+            self.node_catalog[n] = cids
             return
 
         categories = data["category"]
 
         # analyse them each independently...
         for category_field in categories:
-            self._process_category_field(category_field, n, data)
+            self._process_category_field(category_field, n, data, cids)
+
+        self.node_catalog[n] = cids
 
     def _capture_predicate(self, subj, obj, data: Dict) -> Optional[str]:
         subj_obj_label = f"{str(subj)}->{str(obj)}"
@@ -525,8 +558,10 @@ class MetaKnowledgeGraph(ErrorDetecting):
 
         if "relation" in data:
             # input data["relation"] is normalized to a Set here
-            data["relation"] = self._normalize_relation_field(data["relation"])
-            self.association_map[triple]["relations"].update(data["relation"])
+            # (without modifying the record, which is not ours to mutate)
+            self.association_map[triple]["relations"].update(
+                self._normalize_relation_field(data["relation"])
+            )
 
         self.association_map[triple]["count"] += 1
 
@@ -563,7 +598,8 @@ class MetaKnowledgeGraph(ErrorDetecting):
             # relationship needs a predicate to process?
             return
 
-        if u not in self.node_catalog:
+        subject_cids = self.node_catalog.get(u)
+        if subject_cids is None:
             error_type = ErrorType.MISSING_NODE
             self.log_error(
                 entity=u,
@@ -575,13 +611,13 @@ class MetaKnowledgeGraph(ErrorDetecting):
             self.predicates[predicate] -= 1
             return
 
-        for subj_cat_idx in self.node_catalog[u]:
+        object_cids = self.node_catalog.get(v)
 
-            subject_category: str = self.Category.get_category_curie_from_index(
-                subj_cat_idx
-            )
+        for subj_cat_idx in subject_cids:
+
+            subject_category: str = self.get_category_curie_from_index(subj_cat_idx)
 
-            if v not in self.node_catalog:
+            if object_cids is None:
                 error_type = ErrorType.MISSING_NODE
                 self.log_error(
                     entity=v,
@@ -592,10 +628,8 @@ class MetaKnowledgeGraph(ErrorDetecting):
                 self.predicates[predicate] -= 1
                 return
 
-            for obj_cat_idx in self.node_catalog[v]:
-                object_category: str = self.Category.get_category_curie_from_index(
-                    obj_cat_idx
-                )
+            for obj_cat_idx in object_cids:
+                object_category: str = self.get_category_curie_from_index(obj_cat_idx)
 
                 self._process_triple(subject_category, predicate, object_category, data)
 
@@ -651,7 +685,7 @@ class MetaKnowledgeGraph(ErrorDetecting):
         if not self.edge_stats:
             for k, v in self.association_map.items():
                 kedge = v
-                relations = list(v["relations"])
+                relations = sorted(v["relations"])
                 kedge["relations"] = relations
                 self.edge_stats.append(kedge)
         return self.edge_stats
@@ -880,6 +914,101 @@ class MetaKnowledgeGraph(ErrorDetecting):
             self.analyse_edge(u, v, k, data)
         return self.get_edge_stats()
 
+    def share_node_catalog(self, mkg: "MetaKnowledgeGraph") -> None:
+        """
+        Use the node catalog of another MetaKnowledgeGraph, so that a shard of
+        edges may be analysed by this MetaKnowledgeGraph against the nodes
+        analysed (perhaps in another process) by the other MetaKnowledgeGraph.
+
+        Parameters
+        ----------
+        mkg: MetaKnowledgeGraph
+            The MetaKnowledgeGraph whose node catalog is to be used.
+
+        """
+        cid_map = self._map_category_indices(mkg)
+        if all(cid == i for cid, i in cid_map.items()):
+            self.node_catalog = mkg.node_catalog
+        else:
+            self.node_catalog = NodeCatalog(self.node_catalog.directory)
+            self.node_catalog.update(mkg.node_catalog, cid_map)
+
+    def _map_category_indices(self, other: "MetaKnowledgeGraph") -> Dict[int, int]:
+        # map the category index ids of the other
+        # MetaKnowledgeGraph onto those of this MetaKnowledgeGraph
+        cid_map: Dict[int, int] = dict()
+        for cid, category_curie in enumerate(other._category_curie_map):
+            if category_curie not in self._category_curie_map:
+                self._category_curie_map.append(category_curie)
+            cid_map[cid] = self._category_curie_map.index(category_curie)
+        return cid_map
+
+    def merge(
+        self, other: "MetaKnowledgeGraph", nodes: Optional[Iterable[Tuple[str, Dict]]] = None
+    ) -> "MetaKnowledgeGraph":
+        """
+        Merge the (not yet finalized) statistics of another MetaKnowledgeGraph,
+        e.g. one compiled in parallel from another shard of a graph,
+        into this MetaKnowledgeGraph.
+
+        Nodes of the other MetaKnowledgeGraph which are already in this one
+        are reported as duplicates. If ``nodes``, the node records from which
+        the other MetaKnowledgeGraph was compiled, are given, then these are
+        analysed once again (rather than merging the node statistics of the
+        other), such that the statistics of the duplicated nodes are left out,
+        as when the nodes are analysed one after another. Otherwise, the
+        statistics of the duplicated nodes are counted in both.
+
+        Parameters
+        ----------
+        other: MetaKnowledgeGraph
+            The MetaKnowledgeGraph to merge into this one.
+        nodes: Optional[Iterable[Tuple[str, Dict]]]
+            The node records from which the other MetaKnowledgeGraph was compiled
+            (only read if some of its nodes are already in this one)
+
+        Returns
+        -------
+        MetaKnowledgeGraph
+            This MetaKnowledgeGraph
+
+        """
+        if self.graph_stats or self.edge_stats or other.graph_stats or other.edge_stats:
+            raise RuntimeError(
+                "MetaKnowledgeGraph.merge(): cannot merge a finalized meta knowledge graph"
+            )
+
+        if nodes is not None and self.node_catalog.count_common(other.node_catalog):
+            # duplicated nodes are reported, and left out, by analyse_node
+            for n, data in nodes:
+                self.analyse_node(n, data)
+        else:
+            cid_map = self._map_category_indices(other)
+            for category_curie, other_category in other.node_stats.items():
+                if category_curie not in self.node_stats:
+                    self.node_stats[category_curie] = self.Category(category_curie, self)
+                merge_counts(
+                    self.node_stats[category_curie].category_stats,
+                    other_category.category_stats,
+                )
+
+            duplicates = self.node_catalog.update(other.node_catalog, cid_map)
+            if duplicates:
+                error_type = ErrorType.DUPLICATE_NODE
+                self.log_error(
+                    entity=f"{duplicates} nodes of merged meta knowledge graph",
+                    error_type=error_type,
+                    message="Node 'id' duplicated in input data",
+                    message_level=MessageLevel.WARNING
+                )
+
+        self.edge_record_count += other.edge_record_count
+        merge_counts(self.predicates, other.predicates)
+        merge_counts(self.association_map, other.association_map)
+        self.merge_errors(other)
+
+        return self
+
     def summarize_graph(self, graph: BaseGraph, name: str = None, **kwargs) -> Dict:
         """
         Generate a meta knowledge graph that describes the composition of the graph.
@@ -1,7 +1,7 @@
 """
 Classical KGX graph summary module.
 """
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, Iterable, List, Optional, Any, Callable, Tuple
 
 import re
 
@@ -12,7 +12,8 @@ from json.encoder import JSONEncoder
 from deprecation import deprecated
 
 from kgx.error_detection import ErrorType, MessageLevel, ErrorDetecting
-from kgx.utils.kgx_utils import GraphEntityType
+from kgx.utils.kgx_utils import GraphEntityType, merge_counts
+from kgx.utils.node_index import NodeCatalog
 from kgx.graph.base_graph import BaseGraph
 from kgx.prefix_manager import PrefixManager
 
@@ -88,6 +89,7 @@ class GraphSummary(ErrorDetecting):
         edge_facet_properties: Optional[List] = None,
         progress_monitor: Optional[Callable[[GraphEntityType, List], None]] = None,
         error_log: str = None,
+        node_catalog_directory: Optional[str] = None,
         **kwargs,
     ):
         """
@@ -105,6 +107,9 @@ class GraphSummary(ErrorDetecting):
             Function given a peek at the current record being stream processed by the class wrapped Callable.
         error_log: str
             Where to write any graph processing error message (stderr, by default)
+        node_catalog_directory: Optional[str]
+            Directory in which to spill the catalog of nodes, as memory-mapped files
+            (the catalog is held in memory, by default)
 
         """
         ErrorDetecting.__init__(self, error_log)
@@ -148,7 +153,12 @@ class GraphSummary(ErrorDetecting):
         ] = progress_monitor
 
         # internal attributes
-        self.node_catalog: Dict[str, List[int]] = dict()
+        self.node_catalog: NodeCatalog = NodeCatalog(node_catalog_directory)
+
+        # The 'category map' just associates a unique int catalog
+        # index ('cid') value as a proxy for the full curie string,
+        # to reduce storage in the main node catalog
+        self._category_curie_map: List[str] = list()
 
         self.node_categories: Dict[str, GraphSummary.Category] = dict()
 
@@ -192,9 +202,8 @@ class GraphSummary(ErrorDetecting):
         Internal class for compiling statistics about a distinct category.
         """
 
-        # The 'category map' just associates a unique int catalog
-        # index ('cid') value as a proxy for the full curie string,
-        # to reduce storage in the main node catalog
+        # categories of all the GraphSummary instances, indexed in the order
+        # in which they were first seen, for get_category_curie_by_index()
         _category_curie_map: List[str] = list()
 
         def __init__(self, category_curie: str, summary):
@@ -231,6 +240,8 @@ class GraphSummary(ErrorDetecting):
                 "count": 0
             }
 
+            if self.category_curie not in self.summary._category_curie_map:
+                self.summary._category_curie_map.append(self.category_curie)
             if self.category_curie not in self._category_curie_map:
                 self._category_curie_map.append(self.category_curie)
             self.category_stats: Dict[str, Any] = dict()
@@ -254,15 +265,18 @@ class GraphSummary(ErrorDetecting):
             int
                 Internal GraphSummary index id for tracking a Category.
             """
-            return self._category_curie_map.index(self.category_curie)
+            return self.summary._category_curie_map.index(self.category_curie)
 
         @classmethod
         def get_category_curie_by_index(cls, cid: int) -> str:
             """
+            Note that the index ids of categories are now internal to each
+            GraphSummary: prefer ``GraphSummary.get_category_curie_by_index``.
+
             Parameters
             ----------
             cid: int
-                Internal GraphSummary index id for tracking a Category.
+                Index id of a Category, among the categories of all GraphSummary instances.
 
             Returns
             -------
@@ -368,6 +382,20 @@ class GraphSummary(ErrorDetecting):
                 "count_by_id_prefix": self.category_stats["count_by_id_prefix"],
             }
 
+    def get_category_curie_by_index(self, cid: int) -> str:
+        """
+        Parameters
+        ----------
+        cid: int
+            Internal GraphSummary index id for tracking a Category.
+
+        Returns
+        -------
+        str
+            Curie identifier of the Category.
+        """
+        return self._category_curie_map[cid]
+
     def get_category(self, category_curie: str) -> Category:
         """
         Counts the number of distinct (Biolink) categories encountered
@@ -385,7 +413,9 @@ class GraphSummary(ErrorDetecting):
         """
         return self.node_stats[category_curie]
 
-    def _process_category_field(self, category_field: str, n: str, data: Dict):
+    def _process_category_field(
+        self, category_field: str, n: str, data: Dict, cids: List[int]
+    ):
 
         # we note here that category_curie *may be*
         # a piped '|' set of Biolink category CURIE values
@@ -410,8 +440,8 @@ class GraphSummary(ErrorDetecting):
 
             category_record = self.node_categories[category_curie]
             category_idx: int = category_record.get_cid()
-            if category_idx not in self.node_catalog[n]:
-                self.node_catalog[n].append(category_idx)
+            if category_idx not in cids:
+                cids.append(category_idx)
             category_record.analyse_node_category(self, n, data)
 
         #
@@ -445,8 +475,8 @@ class GraphSummary(ErrorDetecting):
                 message_level=MessageLevel.WARNING
             )
             return
-        else:
-            self.node_catalog[n] = list()
+
+        cids: List[int] = list()
 
         if "category" in data and data["category"]:
             categories = data["category"]
@@ -462,7 +492,9 @@ class GraphSummary(ErrorDetecting):
 
         # analyse them each independently...
         for category_field in categories:
-            self._process_category_field(category_field, n, data)
+            self._process_category_field(category_field, n, data, cids)
+
+        self.node_catalog[n] = cids
 
     def _capture_predicate(self, data: Dict) -> Optional[str]:
         if "predicate" not in data:
@@ -539,7 +571,8 @@ class GraphSummary(ErrorDetecting):
 
         predicate: str = self._capture_predicate(data)
 
-        if u not in self.node_catalog:
+        subject_cids = self.node_catalog.get(u)
+        if subject_cids is None:
             error_type = ErrorType.MISSING_NODE
             self.log_error(
                 entity=u,
@@ -552,11 +585,13 @@ class GraphSummary(ErrorDetecting):
             self.edge_stats[COUNT_BY_EDGE_PREDICATES]["unknown"]["count"] -= 1
             return
 
-        for subj_cat_idx in self.node_catalog[u]:
+        object_cids = self.node_catalog.get(v)
+
+        for subj_cat_idx in subject_cids:
 
-            subject_category = self.Category.get_category_curie_by_index(subj_cat_idx)
+            subject_category = self.get_category_curie_by_index(subj_cat_idx)
 
-            if v not in self.node_catalog:
+            if object_cids is None:
                 error_type = ErrorType.MISSING_NODE
                 self.log_error(
                     entity=v,
@@ -568,11 +603,9 @@ class GraphSummary(ErrorDetecting):
                 self.edge_stats[COUNT_BY_EDGE_PREDICATES]["unknown"]["count"] -= 1
                 return
 
-            for obj_cat_idx in self.node_catalog[v]:
+            for obj_cat_idx in object_cids:
 
-                object_category = self.Category.get_category_curie_by_index(
-                    obj_cat_idx
-                )
+                object_category = self.get_category_curie_by_index(obj_cat_idx)
 
                 self._process_triple(subject_category, predicate, object_category, data)
 
@@ -764,6 +797,106 @@ class GraphSummary(ErrorDetecting):
 
         return self.get_edge_stats()
 
+    def share_node_catalog(self, summary: "GraphSummary") -> None:
+        """
+        Use the node catalog of another GraphSummary, so that a shard of
+        edges may be analysed by this GraphSummary against the nodes
+        analysed (perhaps in another process) by the other GraphSummary.
+
+        Parameters
+        ----------
+        summary: GraphSummary
+            The GraphSummary whose node catalog is to be used.
+
+        """
+        cid_map = self._map_category_indices(summary)
+        if all(cid == i for cid, i in cid_map.items()):
+            self.node_catalog = summary.node_catalog
+        else:
+            self.node_catalog = NodeCatalog(self.node_catalog.directory)
+            self.node_catalog.update(summary.node_catalog, cid_map)
+
+    def _map_category_indices(self, other: "GraphSummary") -> Dict[int, int]:
+        # map the category index ids of the other
+        # GraphSummary onto those of this GraphSummary
+        cid_map: Dict[int, int] = dict()
+        for cid, category_curie in enumerate(other._category_curie_map):
+            if category_curie not in self._category_curie_map:
+                self._category_curie_map.append(category_curie)
+            cid_map[cid] = self._category_curie_map.index(category_curie)
+        return cid_map
+
+    def merge(
+        self, other: "GraphSummary", nodes: Optional[Iterable[Tuple[str, Dict]]] = None
+    ) -> "GraphSummary":
+        """
+        Merge the (not yet finalized) statistics of another GraphSummary,
+        e.g. one compiled in parallel from another shard of a graph,
+        into this GraphSummary.
+
+        Nodes of the other GraphSummary which are already in this one are
+        reported as duplicates. If ``nodes``, the node records from which the
+        other GraphSummary was compiled, are given, then these are analysed once
+        again (rather than merging the node statistics of the other), such that
+        the statistics of the duplicated nodes are left out, as when the nodes
+        are analysed one after another. Otherwise, the statistics of the
+        duplicated nodes are counted in both.
+
+        Parameters
+        ----------
+        other: GraphSummary
+            The GraphSummary to merge into this one.
+        nodes: Optional[Iterable[Tuple[str, Dict]]]
+            The node records from which the other GraphSummary was compiled
+            (only read if some of its nodes are already in this one)
+
+        Returns
+        -------
+        GraphSummary
+            This GraphSummary
+
+        """
+        if (
+            self.nodes_processed
+            or self.edges_processed
+            or other.nodes_processed
+            or other.edges_processed
+        ):
+            raise RuntimeError("GraphSummary.merge(): cannot merge a finalized summary")
+
+        if nodes is not None and self.node_catalog.count_common(other.node_catalog):
+            # duplicated nodes are reported, and left out, by analyse_node
+            for n, data in nodes:
+                self.analyse_node(n, data)
+        else:
+            cid_map = self._map_category_indices(other)
+            for category_curie, other_category in other.node_categories.items():
+                if category_curie not in self.node_categories:
+                    self.node_categories[category_curie] = self.Category(
+                        category_curie, self
+                    )
+                merge_counts(
+                    self.node_categories[category_curie].category_stats,
+                    other_category.category_stats,
+                )
+
+            duplicates = self.node_catalog.update(other.node_catalog, cid_map)
+            if duplicates:
+                error_type = ErrorType.DUPLICATE_NODE
+                self.log_error(
+                    entity=f"{duplicates} nodes of merged summary",
+                    error_type=error_type,
+                    message="Node 'id' duplicated in input data",
+                    message_level=MessageLevel.WARNING
+                )
+
+            merge_counts(self.node_stats, other.node_stats)
+
+        merge_counts(self.edge_stats, other.edge_stats)
+        self.merge_errors(other)
+
+        return self
+
     def _compile_facet_stats(
         self, stats: Dict, x: str, y: str, facet_property: str, value: str
     ):
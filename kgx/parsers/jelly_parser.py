@@ -5,11 +5,12 @@ This class provides streaming parsing of Jelly format files,
 similar to CustomNTriplesParser but for Jelly format.
 """
 
-import gzip
 from typing import Generator, Optional, IO
 
 from rdflib import URIRef
 
+from kgx.utils.compression_utils import open_compressed_reader
+
 
 class JellyParser:
     """
@@ -34,10 +35,7 @@ class JellyParser:
             file_obj.close()
 
     def _open_file(self, filename: str, compression: Optional[str]) -> IO[bytes]:
-        if compression == "gz":
-            return gzip.open(filename, "rb")
-        else:
-            return open(filename, "rb")
+        return open_compressed_reader(filename, compression)
 
     def _parse_jelly_stream(self, file_obj: IO[bytes]) -> Generator:
         from pyjelly.integrations.rdflib.parse import parse_jelly_flat, Triple, Quad
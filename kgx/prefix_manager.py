@@ -5,7 +5,7 @@ import prefixcommons.curie_util as cu
 from cachetools import LRUCache, cached
 
 from kgx.config import get_jsonld_context, get_logger
-from kgx.utils.kgx_utils import contract, expand
+from kgx.utils.prefix_trie import PrefixTrie, get_default_prefix_trie
 
 log = get_logger()
 
@@ -16,13 +16,19 @@ class PrefixManager(object):
 
     These include mappings for CURIEs such as GO:0008150, as well as shortforms such as
     biolink types such as Disease
+
+    The prefix map is compiled into a ``kgx.utils.prefix_trie.PrefixTrie`` (once, on
+    first use after each change to the map through the methods of the PrefixManager)
+    and the CURIEs and IRIs it yields are held in a cache of ``cache_size`` entries,
+    of its own, whose hit rates are given by ``cache_info``.
     """
 
     DEFAULT_NAMESPACE = "https://www.example.org/UNKNOWN/"
+    DEFAULT_CACHE_SIZE = 100000
     prefix_map: Dict[str, str]
     reverse_prefix_map: Dict[str, str]
 
-    def __init__(self, url: str = None):
+    def __init__(self, url: str = None, cache_size: int = DEFAULT_CACHE_SIZE):
         """
         Initialize an instance of PrefixManager.
 
@@ -30,8 +36,13 @@ class PrefixManager(object):
         ----------
         url: str
             The URL from which to read a JSON-LD context for prefix mappings
+        cache_size: int
+            The maximum number of contracted IRIs, and of expanded CURIEs, to cache
 
         """
+        self.cache_size = cache_size
+        self._stats = {"expand": [0, 0], "contract": [0, 0]}
+        self._reset()
         if url:
             context = cu.read_remote_jsonld_context(url)
         else:
@@ -75,6 +86,7 @@ class PrefixManager(object):
         else:
             self.prefix_map[""] = self.DEFAULT_NAMESPACE
         self.reverse_prefix_map = {y: x for x, y in self.prefix_map.items()}
+        self._reset()
 
     def update_prefix_map(self, m: Dict[str, str]) -> None:
         """
@@ -88,6 +100,7 @@ class PrefixManager(object):
         """
         for k, v in m.items():
             self.prefix_map[k] = v
+        self._reset()
 
     def update_reverse_prefix_map(self, m: Dict[str, str]) -> None:
         """
@@ -100,8 +113,57 @@ class PrefixManager(object):
 
         """
         self.reverse_prefix_map.update(m)
+        self._reset()
+
+    def _reset(self) -> None:
+        # compiled on first use, from the prefix map as it is then
+        self._trie: Optional[PrefixTrie] = None
+        self._expand_cache: LRUCache = LRUCache(maxsize=self.cache_size)
+        self._contract_cache: LRUCache = LRUCache(maxsize=self.cache_size)
+
+    def __getstate__(self) -> Dict:
+        # the trie and caches are rebuilt, rather than pickled (e.g. for a process pool)
+        state = self.__dict__.copy()
+        for k in ("_trie", "_expand_cache", "_contract_cache", "_stats"):
+            state.pop(k, None)
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._stats = {"expand": [0, 0], "contract": [0, 0]}
+        self._reset()
+
+    def _get_trie(self) -> PrefixTrie:
+        if self._trie is None:
+            self._trie = PrefixTrie([self.prefix_map])
+        return self._trie
+
+    def cache_info(self) -> Dict[str, Dict]:
+        """
+        Get the statistics of the caches of expanded CURIEs and contracted IRIs.
+
+        Returns
+        -------
+        Dict[str, Dict]
+            For each of 'expand' and 'contract', the number of hits and
+            misses, the hit rate and the current and maximum size of its cache
+
+        """
+        info = dict()
+        for name, cache in (
+            ("expand", self._expand_cache),
+            ("contract", self._contract_cache),
+        ):
+            hits, misses = self._stats[name]
+            info[name] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "size": len(cache),
+                "maxsize": cache.maxsize,
+            }
+        return info
 
-    @cached(LRUCache(maxsize=1024))
     def expand(self, curie: str, fallback: bool = True) -> str:
         """
         Expand a given CURIE to an URI, based on mappings from `prefix_map`.
@@ -120,10 +182,21 @@ class PrefixManager(object):
             A URI corresponding to the CURIE
 
         """
-        uri = expand(curie, [self.prefix_map], fallback)
+        key = (curie, fallback)
+        stats = self._stats["expand"]
+        uri = self._expand_cache.get(key)
+        if uri is not None:
+            stats[0] += 1
+            return uri
+        stats[1] += 1
+        uri = self._get_trie().expand(curie)
+        if uri is None and fallback:
+            uri = get_default_prefix_trie().expand(curie)
+        if uri is None:
+            uri = curie
+        self._expand_cache[key] = uri
         return uri
 
-    @cached(LRUCache(maxsize=1024))
     def contract(self, uri: str, fallback: bool = True) -> Optional[str]:
         """
         Contract a given URI to a CURIE, based on mappings from `prefix_map`.
@@ -143,12 +216,25 @@ class PrefixManager(object):
             A CURIE corresponding to the URI
 
         """
+        key = (uri, fallback)
+        stats = self._stats["contract"]
+        curie = self._contract_cache.get(key)
+        if curie is not None:
+            stats[0] += 1
+            return curie
+        stats[1] += 1
         # always prioritize non-CURIE shortform
         if self.reverse_prefix_map and uri in self.reverse_prefix_map:
             curie = self.reverse_prefix_map[uri]
         else:
-            curie = contract(uri, [self.prefix_map], fallback)
-        return str(curie)
+            curie = self._get_trie().contract(uri)
+            if curie is None and fallback:
+                curie = get_default_prefix_trie().contract(uri)
+            if curie is None:
+                curie = uri
+        curie = str(curie)
+        self._contract_cache[key] = curie
+        return curie
 
     @staticmethod
     @cached(LRUCache(maxsize=1024))
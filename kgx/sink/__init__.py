@@ -1,4 +1,5 @@
 from .sink import Sink
+from .dedup_sink import DedupSink
 from .graph_sink import GraphSink
 from .json_sink import JsonSink
 from .jsonl_sink import JsonlSink
@@ -0,0 +1,164 @@
+import heapq
+import os
+import pickle
+import tempfile
+from itertools import groupby
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+from kgx.sink.sink import Sink
+from kgx.utils.kgx_utils import generate_edge_key
+
+
+class DedupSink(Sink):
+    """
+    DedupSink is responsible for writing deduplicated records to another sink,
+    in bounded memory, e.g. while streaming a transform.
+
+    Records are buffered by node id (or by edge subject, object and key) and,
+    every ``batch_size`` records, spilled to a temporary file as a sorted run.
+    On ``finalize``, the runs are merged and every node (and edge) is written,
+    once, to the sink. Like the GraphSink, the properties of a later record of a
+    node (or edge) override those of an earlier record of the same node (or edge).
+
+    Nodes and edges are written in the order of their ids (and keys),
+    every node before any edge.
+
+    Parameters
+    ----------
+    owner: Transformer
+        Transformer to which the DedupSink belongs
+    sink: kgx.sink.sink.Sink
+        The sink to which the deduplicated records are written
+    directory: Optional[str]
+        Directory in which to spill the sorted runs (the system default, if not given)
+    batch_size: int
+        Number of distinct records buffered before spilling them to a sorted run
+
+    """
+
+    def __init__(
+        self,
+        owner,
+        sink: Sink,
+        directory: Optional[str] = None,
+        batch_size: int = 100000,
+    ):
+        super().__init__(owner)
+        self.sink = sink
+        self.directory = directory
+        self.batch_size = batch_size
+        self._spill_directory: Optional[tempfile.TemporaryDirectory] = None
+        self._nodes = _SortedRuns(self)
+        self._edges = _SortedRuns(self)
+
+    def write_node(self, record: Dict) -> None:
+        """
+        Write a node record to the buffer of nodes.
+
+        Parameters
+        ----------
+        record: Dict
+            A node record
+
+        """
+        self._nodes.add(record["id"], record)
+
+    def write_edge(self, record: Dict) -> None:
+        """
+        Write an edge record to the buffer of edges.
+
+        Parameters
+        ----------
+        record: Dict
+            An edge record
+
+        """
+        if "key" in record:
+            key = record["key"]
+        else:
+            key = generate_edge_key(record["subject"], record["predicate"], record["object"])
+        self._edges.add((record["subject"], record["object"], key), record)
+
+    def finalize(self) -> None:
+        """
+        Write the deduplicated nodes and edges to the sink and finalize it.
+        """
+        try:
+            for record in self._nodes.merge():
+                self.sink.write_node(record)
+            for record in self._edges.merge():
+                self.sink.write_edge(record)
+        except BaseException:
+            # stops any processes of the wrapped sink, as it is never finalized
+            if hasattr(self.sink, "close"):
+                self.sink.close()
+            raise
+        finally:
+            if self._spill_directory:
+                self._spill_directory.cleanup()
+                self._spill_directory = None
+        self.sink.finalize()
+
+    def _spill_path(self) -> str:
+        if not self._spill_directory:
+            self._spill_directory = tempfile.TemporaryDirectory(
+                prefix="kgx-dedup-", dir=self.directory
+            )
+        fd, path = tempfile.mkstemp(dir=self._spill_directory.name)
+        os.close(fd)
+        return path
+
+
+class _SortedRuns(object):
+    def __init__(self, sink: DedupSink):
+        self.sink = sink
+        self._buffer: Dict[Any, Dict] = dict()
+        self._runs: List[str] = list()
+
+    def add(self, key: Any, record: Dict) -> None:
+        if key in self._buffer:
+            self._buffer[key] = {**self._buffer[key], **record}
+        else:
+            self._buffer[key] = record
+            if len(self._buffer) >= self.sink.batch_size:
+                self._spill()
+
+    def _spill(self) -> None:
+        path = self.sink._spill_path()
+        items = sorted(self._buffer.items(), key=lambda item: item[0])
+        self._buffer = dict()
+        with open(path, "wb") as FH:
+            # pickled in batches, which are much faster to pickle than single records
+            for i in range(0, len(items), 10000):
+                pickle.dump(items[i:i + 10000], FH, protocol=pickle.HIGHEST_PROTOCOL)
+        self._runs.append(path)
+
+    @staticmethod
+    def _read_run(path: str) -> Generator[Tuple[Any, Dict], None, None]:
+        with open(path, "rb") as FH:
+            while True:
+                try:
+                    yield from pickle.load(FH)
+                except EOFError:
+                    break
+        os.remove(path)
+
+    def merge(self) -> Generator[Dict, None, None]:
+        if not self._runs:
+            items = sorted(self._buffer.items(), key=lambda item: item[0])
+            self._buffer = dict()
+            for _, record in items:
+                yield record
+            return
+        if self._buffer:
+            self._spill()
+        runs = [self._read_run(path) for path in self._runs]
+        self._runs = list()
+        # records of the same key come out of the (stable) merge in the order
+        # of the runs, such that the records written later take precedence
+        merged = heapq.merge(*runs, key=lambda item: item[0])
+        for _, group in groupby(merged, key=lambda item: item[0]):
+            record = None
+            for _, r in group:
+                record = r if record is None else {**record, **r}
+            yield record
@@ -2,9 +2,8 @@ import gzip
 import os
 from typing import Optional, Dict, Any
 
-import jsonlines
-
 from kgx.sink.sink import Sink
+from kgx.utils.jsonl_utils import JsonlWriter, DEFAULT_BLOCK_SIZE
 
 
 class JsonlSink(Sink):
@@ -22,6 +21,8 @@ class JsonlSink(Sink):
         The file format (``jsonl``)
     compression: Optional[str]
         The compression type (``gz``)
+    flush_size: int
+        Number of bytes of encoded records buffered before writing them out
     kwargs: Any
         Any additional arguments
 
@@ -33,6 +34,7 @@ class JsonlSink(Sink):
         filename: str,
         format: str = "jsonl",
         compression: Optional[str] = None,
+        flush_size: int = DEFAULT_BLOCK_SIZE,
         **kwargs: Any,
     ):
         super().__init__(owner)
@@ -50,12 +52,12 @@ class JsonlSink(Sink):
             nodes_filename += f".{compression}"
             edges_filename += f".{compression}"
             NFH = gzip.open(nodes_filename, "wb")
-            self.NFH = jsonlines.Writer(NFH)
             EFH = gzip.open(edges_filename, "wb")
-            self.EFH = jsonlines.Writer(EFH)
         else:
-            self.NFH = jsonlines.open(nodes_filename, "w")
-            self.EFH = jsonlines.open(edges_filename, "w")
+            NFH = open(nodes_filename, "wb")
+            EFH = open(edges_filename, "wb")
+        self.NFH = JsonlWriter(NFH, flush_size)
+        self.EFH = JsonlWriter(EFH, flush_size)
 
     def write_node(self, record: Dict) -> None:
         """
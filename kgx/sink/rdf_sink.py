@@ -1,13 +1,15 @@
 import gzip
-from collections import OrderedDict
-from typing import Optional, Union, Tuple, Any, Dict
+import os
+from collections import OrderedDict, deque
+from multiprocessing import Pool
+from typing import Optional, Union, Tuple, Any, Dict, Iterable, List, Set
 import rdflib
 from linkml_runtime.linkml_model.meta import Element, ClassDefinition, SlotDefinition
 from rdflib import URIRef, Literal, Namespace, RDF
-from rdflib.plugins.serializers.nt import _nt_row
+from rdflib.plugins.serializers.nt import _quoteLiteral
 from rdflib.term import _is_valid_uri
 
-from kgx.error_detection import ErrorType
+from kgx.error_detection import ErrorDetecting, ErrorType
 from kgx.prefix_manager import PrefixManager
 from kgx.config import get_logger
 from kgx.sink.sink import Sink
@@ -18,6 +20,7 @@ from kgx.utils.kgx_utils import (
     sentencecase_to_snakecase,
     generate_uuid,
     get_biolink_property_types,
+    get_pool_processes,
 )
 from kgx.utils.rdf_utils import process_predicate
 
@@ -26,6 +29,9 @@ log = get_logger()
 property_mapping: OrderedDict = OrderedDict()
 reverse_property_mapping: OrderedDict = OrderedDict()
 
+# number of records turned into N-Triples at a time by a process of the pool
+BATCH_SIZE = 10000
+
 
 class RdfSink(Sink):
     """
@@ -35,6 +41,12 @@ class RdfSink(Sink):
     .. note::
         Currently RDF N-Triples and Jelly serializations are supported.
 
+    The terms of the triples (e.g. predicates, categories and knowledge sources,
+    repeated across records) are cached, as serialized, and the IRI and type of
+    each property are resolved once. N-Triples are written in large blocks and,
+    with more than one process, each record is turned into N-Triples by a pool
+    of processes (see ``write_in_pool``).
+
     Parameters
     ----------
     owner: Transformer
@@ -47,6 +59,13 @@ class RdfSink(Sink):
         The compression type (``gz``)
     reify_all_edges: bool
         Whether or not to reify all the edges
+    processes: int
+        Number of processes turning records into N-Triples
+        (the Jelly serialization is always written by a single process)
+    buffer_size: int
+        Number of characters of N-Triples buffered before writing them to the file
+    cache_size: int
+        The maximum number of terms cached (a cache is cleared when full)
     kwargs: Any
         Any additional arguments
 
@@ -59,6 +78,9 @@ class RdfSink(Sink):
         format: str = "nt",
         compression: Optional[bool] = None,
         reify_all_edges: bool = True,
+        processes: int = 1,
+        buffer_size: int = 1 << 20,
+        cache_size: int = 100000,
         **kwargs: Any,
     ):
         super().__init__(owner)
@@ -81,6 +103,22 @@ class RdfSink(Sink):
             self.BIOLINK.Association,
             self.OBAN.association,
         }
+        self._associations: Optional[Set[str]] = None
+        self.buffer_size = buffer_size
+        self.cache_size = cache_size
+        self._urirefs: Dict[str, URIRef] = dict()
+        self._objects: Dict[Tuple, rdflib.term.Identifier] = dict()
+        self._terms: Dict[rdflib.term.Identifier, str] = dict()
+        self._node_property_terms: Dict[str, Tuple[URIRef, str]] = dict()
+        self._edge_property_terms: Dict[str, Tuple[URIRef, str]] = dict()
+        self._buffer: List[str] = list()
+        self._buffered = 0
+        # a daemonic process (e.g. of a config transform) writes serially
+        self.processes = get_pool_processes(processes) if format == "nt" else 1
+        self.batch_size = BATCH_SIZE
+        self._pool = None
+        self._pending: deque = deque()
+        self._batch: List[Tuple[bool, Dict]] = list()
         if compression == "gz":
             self.FH = gzip.open(filename, "wb")
         else:
@@ -126,6 +164,8 @@ class RdfSink(Sink):
         """
         for k, v in m.items():
             self.reverse_predicate_mapping[v] = URIRef(k)
+        self._node_property_terms.clear()
+        self._edge_property_terms.clear()
 
     def set_property_types(self, m: Dict) -> None:
         """
@@ -150,6 +190,8 @@ class RdfSink(Sink):
             else:
                 key = property_name
             self.property_types[key] = v
+        self._node_property_terms.clear()
+        self._edge_property_terms.clear()
 
     def write_node(self, record: Dict) -> None:
         """
@@ -161,34 +203,77 @@ class RdfSink(Sink):
             A node record
 
         """
+        if self.processes > 1:
+            self._add_to_batch(True, record)
+        else:
+            self._write_triples(self._node_triples(record))
+
+    def _node_triples(self, record: Dict) -> Iterable[Tuple]:
+        """
+        Get the triples of a node record.
+
+        Parameters
+        ----------
+        record: Dict
+            A node record
+
+        Returns
+        -------
+        Iterable[Tuple]
+            The triples
+
+        """
+        triples = []
+        s = None
         for k, v in record.items():
             if k in {"id", "iri"}:
                 continue
-            (
-                element_uri,
-                canonical_uri,
-                predicate,
-                property_name,
-            ) = self.process_predicate(k)
-            if element_uri is None:
-                # not a biolink predicate
-                if k in self.reverse_predicate_mapping:
-                    prop_uri = self.reverse_predicate_mapping[k]
-                    # prop_uri = self.prefix_manager.contract(prop_uri)
-                else:
-                    prop_uri = k
-            else:
-                prop_uri = canonical_uri if canonical_uri else element_uri
-            prop_type = self._get_property_type(prop_uri)
-            log.debug(f"prop {k} has prop_uri {prop_uri} and prop_type {prop_type}")
-            prop_uri = self.uriref(prop_uri)
+            if s is None:
+                s = self.uriref(record["id"])
+            prop_uri, prop_type = self._node_property_term(k)
             if isinstance(v, (list, set, tuple)):
                 for x in v:
-                    value_uri = self._prepare_object(k, prop_type, x)
-                    self._write_triple(self.uriref(record["id"]), prop_uri, value_uri)
+                    triples.append((s, prop_uri, self._object(k, prop_type, x)))
+            else:
+                triples.append((s, prop_uri, self._object(k, prop_type, v)))
+        return triples
+
+    def _node_property_term(self, k: str) -> Tuple[URIRef, str]:
+        """
+        Get the IRI and type of a node property, resolved once per property.
+
+        Parameters
+        ----------
+        k: str
+            The node property
+
+        Returns
+        -------
+        Tuple[URIRef, str]
+            The IRI and type of the property
+
+        """
+        if k in self._node_property_terms:
+            return self._node_property_terms[k]
+        (
+            element_uri,
+            canonical_uri,
+            predicate,
+            property_name,
+        ) = self.process_predicate(k)
+        if element_uri is None:
+            # not a biolink predicate
+            if k in self.reverse_predicate_mapping:
+                prop_uri = self.reverse_predicate_mapping[k]
+                # prop_uri = self.prefix_manager.contract(prop_uri)
             else:
-                value_uri = self._prepare_object(k, prop_type, v)
-                self._write_triple(self.uriref(record["id"]), prop_uri, value_uri)
+                prop_uri = k
+        else:
+            prop_uri = canonical_uri if canonical_uri else element_uri
+        prop_type = self._get_property_type(prop_uri)
+        log.debug(f"prop {k} has prop_uri {prop_uri} and prop_type {prop_type}")
+        self._node_property_terms[k] = (self.uriref(prop_uri), prop_type)
+        return self._node_property_terms[k]
 
     def _write_triple(self, s: URIRef, p: URIRef, o: Union[URIRef, Literal]) -> None:
         """
@@ -203,13 +288,72 @@ class RdfSink(Sink):
         o: Union[rdflib.URIRef, rdflib.Literal]
             The object
 
+        """
+        self._write_triples([(s, p, o)])
+
+    def _write_triples(self, triples: Iterable[Tuple]) -> None:
+        """
+        Serialize triples, buffering N-Triples until ``buffer_size`` characters
+        are buffered.
+
+        Parameters
+        ----------
+        triples: Iterable[Tuple]
+            The triples
+
         """
         if self.format == "jelly":
-            frame = self._jelly_stream.triple((s, p, o))
-            if frame:
-                self._jelly_write(frame, self.FH)
+            for t in triples:
+                frame = self._jelly_stream.triple(t)
+                if frame:
+                    self._jelly_write(frame, self.FH)
         else:
-            self.FH.write(_nt_row((s, p, o)).encode(self.encoding, "_rdflib_nt_escape"))
+            rows = self._nt_rows(triples)
+            self._buffer.append(rows)
+            self._buffered += len(rows)
+            if self._buffered >= self.buffer_size:
+                self._flush()
+
+    def _nt_rows(self, triples: Iterable[Tuple]) -> str:
+        """
+        Serialize triples as N-Triples.
+
+        Parameters
+        ----------
+        triples: Iterable[Tuple]
+            The triples
+
+        Returns
+        -------
+        str
+            The N-Triples
+
+        """
+        terms = self._terms
+        rows = []
+        for t in triples:
+            row = []
+            for x in t:
+                n3 = terms.get(x)
+                if n3 is None:
+                    n3 = _quoteLiteral(x) if isinstance(x, Literal) else x.n3()
+                    if len(terms) >= self.cache_size:
+                        terms.clear()
+                    terms[x] = n3
+                row.append(n3)
+            rows.append(f"{row[0]} {row[1]} {row[2]} .\n")
+        return "".join(rows)
+
+    def _flush(self) -> None:
+        """
+        Write the buffered N-Triples to the file.
+        """
+        if self._buffer:
+            self.FH.write(
+                "".join(self._buffer).encode(self.encoding, "_rdflib_nt_escape")
+            )
+            self._buffer = list()
+            self._buffered = 0
 
     def write_edge(self, record: Dict) -> None:
         """
@@ -221,101 +365,131 @@ class RdfSink(Sink):
             An edge record
 
         """
-        ecache = []
-        associations = set(
-            [self.prefix_manager.contract(x) for x in self.reification_types]
-        )
-        associations.update(
-            [str(x) for x in set(self.toolkit.get_all_associations(formatted=True))]
-        )
+        if self.processes > 1:
+            self._add_to_batch(False, record)
+        else:
+            self._write_triples(self._edge_triples(record))
+
+    def _edge_triples(self, record: Dict) -> Iterable[Tuple]:
+        """
+        Get the triples of an edge record, reified if either all the edges
+        are reified or the edge is an association.
+
+        Parameters
+        ----------
+        record: Dict
+            An edge record
+
+        Returns
+        -------
+        Iterable[Tuple]
+            The triples
+
+        """
         if self.reify_all_edges:
-            reified_node = self.reify(record["subject"], record["object"], record)
-            s = reified_node["subject"]
-            p = reified_node["predicate"]
-            o = reified_node["object"]
-            ecache.append((s, p, o))
-            n = reified_node["id"]
-            for prop, value in reified_node.items():
-                if prop in {"id", "association_id", "edge_key"}:
-                    continue
-                (
-                    element_uri,
-                    canonical_uri,
-                    predicate,
-                    property_name,
-                ) = self.process_predicate(prop)
-                if element_uri:
-                    prop_uri = canonical_uri if canonical_uri else element_uri
-                else:
-                    if prop in self.reverse_predicate_mapping:
-                        prop_uri = self.reverse_predicate_mapping[prop]
-                        # prop_uri = self.prefix_manager.contract(prop_uri)
-                    else:
-                        prop_uri = predicate
-                prop_type = self._get_property_type(prop)
-                log.debug(
-                    f"prop {prop} has prop_uri {prop_uri} and prop_type {prop_type}"
-                )
-                prop_uri = self.uriref(prop_uri)
-                if isinstance(value, list):
-                    for x in value:
-                        value_uri = self._prepare_object(prop, prop_type, x)
-                        self._write_triple(URIRef(n), prop_uri, value_uri)
-                else:
-                    value_uri = self._prepare_object(prop, prop_type, value)
-                    self._write_triple(URIRef(n), prop_uri, value_uri)
+            return self._reified_triples(record)
+        associations = self.get_associations()
+        if (
+            ("type" in record and any(t in associations for t in record["type"]))
+            or (
+                "association_type" in record
+                and record["association_type"] in associations
+            )
+            or ("category" in record and any(record["category"]) in associations)
+        ):
+            return self._reified_triples(record)
+        s = self.uriref(record["subject"])
+        p = self.uriref(record["predicate"])
+        o = self.uriref(record["object"])
+        return [(s, p, o)]
+
+    def _reified_triples(self, record: Dict) -> Iterable[Tuple]:
+        """
+        Get the triples of a reified edge record.
+
+        Parameters
+        ----------
+        record: Dict
+            An edge record
+
+        Returns
+        -------
+        Iterable[Tuple]
+            The triples
+
+        """
+        triples = []
+        reified_node = self.reify(record["subject"], record["object"], record)
+        n = URIRef(reified_node["id"])
+        for prop, value in reified_node.items():
+            if prop in {"id", "association_id", "edge_key"}:
+                continue
+            prop_uri, prop_type = self._edge_property_term(prop)
+            if isinstance(value, list):
+                for x in value:
+                    triples.append((n, prop_uri, self._object(prop, prop_type, x)))
+            else:
+                triples.append((n, prop_uri, self._object(prop, prop_type, value)))
+        triples.append(
+            (reified_node["subject"], reified_node["predicate"], reified_node["object"])
+        )
+        return triples
+
+    def _edge_property_term(self, prop: str) -> Tuple[URIRef, str]:
+        """
+        Get the IRI and type of an edge property, resolved once per property.
+
+        Parameters
+        ----------
+        prop: str
+            The edge property
+
+        Returns
+        -------
+        Tuple[URIRef, str]
+            The IRI and type of the property
+
+        """
+        if prop in self._edge_property_terms:
+            return self._edge_property_terms[prop]
+        (
+            element_uri,
+            canonical_uri,
+            predicate,
+            property_name,
+        ) = self.process_predicate(prop)
+        if element_uri:
+            prop_uri = canonical_uri if canonical_uri else element_uri
         else:
-            if "type" in record:
-                for type in record["type"]:
-                    if type in associations:
-                        at_least_one_type_in_associations = True
-            if (
-                ("type" in record and at_least_one_type_in_associations)
-                or (
-                    "association_type" in record
-                    and record["association_type"] in associations
-                )
-                or ("category" in record and any(record["category"]) in associations)
-            ):
-                reified_node = self.reify(record["subject"], record["object"], record)
-                s = reified_node["subject"]
-                p = reified_node["predicate"]
-                o = reified_node["object"]
-                ecache.append((s, p, o))
-                n = reified_node["id"]
-                for prop, value in reified_node.items():
-                    if prop in {"id", "association_id", "edge_key"}:
-                        continue
-                    (
-                        element_uri,
-                        canonical_uri,
-                        predicate,
-                        property_name,
-                    ) = self.process_predicate(prop)
-                    if element_uri:
-                        prop_uri = canonical_uri if canonical_uri else element_uri
-                    else:
-                        if prop in self.reverse_predicate_mapping:
-                            prop_uri = self.reverse_predicate_mapping[prop]
-                            # prop_uri = self.prefix_manager.contract(prop_uri)
-                        else:
-                            prop_uri = predicate
-                    prop_type = self._get_property_type(prop)
-                    prop_uri = self.uriref(prop_uri)
-                    if isinstance(value, list):
-                        for x in value:
-                            value_uri = self._prepare_object(prop, prop_type, x)
-                            self._write_triple(URIRef(n), prop_uri, value_uri)
-                    else:
-                        value_uri = self._prepare_object(prop, prop_type, value)
-                        self._write_triple(URIRef(n), prop_uri, value_uri)
+            if prop in self.reverse_predicate_mapping:
+                prop_uri = self.reverse_predicate_mapping[prop]
+                # prop_uri = self.prefix_manager.contract(prop_uri)
             else:
-                s = self.uriref(record["subject"])
-                p = self.uriref(record["predicate"])
-                o = self.uriref(record["object"])
-                self._write_triple(s, p, o)
-        for t in ecache:
-            self._write_triple(t[0], t[1], t[2])
+                prop_uri = predicate
+        prop_type = self._get_property_type(prop)
+        log.debug(f"prop {prop} has prop_uri {prop_uri} and prop_type {prop_type}")
+        self._edge_property_terms[prop] = (self.uriref(prop_uri), prop_type)
+        return self._edge_property_terms[prop]
+
+    def get_associations(self) -> Set[str]:
+        """
+        Get the CURIEs of the types of the edges which are reified,
+        when not all the edges are reified.
+
+        Returns
+        -------
+        Set[str]
+            The CURIEs of the reification types and Biolink associations
+
+        """
+        if self._associations is None:
+            self._associations = set(
+                [self.prefix_manager.contract(x) for x in self.reification_types]
+            )
+            self._associations.update(
+                [str(x) for x in set(self.toolkit.get_all_associations(formatted=True))]
+            )
+        return self._associations
 
     def uriref(self, identifier: str) -> URIRef:
         """
@@ -332,6 +506,14 @@ class RdfSink(Sink):
             URIRef form of the input ``identifier``
 
         """
+        if identifier in self._urirefs:
+            return self._urirefs[identifier]
+        if len(self._urirefs) >= self.cache_size:
+            self._urirefs.clear()
+        self._urirefs[identifier] = self._uriref(identifier)
+        return self._urirefs[identifier]
+
+    def _uriref(self, identifier: str) -> URIRef:
         if identifier.startswith("urn:uuid:"):
             uri = identifier
         elif identifier in reverse_property_mapping:
@@ -358,6 +540,36 @@ class RdfSink(Sink):
             #         identifier = identifier.replace(':', '_')
         return URIRef(uri)
 
+    def _object(self, prop: str, prop_type: str, value: Any) -> rdflib.term.Identifier:
+        """
+        Prepare the object of a triple, cached by type and value.
+
+        Parameters
+        ----------
+        prop: str
+            property name
+        prop_type: str
+            property type
+        value: Any
+            property value
+
+        Returns
+        -------
+        rdflib.term.Identifier
+            An instance of rdflib.term.Identifier
+
+        """
+        if not isinstance(value, (str, int, float)):
+            # e.g. a nested attribute
+            return self._prepare_object(prop, prop_type, value)
+        key = (prop_type, type(value), value)
+        if key in self._objects:
+            return self._objects[key]
+        if len(self._objects) >= self.cache_size:
+            self._objects.clear()
+        self._objects[key] = self._prepare_object(prop, prop_type, value)
+        return self._objects[key]
+
     def _prepare_object(
         self, prop: str, prop_type: str, value: Any
     ) -> rdflib.term.Identifier:
@@ -592,12 +804,135 @@ class RdfSink(Sink):
         reified_node["object"] = o
         return reified_node
 
+    def get_pool_state(self) -> Dict[str, Any]:
+        """
+        Get the (picklable) attributes copied onto the
+        RdfSinks of the processes writing records in parallel.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The attributes, by name
+
+        """
+        return {
+            "prefix_manager": self.prefix_manager,
+            "reverse_predicate_mapping": self.reverse_predicate_mapping,
+            "property_types": self.property_types,
+            "cache_size": self.cache_size,
+        }
+
+    def _add_to_batch(self, node: bool, record: Dict) -> None:
+        """
+        Add a record to the batch turned into N-Triples by the next
+        available process of the pool.
+
+        The pool is started with the first record, once the mappings and
+        property types are set. The N-Triples are written in the order of
+        the records, and at most two batches per process are pending.
+
+        Parameters
+        ----------
+        node: bool
+            Whether the record is a node record (or an edge record)
+        record: Dict
+            A node or edge record
+
+        """
+        self._batch.append((node, record))
+        if len(self._batch) >= self.batch_size:
+            self.write_in_pool()
+
+    def write_in_pool(self, wait: bool = False) -> None:
+        """
+        Send the batch of records to the pool of processes and write the
+        N-Triples of the batches which are done.
+
+        Parameters
+        ----------
+        wait: bool
+            Whether to wait for every pending batch to be written
+
+        """
+        if self._pool is None:
+            self._pool = Pool(
+                processes=self.processes,
+                initializer=_init_pool_sink,
+                initargs=(
+                    type(self),
+                    {"reify_all_edges": self.reify_all_edges},
+                    self.get_pool_state(),
+                ),
+            )
+        if self._batch:
+            self._pending.append(
+                self._pool.apply_async(_serialize_batch, (self._batch,))
+            )
+            self._batch = list()
+        while self._pending and (
+            wait or len(self._pending) > 2 * self.processes or self._pending[0].ready()
+        ):
+            data, owner = self._pending.popleft().get()
+            self._flush()
+            self.FH.write(data)
+            if hasattr(self.owner, "merge_errors"):
+                self.owner.merge_errors(owner)
+
     def finalize(self) -> None:
         """
         Perform any operations after writing the file.
         """
+        if self._pool is not None or self._batch:
+            try:
+                self.write_in_pool(wait=True)
+            except BaseException:
+                self.close()
+                raise
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
         if self.format == "jelly":
             if frame := self._jelly_stream.flow.to_stream_frame():
                 self._jelly_write(frame, self.FH)
+        else:
+            self._flush()
+
+        self.FH.close()
 
+    def close(self) -> None:
+        """
+        Terminate the pool of processes, if any, and close the file,
+        when the records cannot all be written (e.g. a failed transform).
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._pending.clear()
+        self._batch = list()
         self.FH.close()
+
+
+_pool_sink: Optional[RdfSink] = None
+
+
+def _init_pool_sink(cls, kwargs: Dict, state: Dict) -> None:
+    global _pool_sink
+    # the sink of a process only serializes records, never writing to its file
+    _pool_sink = cls(ErrorDetecting(error_log=None), os.devnull, **kwargs)
+    for k, v in state.items():
+        setattr(_pool_sink, k, v)
+
+
+def _serialize_batch(batch: List[Tuple[bool, Dict]]) -> Tuple[bytes, ErrorDetecting]:
+    sink = _pool_sink
+    # the errors of each batch are sent back with its N-Triples
+    sink.owner = ErrorDetecting(error_log=None)
+    rows = [
+        sink._nt_rows(
+            sink._node_triples(record) if node else sink._edge_triples(record)
+        )
+        for node, record in batch
+    ]
+    data = "".join(rows).encode(sink.encoding, "_rdflib_nt_escape")
+    return data, sink.owner
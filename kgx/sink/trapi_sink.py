@@ -1,11 +1,13 @@
 import os
 import json
 import gzip
-from typing import Dict, Optional, Any, List
-import jsonlines
+import shutil
+import tempfile
+from typing import Dict, Optional, Any, List, TextIO
 
 from kgx.sink.sink import Sink
 from kgx.config import get_logger
+from kgx.utils.node_index import NodeSet
 
 log = get_logger()
 
@@ -14,6 +16,17 @@ class TrapiSink(Sink):
     TrapiSink is responsible for writing data in TRAPI (Translator Reasoner API) format.
     This sink converts KGX nodes and edges to TRAPI KnowledgeGraph format.
 
+    The TRAPI Knowledge Graph is written as the records arrive: nodes go
+    straight to the output file, while edges are spooled to a temporary
+    file, since nodes may still follow them, and appended to the output
+    (after all of the nodes) by ``finalize()``. Records are not held
+    in memory, only the ids written so far (in an exact NodeSet), such
+    that a node (or edge) written again is skipped.
+
+    As records are written as they arrive, the first node (or edge) of an id
+    prevails, whereas the last one used to, when the Knowledge Graph was
+    held in memory (as a dictionary) until ``finalize()``.
+
     Parameters
     ----------
     filename: str
@@ -47,12 +60,6 @@ class TrapiSink(Sink):
         self.biolink_version = biolink_version
         self.knowledge_source = knowledge_source
 
-        # Initialize TRAPI Knowledge Graph structure
-        self.knowledge_graph = {
-            "nodes": {},
-            "edges": {}
-        }
-
         # Track node and edge properties for TRAPI
         self.node_properties = set()
         self.edge_properties = set()
@@ -62,6 +69,35 @@ class TrapiSink(Sink):
         if dirname:
             os.makedirs(dirname, exist_ok=True)
 
+        self.output_path = filename
+        if self.compression == 'gz':
+            if not self.output_path.endswith('.gz'):
+                self.output_path = f"{self.output_path}.gz"
+            # compressed output is written as (TRAPI) JSON
+            self.FH: TextIO = gzip.open(self.output_path, 'wt')
+            self.jsonl = False
+        else:
+            self.FH = open(self.output_path, 'w')
+            self.jsonl = self.format == 'jsonl'
+        # edges, as written to the output file, in waiting for the last node
+        self.EH: TextIO = tempfile.TemporaryFile(mode='w+')
+        self.node_count = 0
+        self.edge_count = 0
+        # ids of the nodes and edges written so far, exact,
+        # such that a (hash) collision does not drop a record
+        self.node_ids = NodeSet(exact=True)
+        self.edge_ids = NodeSet(exact=True)
+        self.duplicate_count = 0
+
+        if self.jsonl:
+            # Write header with metadata
+            self._write_line(self.FH, {
+                "type": "knowledge_graph",
+                "biolink_version": self.biolink_version
+            })
+        else:
+            self.FH.write('{\n  "knowledge_graph": {\n    "nodes": {')
+
     def write_node(self, record: Dict) -> None:
         """
         Write a node record to the TRAPI Knowledge Graph.
@@ -77,6 +113,11 @@ class TrapiSink(Sink):
         if not node_id:
             log.warning(f"Node record is missing required 'id' field: {record}")
             return
+        if node_id in self.node_ids:
+            # duplicate keys of the "nodes" object would be invalid TRAPI
+            self.duplicate_count += 1
+            return
+        self.node_ids.add(node_id)
 
         # Create TRAPI node structure
         trapi_node = {
@@ -90,7 +131,11 @@ class TrapiSink(Sink):
             trapi_node['is_set'] = record['is_set']
 
         # Add to knowledge graph
-        self.knowledge_graph["nodes"][node_id] = trapi_node
+        if self.jsonl:
+            self._write_line(self.FH, {"type": "node", "id": node_id, **trapi_node})
+        else:
+            self._write_entry(self.FH, node_id, trapi_node, self.node_count)
+        self.node_count += 1
 
     def write_edge(self, record: Dict) -> None:
         """
@@ -116,6 +161,10 @@ class TrapiSink(Sink):
         # Create edge ID if not provided
         if not edge_id:
             edge_id = f"{subject}-{predicate}-{object}"
+        if edge_id in self.edge_ids:
+            self.duplicate_count += 1
+            return
+        self.edge_ids.add(edge_id)
 
         # Create TRAPI edge structure
         trapi_edge = {
@@ -132,51 +181,46 @@ class TrapiSink(Sink):
             trapi_edge["qualifiers"] = qualifiers
 
         # Add to knowledge graph
-        self.knowledge_graph["edges"][edge_id] = trapi_edge
+        if self.jsonl:
+            self._write_line(self.EH, {"type": "edge", "id": edge_id, **trapi_edge})
+        else:
+            self._write_entry(self.EH, edge_id, trapi_edge, self.edge_count)
+        self.edge_count += 1
+
+    @staticmethod
+    def _write_line(fh: TextIO, entry: Dict) -> None:
+        fh.write(json.dumps(entry))
+        fh.write('\n')
+
+    @staticmethod
+    def _write_entry(fh: TextIO, key: str, value: Dict, count: int) -> None:
+        # a member of the "nodes" (or "edges") object, indented as by json.dump(indent=2)
+        fh.write(',\n      ' if count else '\n      ')
+        fh.write(json.dumps(key))
+        fh.write(': ')
+        fh.write(json.dumps(value, indent=2).replace('\n', '\n      '))
 
     def finalize(self) -> None:
         """
-        Write the complete TRAPI Knowledge Graph to file.
+        Complete the TRAPI Knowledge Graph with the spooled edges.
         """
-        output_path = self.filename
-        
-        # Prepare for compression if needed
-        if self.compression == 'gz':
-            if not output_path.endswith('.gz'):
-                output_path = f"{output_path}.gz"
-            
-            with gzip.open(output_path, 'wt') as f:
-                json.dump({"knowledge_graph": self.knowledge_graph}, f, indent=2)
-        elif self.format == 'jsonl':
-            # For JSONL, write each node and edge as separate lines
-            with jsonlines.open(output_path, 'w') as writer:
-                # Write header with metadata
-                writer.write({
-                    "type": "knowledge_graph",
-                    "biolink_version": self.biolink_version
-                })
-                
-                # Write nodes
-                for node_id, node_data in self.knowledge_graph["nodes"].items():
-                    writer.write({
-                        "type": "node",
-                        "id": node_id,
-                        **node_data
-                    })
-                
-                # Write edges
-                for edge_id, edge_data in self.knowledge_graph["edges"].items():
-                    writer.write({
-                        "type": "edge",
-                        "id": edge_id,
-                        **edge_data
-                    })
-        else:
-            # Default JSON format
-            with open(output_path, 'w') as f:
-                json.dump({"knowledge_graph": self.knowledge_graph}, f, indent=2)
+        if not self.jsonl:
+            self.FH.write('\n    },\n    "edges": {' if self.node_count else '},\n    "edges": {')
+        self.EH.seek(0)
+        shutil.copyfileobj(self.EH, self.FH)
+        self.EH.close()
+        if not self.jsonl:
+            self.FH.write('\n    }\n  }\n}\n' if self.edge_count else '}\n  }\n}\n')
+        self.FH.close()
+        self.node_ids.close()
+        self.edge_ids.close()
 
-        log.info(f"Wrote TRAPI Knowledge Graph to {output_path}")
+        if self.duplicate_count:
+            log.warning(
+                f"Skipped {self.duplicate_count} node and edge records whose 'id' was already written "
+                f"(the first record of an 'id' is kept)"
+            )
+        log.info(f"Wrote TRAPI Knowledge Graph to {self.output_path}")
 
     def _get_categories(self, record: Dict) -> List[str]:
         """
@@ -1,15 +1,22 @@
+import io
 import os
-import tarfile
-from typing import Optional, Dict, Set, Any, List
+import pickle
+import tempfile
+from typing import Optional, Dict, Set, Any, List, Iterator
 from ordered_set import OrderedSet
 
 from kgx.sink.sink import Sink
 from kgx.utils.kgx_utils import (
     extension_types,
-    archive_write_mode,
-    archive_format,
     build_export_row
 )
+from kgx.utils.compression_utils import (
+    COMPRESSION_TYPES,
+    BlockCompressedWriter,
+    archive_compression,
+    open_compressed_writer,
+    write_tar_archive,
+)
 
 
 DEFAULT_NODE_COLUMNS = {
@@ -49,9 +56,15 @@ class TsvSink(Sink):
     format: str
         The file format (``tsv``, ``csv``)
     compression: str
-        The compression type (``tar``, ``tar.gz``)
+        The compression type, either of an archive of both files
+        (``tar``, ``tar.gz``, ``tar.bz2``, ``tar.zst``, ``tar.lz4``)
+        or of each one of the files (``gz``, ``bz2``, ``zst``, ``lz4``)
     kwargs: Any
-        Any additional arguments
+        Any additional arguments, e.g. ``node_properties`` and ``edge_properties``,
+        the columns of the files, ``discover_properties``, to discover the columns
+        of the files whose properties are not given from the records themselves,
+        rather than using default columns, or ``compression_threads``, the number
+        of threads compressing the output (0 to compress on the calling thread)
     """
 
     def __init__(
@@ -69,22 +82,36 @@ class TsvSink(Sink):
         self.dirname = os.path.abspath(os.path.dirname(filename))
         self.basename = os.path.basename(filename)
         self.extension = format.split(":")[0]
-        self.mode = (
-            archive_write_mode[compression]
-            if compression in archive_write_mode
-            else None
-        )
+        self.archive = compression if compression in archive_compression else None
+        if self.archive:
+            self.compression = archive_compression[compression]
+        else:
+            self.compression = compression if compression in COMPRESSION_TYPES else None
+        self.compression_threads = kwargs.get("compression_threads")
         self.list_delimiter = kwargs["list_delimiter"] if "list_delimiter" in kwargs else DEFAULT_LIST_DELIMITER
         self.nodes_file_basename = f"{self.basename}_nodes.{self.extension}"
         self.edges_file_basename = f"{self.basename}_edges.{self.extension}"
+        if self.compression and not self.archive:
+            self.nodes_file_basename += f".{self.compression}"
+            self.edges_file_basename += f".{self.compression}"
         if self.dirname:
             os.makedirs(self.dirname, exist_ok=True)
+        # rows of nodes (or edges) whose columns are being discovered are
+        # spooled to a temporary file, and only written out by finalize(),
+        # once the full set of columns is known
+        discover_properties = kwargs.get("discover_properties", False)
+        self.node_spool: Optional[_RowSpool] = None
+        self.edge_spool: Optional[_RowSpool] = None
         if "node_properties" in kwargs:
             self.node_properties.update(set(kwargs["node_properties"]))
+        elif discover_properties:
+            self.node_spool = _RowSpool(self.dirname)
         else:
             self.node_properties.update(DEFAULT_NODE_COLUMNS)
         if "edge_properties" in kwargs:
             self.edge_properties.update(set(kwargs["edge_properties"]))
+        elif discover_properties:
+            self.edge_spool = _RowSpool(self.dirname)
         else:
             self.edge_properties.update(DEFAULT_EDGE_COLUMNS)
         self.ordered_node_columns = TsvSink._order_node_columns(self.node_properties)
@@ -93,13 +120,31 @@ class TsvSink(Sink):
         self.nodes_file_name = os.path.join(
             self.dirname if self.dirname else "", self.nodes_file_basename
         )
-        self.NFH = open(self.nodes_file_name, "w")
-        self.NFH.write(self.delimiter.join(self.ordered_node_columns) + "\n")
         self.edges_file_name = os.path.join(
             self.dirname if self.dirname else "", self.edges_file_basename
         )
-        self.EFH = open(self.edges_file_name, "w")
-        self.EFH.write(self.delimiter.join(self.ordered_edge_columns) + "\n")
+        self.NFH = None
+        self.EFH = None
+        if not self.node_spool:
+            self.NFH = self._open(self.nodes_file_name)
+            self.NFH.write(self.delimiter.join(self.ordered_node_columns) + "\n")
+        if not self.edge_spool:
+            self.EFH = self._open(self.edges_file_name)
+            self.EFH.write(self.delimiter.join(self.ordered_edge_columns) + "\n")
+
+    def _open(self, filename: str):
+        if not self.archive:
+            return open_compressed_writer(
+                filename, self.compression, threads=self.compression_threads
+            )
+        # the content of an archive member is compressed as it is written,
+        # into a part file, which is then copied as is into the archive
+        writer = BlockCompressedWriter(
+            open(f"{filename}.part", "wb"),
+            self.compression,
+            threads=self.compression_threads if self.compression else 0,
+        )
+        return io.TextIOWrapper(io.BufferedWriter(writer), encoding="utf-8")
 
     def write_node(self, record: Dict) -> None:
         """
@@ -113,6 +158,9 @@ class TsvSink(Sink):
         """
         row = build_export_row(record, list_delimiter=self.list_delimiter)
         row["id"] = record["id"]
+        if self.node_spool:
+            self.node_spool.append(row)
+            return
         values = []
         for c in self.ordered_node_columns:
             if c in row:
@@ -132,6 +180,9 @@ class TsvSink(Sink):
 
         """
         row = build_export_row(record, list_delimiter=self.list_delimiter)
+        if self.edge_spool:
+            self.edge_spool.append(row)
+            return
         values = []
         for c in self.ordered_edge_columns:
             if c in row:
@@ -140,24 +191,49 @@ class TsvSink(Sink):
                 values.append("")
         self.EFH.write(self.delimiter.join(values) + "\n")
 
+    def _write_spooled_rows(self, filename: str, spool: "_RowSpool", columns: OrderedSet):
+        FH = self._open(filename)
+        FH.write(self.delimiter.join(columns) + "\n")
+        for row in spool:
+            FH.write(self.delimiter.join(str(row[c]) if c in row else "" for c in columns) + "\n")
+        return FH
+
     def finalize(self) -> None:
         """
-        Close file handles and create an archive if compression mode is defined.
+        Write out any spooled rows, with the columns discovered from them, close
+        file handles and create an archive if an archive compression type is defined.
         """
+        if self.node_spool:
+            self.node_properties.update(self.node_spool.properties)
+            self.ordered_node_columns = TsvSink._order_node_columns(self.node_properties)
+            self.NFH = self._write_spooled_rows(
+                self.nodes_file_name, self.node_spool, self.ordered_node_columns
+            )
+            self.node_spool = None
+        if self.edge_spool:
+            self.edge_properties.update(self.edge_spool.properties)
+            self.ordered_edge_columns = TsvSink._order_edge_columns(self.edge_properties)
+            self.EFH = self._write_spooled_rows(
+                self.edges_file_name, self.edge_spool, self.ordered_edge_columns
+            )
+            self.edge_spool = None
         self.NFH.close()
         self.EFH.close()
-        if self.mode:
-            archive_basename = f"{self.basename}.{archive_format[self.mode]}"
+        if self.archive:
+            archive_basename = f"{self.basename}.{self.archive}"
             archive_name = os.path.join(
                 self.dirname if self.dirname else "", archive_basename
             )
-            with tarfile.open(name=archive_name, mode=self.mode) as tar:
-                tar.add(self.nodes_file_name, arcname=self.nodes_file_basename)
-                tar.add(self.edges_file_name, arcname=self.edges_file_basename)
-                if os.path.isfile(self.nodes_file_name):
-                    os.remove(self.nodes_file_name)
-                if os.path.isfile(self.edges_file_name):
-                    os.remove(self.edges_file_name)
+            members = [
+                (self.nodes_file_basename, f"{self.nodes_file_name}.part", self.NFH.buffer.raw.size),
+                (self.edges_file_basename, f"{self.edges_file_name}.part", self.EFH.buffer.raw.size),
+            ]
+            try:
+                write_tar_archive(archive_name, members, self.compression)
+            finally:
+                for _, part_file_name, _ in members:
+                    if os.path.isfile(part_file_name):
+                        os.remove(part_file_name)
 
     @staticmethod
     def _order_node_columns(cols: Set) -> OrderedSet:
@@ -262,3 +338,34 @@ class TsvSink(Sink):
         """
         self._edge_properties.update(edge_properties)
         self.ordered_edge_columns = TsvSink._order_edge_columns(self._edge_properties)
+
+
+class _RowSpool(object):
+    """
+    Rows spooled, in pickled batches, to a temporary file, along
+    with the set of the properties (columns) found in the rows.
+    """
+
+    def __init__(self, directory: Optional[str] = None, batch_size: int = 10000):
+        self.FH = tempfile.TemporaryFile(dir=directory)
+        self.batch_size = batch_size
+        self.properties: Set[str] = set()
+        self._batch: List[Dict] = list()
+
+    def append(self, row: Dict) -> None:
+        self.properties.update(row.keys())
+        self._batch.append(row)
+        if len(self._batch) >= self.batch_size:
+            pickle.dump(self._batch, self.FH, protocol=pickle.HIGHEST_PROTOCOL)
+            self._batch = list()
+
+    def __iter__(self) -> Iterator[Dict]:
+        # rows can be read only once, after which the spool is closed
+        with self.FH:
+            self.FH.seek(0)
+            while True:
+                try:
+                    yield from pickle.load(self.FH)
+                except EOFError:
+                    break
+            yield from self._batch
@@ -7,11 +7,11 @@ from arango import ArangoClient
 from kgx.config import get_logger
 from kgx.source.source import Source
 from kgx.utils.kgx_utils import (
-    generate_uuid,
     generate_edge_key,
     sanitize_import,
     knowledge_provenance_properties,
 )
+from kgx.utils.node_index import NodeSet
 
 log = get_logger()
 
@@ -27,7 +27,8 @@ class ArangoSource(Source):
         self.db = None
         self.node_count = 0
         self.edge_count = 0
-        self.seen_nodes = set()
+        # exact, as a (hash) collision would otherwise drop a distinct node
+        self.seen_nodes = NodeSet(exact=True)
 
     def _connect_db(self, uri: str, database: str, username: str, password: str):
         """
@@ -418,7 +419,7 @@ class ArangoSource(Source):
         self.set_edge_provenance(edge_data)
 
         if "id" not in edge_data.keys():
-            edge_data["id"] = generate_uuid()
+            edge_data["id"] = self.generate_edge_id(edge_data)
         key = generate_edge_key(
             subject_node["id"], edge_data["predicate"], object_node["id"]
         )
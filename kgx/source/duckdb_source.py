@@ -14,6 +14,7 @@ from kgx.utils.kgx_utils import (
     sanitize_import,
     knowledge_provenance_properties,
 )
+from kgx.utils.node_index import NodeSet
 
 log = get_logger()
 
@@ -29,7 +30,8 @@ class DuckDbSource(Source):
         self.connection: Optional[duckdb.DuckDBPyConnection] = None
         self.node_count = 0
         self.edge_count = 0
-        self.seen_nodes = set()
+        # exact, as a (hash) collision would otherwise drop a distinct node
+        self.seen_nodes = NodeSet(exact=True)
 
     def _connect_db(self, database_path: str):
         """Connect to DuckDB database."""
@@ -19,7 +19,7 @@ class GraphSource(Source):
         super().__init__(owner)
         self.graph = get_graph_store_class()()
 
-    def parse(self, graph: BaseGraph, **kwargs: Any) -> Generator:
+    def parse(self, graph: BaseGraph, trusted: bool = False, **kwargs: Any) -> Generator:
         """
         This method reads from a graph and yields records.
 
@@ -27,6 +27,11 @@ class GraphSource(Source):
         ----------
         graph: kgx.graph.base_graph.BaseGraph
             The graph to read from
+        trusted: bool
+            Whether the graph holds records already validated and sanitized on
+            import (e.g. an intermediate graph of the Transformer), such that
+            these are yielded as they are, rather than validated, copied and
+            sanitized once again
         kwargs: Any
             Any additional arguments
 
@@ -40,14 +45,19 @@ class GraphSource(Source):
 
         self.set_provenance_map(kwargs)
 
-        nodes = self.read_nodes()
-        edges = self.read_edges()
+        nodes = self.read_nodes(trusted)
+        edges = self.read_edges(trusted)
         yield from chain(nodes, edges)
 
-    def read_nodes(self) -> Generator:
+    def read_nodes(self, trusted: bool = False) -> Generator:
         """
         Read nodes as records from the graph.
 
+        Parameters
+        ----------
+        trusted: bool
+            Whether the nodes of the graph were already validated and sanitized
+
         Returns
         -------
         Generator
@@ -58,11 +68,18 @@ class GraphSource(Source):
             if "id" not in data:
                 data["id"] = n
 
-            node_data = self.validate_node(data)
-            if not node_data:
-                continue
+            if trusted and "category" in data:
+                # a (shallow) copy, such that neither the provenance set
+                # below, nor a sink, changes the nodes of the graph
+                node_data = data.copy()
+            else:
+                # nodes only added to the graph as the subject or object of
+                # an edge have no category, nor were they ever validated
+                node_data = self.validate_node(data)
+                if not node_data:
+                    continue
 
-            node_data = sanitize_import(node_data.copy())
+                node_data = sanitize_import(node_data.copy())
 
             self.set_node_provenance(node_data)
 
@@ -70,10 +87,15 @@ class GraphSource(Source):
                 self.node_properties.update(node_data.keys())
                 yield n, node_data
 
-    def read_edges(self) -> Generator:
+    def read_edges(self, trusted: bool = False) -> Generator:
         """
         Read edges as records from the graph.
 
+        Parameters
+        ----------
+        trusted: bool
+            Whether the edges of the graph were already validated and sanitized
+
         Returns
         -------
         Generator
@@ -82,11 +104,14 @@ class GraphSource(Source):
         """
         for u, v, k, data in self.graph.edges(keys=True, data=True):
 
-            edge_data = self.validate_edge(data)
-            if not edge_data:
-                continue
+            if trusted:
+                edge_data = data.copy()
+            else:
+                edge_data = self.validate_edge(data)
+                if not edge_data:
+                    continue
 
-            edge_data = sanitize_import(edge_data.copy())
+                edge_data = sanitize_import(edge_data.copy())
 
             self.set_edge_provenance(edge_data)
 
@@ -1,14 +1,25 @@
-import gzip
+import pickle
+from functools import partial
+from itertools import chain, takewhile
+from operator import ne
+import tempfile
 import typing
 import ijson
-from itertools import chain
-from typing import Dict, Tuple, Any, Generator, Optional, List
+from typing import Dict, Tuple, Any, Generator, Optional, List, Iterator, Callable
 from kgx.config import get_logger
 
 from kgx.source.tsv_source import TsvSource
+from kgx.utils.compression_utils import open_compressed_reader
 log = get_logger()
 
 
+def _section(prefix: str, event: str, events: Iterator) -> Iterator:
+    # the ijson events of a container, from the given (start) event
+    # through to its end event, chaining C level iterators all the way
+    end = (prefix, "end_map" if event == "start_map" else "end_array", None)
+    return chain(((prefix, event, None),), takewhile(partial(ne, end), events), (end,))
+
+
 class JsonSource(TsvSource):
     """
     JsonSource is responsible for reading data as records
@@ -37,7 +48,7 @@ class JsonSource(TsvSource):
         format: str
             The format (``json``)
         compression: Optional[str]
-            The compression type (``gz``)
+            The compression type (``gz``, ``bz2``, ``zst``, ``lz4``)
         kwargs: Any
             Any additional arguments
 
@@ -55,6 +66,166 @@ class JsonSource(TsvSource):
         e = self.read_edges(filename)
         yield from chain(n, e)
 
+    def read_json(
+        self,
+        filename: str,
+        compression: Optional[str] = None,
+        node_prefixes: Tuple[str, ...] = ("nodes",),
+        edge_prefixes: Tuple[str, ...] = ("edges",),
+        use_float: bool = True,
+    ) -> Generator:
+        """
+        Read node and edge records from a JSON, in a single streaming pass.
+
+        The file is scanned once for the arrays (or objects) of nodes and of
+        edges found at the given ijson prefixes, each of their items being
+        built one at a time.
+
+        Note that ijson only builds items in C (with its ``yajl2_c`` backend)
+        when reading a file itself, rather than a stream of events: reading
+        the nodes and then the edges in separate passes over a file, as does
+        ``parse``, is faster, unless the file is costly to read (decompress)
+        twice, or the edges come first (see ``examples/scripts/benchmark_json_source.py``).
+
+        Node records are yielded before edge records: edges are spooled to
+        a temporary file until no more nodes may follow, that is, until the
+        end of the file when nodes are found under an array (e.g. the
+        ``graphs.item.nodes`` of an OBO Graph JSON).
+
+        Parameters
+        ----------
+        filename: str
+            The filename to read from
+        compression: Optional[str]
+            The compression type (``gz``, ``bz2``, ``zst``, ``lz4``)
+        node_prefixes: Tuple[str, ...]
+            The ijson prefixes of nodes
+        edge_prefixes: Tuple[str, ...]
+            The ijson prefixes of edges
+        use_float: bool
+            Whether to read real numbers as float, rather than Decimal
+
+        Returns
+        -------
+        Generator
+            A generator for node and edge records
+
+        """
+        nodes_read = False
+        spool = None
+        with self._open_json(filename, compression) as FH:
+            events = ijson.parse(FH, use_float=use_float)
+            for prefix, event, value in events:
+                if (event == "start_map" or event == "start_array") and prefix in node_prefixes:
+                    section = _section(prefix, event, events)
+                    yield from self._read_json_section(section, prefix, event, self.read_json_node)
+                    if "item" not in prefix.split("."):
+                        # no more nodes may follow
+                        nodes_read = True
+                        if spool:
+                            yield from self._unspool(spool)
+                            spool = None
+                elif (event == "start_map" or event == "start_array") and prefix in edge_prefixes:
+                    section = _section(prefix, event, events)
+                    edges = self._read_json_section(section, prefix, event, self.read_json_edge)
+                    if nodes_read:
+                        yield from edges
+                    else:
+                        spool = self._spool(edges, spool)
+                else:
+                    self.read_json_event(prefix, event, value)
+        if spool:
+            yield from self._unspool(spool)
+
+    def read_json_node(self, node: Dict, key: Optional[str] = None) -> Optional[Tuple[str, Dict]]:
+        """
+        Read a node, as found by ``read_json``.
+
+        Parameters
+        ----------
+        node: Dict
+            The node
+        key: Optional[str]
+            The key of the node, if read from an object, rather than from an array
+
+        Returns
+        -------
+        Optional[Tuple[str, Dict]]
+            The node record
+
+        """
+        return self.read_node(node)
+
+    def read_json_edge(self, edge: Dict, key: Optional[str] = None) -> Optional[Tuple[str, str, str, Dict]]:
+        """
+        Read an edge, as found by ``read_json``.
+
+        Parameters
+        ----------
+        edge: Dict
+            The edge
+        key: Optional[str]
+            The key of the edge, if read from an object, rather than from an array
+
+        Returns
+        -------
+        Optional[Tuple[str, str, str, Dict]]
+            The edge record
+
+        """
+        return self.read_edge(edge)
+
+    def read_json_event(self, prefix: str, event: str, value: Any) -> None:
+        """
+        Read an ijson event found by ``read_json`` outside of nodes and edges.
+
+        Parameters
+        ----------
+        prefix: str
+            The ijson prefix
+        event: str
+            The ijson event
+        value: Any
+            The value of the event
+
+        """
+        pass
+
+    @staticmethod
+    def _open_json(filename: str, compression: Optional[str] = None) -> typing.BinaryIO:
+        return open_compressed_reader(filename, compression)
+
+    @staticmethod
+    def _read_json_section(section: Iterator, prefix: str, event: str, read: Callable) -> Generator:
+        if event == "start_map":
+            for key, data in ijson.kvitems(section, prefix):
+                record = read(data, key)
+                if record:
+                    yield record
+        else:
+            for data in ijson.items(section, f"{prefix}.item"):
+                record = read(data)
+                if record:
+                    yield record
+
+    @staticmethod
+    def _spool(records: Iterator, spool: Optional[typing.BinaryIO] = None) -> typing.BinaryIO:
+        if spool is None:
+            spool = tempfile.TemporaryFile()
+        for record in records:
+            pickle.dump(record, spool, protocol=pickle.HIGHEST_PROTOCOL)
+        return spool
+
+    @staticmethod
+    def _unspool(spool: typing.BinaryIO) -> Generator:
+        with spool:
+            spool.seek(0)
+            while True:
+                try:
+                    yield pickle.load(spool)
+                except EOFError:
+                    break
+
     def read_nodes(self, filename: str) -> Generator:
         """
         Read node records from a JSON.
@@ -70,12 +241,9 @@ class JsonSource(TsvSource):
             A generator for node records
 
         """
-        if self.compression == "gz":
-            FH = gzip.open(filename, "rb")
-        else:
-            FH = open(filename, "rb")
-        for n in ijson.items(FH, "nodes.item"):
-            yield self.read_node(n)
+        with self._open_json(filename, self.compression) as FH:
+            for n in ijson.items(FH, "nodes.item"):
+                yield self.read_node(n)
 
     def read_edges(self, filename: str) -> Generator:
         """
@@ -92,10 +260,7 @@ class JsonSource(TsvSource):
             A generator for edge records
 
         """
-        if self.compression == "gz":
-            FH = gzip.open(filename, "rb")
-        else:
-            FH = open(filename, "rb")
-        for e in ijson.items(FH, "edges.item", use_float=True):
-            yield self.read_edge(e)
+        with self._open_json(filename, self.compression) as FH:
+            for e in ijson.items(FH, "edges.item", use_float=True):
+                yield self.read_edge(e)
 
@@ -1,11 +1,11 @@
-import gzip
 import re
 import typing
-
-import jsonlines
 from typing import Optional, Any, Generator, Dict
 
 from kgx.config import get_logger
+from kgx.utils.compression_utils import open_compressed_reader
+from kgx.utils.jsonl_utils import read_jsonl, read_jsonl_block, read_jsonl_blocks
+from kgx.utils.kgx_utils import get_pool_processes
 
 log = get_logger()
 
@@ -38,9 +38,10 @@ class JsonlSource(JsonSource):
         format: str
             The format (``json``)
         compression: Optional[str]
-            The compression type (``gz``)
+            The compression type (``gz``, ``bz2``, ``zst``, ``lz4``)
         kwargs: Any
-            Any additional arguments
+            Any additional arguments, e.g. ``processes``, the number
+            of processes turning the lines of the file into records
 
         Returns
         -------
@@ -48,13 +49,17 @@ class JsonlSource(JsonSource):
             A generator for records
 
         """
-
+        processes = get_pool_processes(kwargs.pop("processes", None))
+        # the (not yet consumed) arguments of the processes reading the lines
+        pool_kwargs = dict(kwargs)
         self.set_provenance_map(kwargs)
 
         if re.search(f"nodes.{format}", filename):
             m = self.read_node
+            read_lines = "read_node_lines"
         elif re.search(f"edges.{format}", filename):
             m = self.read_edge
+            read_lines = "read_edge_lines"
         else:
             # This used to throw an exception but perhaps we should simply ignore it.
             log.warning(
@@ -62,12 +67,48 @@ class JsonlSource(JsonSource):
             )
             return
 
-        if compression == "gz":
-            with gzip.open(filename, "rb") as FH:
-                reader = jsonlines.Reader(FH)
-                for obj in reader:
-                    yield m(obj)
-        else:
-            with jsonlines.open(filename) as FH:
-                for obj in FH:
+        with open_compressed_reader(filename, compression) as FH:
+            if processes > 1:
+                # the (raw) blocks of lines are decoded into records by a pool of processes
+                yield from self.read_in_pool(
+                    read_lines, read_jsonl_blocks(FH), processes, pool_kwargs
+                )
+            else:
+                for obj in read_jsonl(FH):
                     yield m(obj)
+
+    def read_node_lines(self, block: bytes) -> Generator:
+        """
+        Read node records from a block of JSON Lines.
+
+        Parameters
+        ----------
+        block: bytes
+            The block of lines
+
+        Returns
+        -------
+        Generator
+            A generator for node records
+
+        """
+        for obj in read_jsonl_block(block):
+            yield self.read_node(obj)
+
+    def read_edge_lines(self, block: bytes) -> Generator:
+        """
+        Read edge records from a block of JSON Lines.
+
+        Parameters
+        ----------
+        block: bytes
+            The block of lines
+
+        Returns
+        -------
+        Generator
+            A generator for edge records
+
+        """
+        for obj in read_jsonl_block(block):
+            yield self.read_edge(obj)
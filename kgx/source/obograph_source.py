@@ -1,4 +1,3 @@
-import gzip
 import typing
 from itertools import chain
 from typing import Optional, Tuple, Dict, Generator, Any
@@ -46,7 +45,7 @@ class ObographSource(JsonSource):
         format: str
             The format (``json``)
         compression: Optional[str]
-            The compression type (``gz``)
+            The compression type (``gz``, ``bz2``, ``zst``, ``lz4``)
         kwargs: Any
             Any additional arguments
 
@@ -78,12 +77,9 @@ class ObographSource(JsonSource):
             A generator for node records
 
         """
-        if compression and compression == "gz":
-            FH = gzip.open(filename, "rb")
-        else:
-            FH = open(filename, "rb")
-        for n in ijson.items(FH, "graphs.item.nodes.item"):
-            yield self.read_node(n)
+        with self._open_json(filename, compression) as FH:
+            for n in ijson.items(FH, "graphs.item.nodes.item"):
+                yield self.read_node(n)
 
     def read_node(self, node: Dict) -> Optional[Tuple[str, Dict]]:
         """
@@ -171,12 +167,9 @@ class ObographSource(JsonSource):
             A generator for edge records
 
         """
-        if compression == "gz":
-            FH = gzip.open(filename, "rb")
-        else:
-            FH = open(filename, "rb")
-        for e in ijson.items(FH, "graphs.item.edges.item"):
-            yield self.read_edge(e)
+        with self._open_json(filename, compression) as FH:
+            for e in ijson.items(FH, "graphs.item.edges.item"):
+                yield self.read_edge(e)
 
     def read_edge(self, edge: Dict) -> Optional[Tuple]:
         """
@@ -6,9 +6,9 @@ from rdflib import Namespace, URIRef, OWL, RDFS, RDF
 
 from kgx.config import get_logger
 from kgx.source import RdfSource
+from kgx.utils.compression_utils import open_compressed_reader
 from kgx.utils.kgx_utils import (
     current_time_in_millis,
-    generate_uuid,
     sanitize_import
 )
 
@@ -50,7 +50,7 @@ class OwlSource(RdfSource):
         format: str
             The format (``owl``)
         compression: Optional[str]
-            The compression type (``gz``)
+            The compression type (``gz``, ``bz2``, ``zst``, ``lz4``)
         kwargs: Any
             Any additional arguments
 
@@ -61,8 +61,6 @@ class OwlSource(RdfSource):
 
         """
         rdfgraph = rdflib.Graph()
-        if compression:
-            log.warning(f"compression mode '{compression}' not supported by OwlSource")
         if format is None:
             format = rdflib.util.guess_format(filename)
 
@@ -70,7 +68,11 @@ class OwlSource(RdfSource):
             format = "xml"
 
         log.info("Parsing {} with '{}' format".format(filename, format))
-        rdfgraph.parse(filename, format=format)
+        if compression:
+            with open_compressed_reader(filename, compression) as FH:
+                rdfgraph.parse(FH, format=format)
+        else:
+            rdfgraph.parse(filename, format=format)
         log.info("{} parsed with {} triples".format(filename, len(rdfgraph)))
 
         self.set_provenance_map(kwargs)
@@ -138,7 +140,14 @@ class OwlSource(RdfSource):
                 parent = o
             if os_interpretation:
                 # reify edges that have logical interpretation
-                eid = generate_uuid()
+                eid = self.generate_edge_id(
+                    {
+                        "subject": str(s),
+                        "predicate": str(pred),
+                        "object": str(parent),
+                        "logical_interpretation": str(os_interpretation),
+                    }
+                )
                 self.reified_nodes.add(eid)
                 yield from self.triple(
                     URIRef(eid), self.BIOLINK.term("category"), self.BIOLINK.Association
@@ -1,6 +1,9 @@
-import gzip
+import os
+import tempfile
 import typing
-from typing import Set, Dict, Union, Optional, Any, Tuple, List, Generator
+import uuid
+from typing import Set, Dict, IO, Union, Optional, Any, Tuple, List, Generator
+from zlib import crc32
 
 import rdflib
 from linkml_runtime.linkml_model.meta import SlotDefinition, ClassDefinition, Element
@@ -9,10 +12,12 @@ from rdflib import URIRef, RDF, Namespace
 from kgx.error_detection import ErrorType, MessageLevel
 from kgx.prefix_manager import PrefixManager
 from kgx.config import get_logger
-from kgx.parsers.ntriples_parser import CustomNTriplesParser
+from kgx.parsers.ntriples_parser import FastNTriplesParser
 from kgx.parsers.jelly_parser import JellyParser
 from kgx.source.source import Source, DEFAULT_EDGE_PREDICATE
+from kgx.utils.compression_utils import open_compressed_reader
 from kgx.utils.graph_utils import curie_lookup
+from kgx.utils.node_store import NodeStore
 from kgx.utils.kgx_utils import (
     get_toolkit,
     is_property_multivalued,
@@ -22,6 +27,7 @@ from kgx.utils.kgx_utils import (
     get_biolink_ancestors,
     sanitize_import,
     prepare_data_dict,
+    get_pool_processes,
     CORE_NODE_PROPERTIES,
     CORE_EDGE_PROPERTIES,
     knowledge_provenance_properties,
@@ -31,6 +37,9 @@ log = get_logger()
 
 NAMED_THING = "biolink:NamedThing"
 
+# size (in bytes) of the input split into each part parsed by a process
+PART_SIZE = 1 << 28
+
 
 class RdfSource(Source):
     """
@@ -94,6 +103,8 @@ class RdfSource(Source):
         self.node_cache = {}
         self.edge_cache = {}
         self._incomplete_nodes = {}
+        # whether the node records are partial, only given their provenance once merged
+        self._partial_nodes = False
 
     def set_predicate_mapping(self, m: Dict) -> None:
         """
@@ -148,9 +159,14 @@ class RdfSource(Source):
         format: str
             The RDF serialization format (``nt`` or ``jelly``).
         compression: Optional[str]
-            The compression type (``gz``)
+            The compression type (``gz``, ``bz2``, ``zst``, ``lz4``)
         kwargs: Any
-            Any additional arguments
+            Any additional arguments, e.g. ``processes``, the number of
+            processes parsing N-Triples (see ``read_triples_in_pool``), or
+            ``node_cache_directory``, a directory in which to spill the
+            records of the nodes to disk (see ``kgx.utils.node_store.NodeStore``),
+            rather than holding all of them in memory until the end of the parse,
+            and in which the N-Triples parsed by a pool of processes are split
 
         Returns
         -------
@@ -158,51 +174,69 @@ class RdfSource(Source):
             A generator for records
 
         """
-        self.set_provenance_map(kwargs)
-
-        if format == "jelly":
-            parser = JellyParser(self)
-            yield from parser.parse(filename, compression)
-            log.info(f"Done parsing {filename} (jelly)")
+        node_cache_directory = kwargs.pop("node_cache_directory", None)
+        if node_cache_directory:
+            self.node_cache = NodeStore(node_cache_directory)
+        try:
+            processes = get_pool_processes(kwargs.pop("processes", None))
+            # the (not yet consumed) arguments of the processes parsing the triples
+            pool_kwargs = dict(kwargs)
+            self.set_provenance_map(kwargs)
+
+            if format == "jelly":
+                parser = JellyParser(self)
+                yield from parser.parse(filename, compression)
+                log.info(f"Done parsing {filename} (jelly)")
+
+            elif format == "nt":
+                if processes > 1:
+                    yield from self.read_triples_in_pool(
+                        filename, compression, processes, pool_kwargs, node_cache_directory
+                    )
+                else:
+                    p = FastNTriplesParser(self)
 
-        elif format == "nt":
-            p = CustomNTriplesParser(self)
+                    with open_compressed_reader(filename, compression) as FH:
+                        yield from p.parse(FH)
+                log.info(f"Done parsing {filename} (nt)")
 
-            if compression == "gz":
-                yield from p.parse(gzip.open(filename, "rb"))
             else:
-                yield from p.parse(open(filename, "rb"))
-            log.info(f"Done parsing {filename} (nt)")
+                raise ValueError(f"Unsupported format: {format}")
 
-        else:
-            raise ValueError(f"Unsupported format: {format}")
+            for n in self.reified_nodes:
+                data = self.node_cache.pop(n)
+                self.dereify(n, data)
 
-        for n in self.reified_nodes:
-            data = self.node_cache.pop(n)
-            self.dereify(n, data)
+            for k, node_data in self.node_cache.items():
+                if "category" in node_data:
+                    if NAMED_THING not in set(node_data["category"]):
+                        node_data["category"].append(NAMED_THING)
+                else:
+                    node_data["category"] = [NAMED_THING]
 
-        for k in self.node_cache.keys():
-            node_data = self.node_cache[k]
-            if "category" in node_data:
-                if NAMED_THING not in set(node_data["category"]):
-                    node_data["category"].append(NAMED_THING)
-            else:
-                node_data["category"] = [NAMED_THING]
+                node_data = self.validate_node(node_data)
+                if not node_data:
+                    continue
 
-            node_data = self.validate_node(node_data)
-            if not node_data:
-                continue
+                node_data = sanitize_import(node_data)
 
-            node_data = sanitize_import(node_data)
+                self.set_node_provenance(node_data)
 
-            self.set_node_provenance(node_data)
+                if self.check_node_filter(node_data):
+                    self.node_properties.update(node_data.keys())
+                    yield k, node_data
 
-            if self.check_node_filter(node_data):
-                self.node_properties.update(node_data.keys())
-                yield k, node_data
+            self.node_cache.clear()
 
-        self.node_cache.clear()
+            yield from self._read_edge_cache()
+        finally:
+            if node_cache_directory:
+                # the (possibly very large) SQLite database of the nodes is removed,
+                # even if the parse fails or its generator is closed before the end
+                self.node_cache.close()
+                self.node_cache = {}
 
+    def _read_edge_cache(self) -> Generator:
         for k in self.edge_cache.keys():
             edge_data = self.edge_cache[k]
 
@@ -220,6 +254,120 @@ class RdfSource(Source):
 
         self.edge_cache.clear()
 
+    def get_pool_state(self) -> Dict[str, Any]:
+        """
+        Get the (picklable) attributes copied onto the
+        Sources of the processes reading records in parallel.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The attributes, by name
+
+        """
+        state = super().get_pool_state()
+        state["predicate_mapping"] = self.predicate_mapping
+        state["node_property_predicates"] = self.node_property_predicates
+        return state
+
+    def read_triples_in_pool(
+        self,
+        filename: str,
+        compression: Optional[str],
+        processes: int,
+        kwargs: Dict,
+        directory: Optional[str] = None,
+    ) -> Generator:
+        """
+        Parse N-Triples in a pool of processes.
+
+        The lines of the file are split by their subject, in a single pass over
+        the file, into (temporary) files of N-Triples, such that every triple of
+        a subject is in the same file, in the order of the original file. Each
+        one of these files is then parsed, as a whole, by a process of the pool,
+        which yields the edges of its triples (including those of reified
+        association nodes, whose triples are all in that file) and the partial
+        records of its nodes. The partial records of a node, e.g. of an object
+        of a triple and of the subject of the triples with its properties, are
+        merged, by node, once every file has been parsed.
+
+        The files of N-Triples hold an uncompressed copy of the file, written
+        before any record is yielded (and each one removed once parsed), in a
+        temporary directory created in ``directory``.
+
+        Parameters
+        ----------
+        filename: str
+            The filename to parse
+        compression: Optional[str]
+            The compression type (``gz``, ``bz2``, ``zst``, ``lz4``)
+        processes: int
+            Number of processes
+        kwargs: Dict
+            The (not yet consumed) arguments of ``parse``
+        directory: Optional[str]
+            Directory of the files of N-Triples (the system default, if not given)
+
+        Returns
+        -------
+        Generator
+            A generator for records
+
+        """
+        # enough parts for each one of them to hold a bounded number of records
+        parts = max(processes, -(-os.path.getsize(filename) // PART_SIZE))
+        # the identifiers of blank nodes are shared by the processes
+        bnode_prefix = f"{uuid.uuid4().hex}_"
+        with tempfile.TemporaryDirectory(prefix="kgx-nt-", dir=directory) as directory:
+            with open_compressed_reader(filename, compression) as FH:
+                paths = split_triples(FH, directory, parts)
+            batches = [(path, bnode_prefix) for path in paths]
+            for rec in self.read_in_pool("read_triples", batches, processes, kwargs):
+                if len(rec) == 4:
+                    yield rec
+                else:
+                    n, data = rec
+                    if n in self.node_cache:
+                        self.node_cache[n] = prepare_data_dict(self.node_cache[n], data)
+                    else:
+                        self.node_cache[n] = data
+
+    def read_triples(self, batch: Tuple[str, str]) -> Generator:
+        """
+        Parse a file of N-Triples holding every triple of its subjects,
+        e.g. in a process of the pool of ``read_triples_in_pool``.
+
+        Parameters
+        ----------
+        batch: Tuple[str, str]
+            The filename to parse and the prefix of the identifiers of blank nodes
+
+        Returns
+        -------
+        Generator
+            A generator for edge records and the partial (not yet validated) node records
+
+        """
+        path, bnode_prefix = batch
+        self.node_cache = {}
+        self.edge_cache = {}
+        self.reified_nodes = set()
+        self._incomplete_nodes = {}
+        self._partial_nodes = True
+        p = FastNTriplesParser(self, bnode_prefix=bnode_prefix)
+        with open(path, "rb") as FH:
+            yield from p.parse(FH)
+        os.remove(path)
+
+        for n in self.reified_nodes:
+            data = self.node_cache.pop(n)
+            self.dereify(n, data)
+        self.reified_nodes = set()
+
+        yield from self._read_edge_cache()
+        yield from self.node_cache.items()
+        self.node_cache = {}
+
     def triple(self, s: URIRef, p: URIRef, o: URIRef) -> None:
         """
         Parse a triple.
@@ -460,7 +608,8 @@ class RdfSource(Source):
         else:
             node_data["category"] = [NAMED_THING]
 
-        self.set_node_provenance(node_data)
+        if not self._partial_nodes:
+            self.set_node_provenance(node_data)
 
         self.node_cache[n] = node_data
         return node_data
@@ -860,3 +1009,55 @@ class RdfSource(Source):
                 )
                 element = None
         return element
+
+
+def split_triples(f: IO, directory: str, parts: int) -> List[str]:
+    """
+    Split the lines of N-Triples into files, by the hash of their subject,
+    such that every triple of a subject is in the same file, in order.
+
+    Parameters
+    ----------
+    f: IO
+        The (binary) file of N-Triples
+    directory: str
+        The directory of the files
+    parts: int
+        The number of files
+
+    Returns
+    -------
+    List[str]
+        The files, without those left empty
+
+    """
+    paths = [os.path.join(directory, f"part_{i}.nt") for i in range(parts)]
+    files = [open(path, "wb") for path in paths]
+    written = [False] * parts
+    try:
+        rest = b""
+        while True:
+            block = f.read(1 << 20)
+            if not block:
+                lines = [rest] if rest else []
+            else:
+                lines = (rest + block).split(b"\n")
+                rest = lines.pop()
+            buffers: List[List[bytes]] = [[] for _ in range(parts)]
+            for line in lines:
+                subject = line.split(None, 1)
+                i = crc32(subject[0]) % parts if subject else 0
+                buffers[i].append(line)
+            for i, buffer in enumerate(buffers):
+                if buffer:
+                    files[i].write(b"\n".join(buffer) + b"\n")
+                    written[i] = True
+            if not block:
+                break
+    finally:
+        for FH in files:
+            FH.close()
+    for path, w in zip(paths, written):
+        if not w:
+            os.remove(path)
+    return [path for path, w in zip(paths, written) if w]
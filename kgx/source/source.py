@@ -1,7 +1,10 @@
-from typing import Dict, Union, Optional
+from collections import deque
+from multiprocessing import Pool
+from typing import Any, Dict, Generator, Iterable, Tuple, Union, Optional
 
-from kgx.error_detection import ErrorType, MessageLevel
+from kgx.error_detection import ErrorDetecting, ErrorType, MessageLevel
 from kgx.utils.infores import InfoResContext
+from kgx.utils.kgx_utils import generate_edge_hash_id, generate_uuid
 from kgx.prefix_manager import PrefixManager
 from kgx.config import get_logger
 
@@ -10,6 +13,10 @@ log = get_logger()
 DEFAULT_NODE_CATEGORY = "biolink:NamedThing"
 DEFAULT_EDGE_PREDICATE = "biolink:related_to"
 
+# ways of identifying edges without an id: random
+# UUIDs or UUIDs derived from a hash of the edge
+EDGE_ID_TYPES = ("uuid", "hash")
+
 
 class Source(object):
     """
@@ -26,6 +33,7 @@ class Source(object):
         self.edge_properties = set()
         self.prefix_manager = PrefixManager()
         self.infores_context: Optional[InfoResContext] = InfoResContext()
+        self.edge_id_type: str = "uuid"
 
     def set_prefix_map(self, m: Dict) -> None:
         """
@@ -39,6 +47,42 @@ class Source(object):
         """
         self.prefix_manager.update_prefix_map(m)
 
+    def set_edge_id_type(self, edge_id_type: str) -> None:
+        """
+        Set how edges without an id are given one: a random
+        UUID (``uuid``, the default) or a UUID derived from a
+        hash of the subject, predicate, object and qualifiers
+        of the edge (``hash``), which is the same on every run.
+
+        Parameters
+        ----------
+        edge_id_type: str
+            Either ``uuid`` or ``hash``
+
+        """
+        if edge_id_type not in EDGE_ID_TYPES:
+            raise ValueError(f"edge_id_type must be one of {EDGE_ID_TYPES}")
+        self.edge_id_type = edge_id_type
+
+    def generate_edge_id(self, edge: Dict) -> str:
+        """
+        Generate an id for an edge without one (see ``set_edge_id_type``).
+
+        Parameters
+        ----------
+        edge: Dict
+            The edge
+
+        Returns
+        -------
+        str
+            The edge id
+
+        """
+        if self.edge_id_type == "hash":
+            return generate_edge_hash_id(edge)
+        return generate_uuid()
+
     def check_node_filter(self, node: Dict) -> bool:
         """
         Check if a node passes defined node filters.
@@ -258,6 +302,85 @@ class Source(object):
         """
         self.infores_context.set_provenance_map(kwargs)
 
+    def get_pool_state(self) -> Dict[str, Any]:
+        """
+        Get the (picklable) attributes copied onto the
+        Sources of the processes reading records in parallel.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The attributes, by name
+
+        """
+        return {
+            "graph_metadata": self.graph_metadata,
+            "node_filters": self.node_filters,
+            "edge_filters": self.edge_filters,
+            "prefix_manager": self.prefix_manager,
+            "edge_id_type": self.edge_id_type,
+        }
+
+    def read_in_pool(
+        self, method: str, batches: Iterable, processes: int, kwargs: Dict
+    ) -> Generator:
+        """
+        Read batches of raw records (e.g. blocks of JSON Lines or chunks of
+        a TSV) in a pool of processes, each with a copy of this Source, and
+        yield the resulting records in the order of the batches.
+
+        The node and edge properties, InfoRes catalog and errors of every
+        batch are merged into those of this Source (and its owner). At most
+        two batches per process are read ahead of the records yielded.
+
+        Parameters
+        ----------
+        method: str
+            Name of the method of the Source turning a batch of raw
+            records into records, e.g. ``read_nodes`` of a TsvSource
+        batches: Iterable
+            The batches of raw records
+        processes: int
+            Number of processes
+        kwargs: Dict
+            The (not yet consumed) arguments of ``parse``, from which the
+            provenance map of each process is set up
+
+        Returns
+        -------
+        Generator
+            A generator for node and edge records
+
+        """
+        pending = deque()
+        with Pool(
+            processes=processes,
+            initializer=_init_pool_source,
+            initargs=(type(self), self.get_pool_state(), kwargs),
+        ) as pool:
+            for batch in batches:
+                pending.append(pool.apply_async(_read_batch, ((method, batch),)))
+                if len(pending) > 2 * processes:
+                    yield from self._merge_batch(*pending.popleft().get())
+            while pending:
+                yield from self._merge_batch(*pending.popleft().get())
+
+    def _merge_batch(
+        self,
+        records: list,
+        node_properties: set,
+        edge_properties: set,
+        catalog: Dict,
+        owner: ErrorDetecting,
+    ) -> list:
+        self.node_properties.update(node_properties)
+        self.edge_properties.update(edge_properties)
+        if self.infores_context:
+            self.infores_context.catalog.update(catalog)
+        if hasattr(self.owner, "merge_errors"):
+            self.owner.merge_errors(owner)
+        return records
+
     def get_infores_catalog(self) -> Dict[str, str]:
         """
         Return the InfoRes Context of the source
@@ -364,3 +487,27 @@ class Source(object):
             return edge
         else:
             return None
+
+
+# the Source of a process of the pool of Source.read_in_pool
+_pool_source: Optional[Source] = None
+
+
+def _init_pool_source(cls, state: Dict, kwargs: Dict) -> None:
+    global _pool_source
+    _pool_source = cls(ErrorDetecting(error_log=None))
+    for k, v in state.items():
+        setattr(_pool_source, k, v)
+    _pool_source.set_provenance_map(dict(kwargs))
+
+
+def _read_batch(args: Tuple) -> Tuple:
+    method, batch = args
+    source = _pool_source
+    # the properties and errors of each batch are sent back with its records
+    source.owner = ErrorDetecting(error_log=None)
+    source.node_properties = set()
+    source.edge_properties = set()
+    records = [rec for rec in getattr(source, method)(batch) if rec]
+    catalog = source.infores_context.get_catalog() if source.infores_context else {}
+    return records, source.node_properties, source.edge_properties, catalog, source.owner
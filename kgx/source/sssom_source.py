@@ -1,7 +1,6 @@
 """
 KGX Source for Simple Standard for Sharing Ontology Mappings ("SSSOM")
 """
-import gzip
 import re
 import typing
 
@@ -14,9 +13,9 @@ from kgx.error_detection import ErrorType, MessageLevel
 from kgx.prefix_manager import PrefixManager
 from kgx.config import get_logger
 from kgx.source import Source
+from kgx.utils.compression_utils import open_compressed_reader
 from kgx.utils.kgx_utils import (
     sanitize_import,
-    generate_uuid,
     generate_edge_key,
 )
 from kgx.utils.rdf_utils import process_predicate
@@ -82,7 +81,7 @@ class SssomSource(Source):
         format: str
             The input file format (``tsv``, by default)
         compression: Optional[str]
-            The compression (``gz``)
+            The compression (``gz``, ``bz2``, ``zst``, ``lz4``)
         kwargs: Dict
             Any additional arguments
 
@@ -102,21 +101,18 @@ class SssomSource(Source):
 
         self.set_provenance_map(kwargs)
 
-        if compression:
-            FH = gzip.open(filename, "rb")
-        else:
-            FH = open(filename)
-        file_iter = pd.read_csv(
-            FH,
-            comment="#",
-            dtype=str,
-            chunksize=10000,
-            low_memory=False,
-            keep_default_na=False,
-            **kwargs,
-        )
-        for chunk in file_iter:
-            yield from self.load_edges(chunk)
+        with open_compressed_reader(filename, compression, mode="rt") as FH:
+            file_iter = pd.read_csv(
+                FH,
+                comment="#",
+                dtype=str,
+                chunksize=10000,
+                low_memory=False,
+                keep_default_na=False,
+                **kwargs,
+            )
+            for chunk in file_iter:
+                yield from self.load_edges(chunk)
 
     def parse_header(self, filename: str, compression: Optional[str] = None) -> None:
         """
@@ -131,15 +127,12 @@ class SssomSource(Source):
 
         """
         yamlstr = ""
-        if compression:
-            FH = gzip.open(filename, "rb")
-        else:
-            FH = open(filename)
-        for line in FH:
-            if line.startswith("#"):
-                yamlstr += re.sub("^#", "", line)
-            else:
-                break
+        with open_compressed_reader(filename, compression, mode="rt") as FH:
+            for line in FH:
+                if line.startswith("#"):
+                    yamlstr += re.sub("^#", "", line)
+                else:
+                    break
         if yamlstr:
             metadata = yaml.safe_load(yamlstr)
             log.info(f"Metadata: {metadata}")
@@ -271,7 +264,7 @@ class SssomSource(Source):
         edge_data = sanitize_import(data.copy())
         if "subject" in edge_data and "object" in edge_data:
             if "id" not in edge_data:
-                edge_data["id"] = generate_uuid()
+                edge_data["id"] = self.generate_edge_id(edge_data)
             s = edge_data["subject"]
             o = edge_data["object"]
 
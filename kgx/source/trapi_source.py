@@ -1,15 +1,19 @@
-import gzip
 import json
 import typing
-import ijson
-from itertools import chain
+from itertools import chain, islice
 from typing import Dict, Tuple, Generator, Optional, Any, List
 
 from kgx.source.json_source import JsonSource
 from kgx.config import get_logger
+from kgx.utils.compression_utils import open_compressed_reader
 
 log = get_logger()
 
+# (ijson) prefixes of the nodes and edges of the knowledge
+# graph of a TRAPI Response and of a TRAPI Message
+NODE_PREFIXES = ("message.knowledge_graph.nodes", "knowledge_graph.nodes")
+EDGE_PREFIXES = ("message.knowledge_graph.edges", "knowledge_graph.edges")
+
 
 class TrapiSource(JsonSource):
     """
@@ -42,7 +46,7 @@ class TrapiSource(JsonSource):
         format: str
             The format (``json`` or ``jsonl``)
         compression: Optional[str]
-            The compression type (``gz``)
+            The compression type (``gz``, ``bz2``, ``zst``, ``lz4``)
         kwargs: Any
             Any additional arguments
 
@@ -52,47 +56,139 @@ class TrapiSource(JsonSource):
             A generator for node and edge records
         """
         self.set_provenance_map(kwargs)
-            
-        # Try to extract biolink version from the file
-        self._extract_biolink_version(filename, compression)
-            
+
         if format == 'jsonl':
             # Handle JSONL format
             n = self.read_nodes_jsonl(filename, compression)
             e = self.read_edges_jsonl(filename, compression)
+            yield from chain(n, e)
         else:
-            # Handle standard JSON format
-            n = self.read_nodes(filename, compression)
-            e = self.read_edges(filename, compression)
-            
-        yield from chain(n, e)
+            # Handle standard JSON format, in a single streaming pass
+            yield from self.read_knowledge_graph(filename, compression)
 
-    def _extract_biolink_version(self, filename: str, compression: Optional[str] = None) -> None:
+    def parse_batches(
+        self,
+        filename: str,
+        format: str = "json",
+        compression: Optional[str] = None,
+        batch_size: int = 10000,
+        **kwargs: Any
+    ) -> Generator[List, None, None]:
         """
-        Extract biolink version from the TRAPI response if available.
-        
+        This method reads from a TRAPI JSON and yields lists of KGX records.
+
+        Parameters
+        ----------
+        filename: str
+            The filename to parse
+        format: str
+            The format (``json`` or ``jsonl``)
+        compression: Optional[str]
+            The compression type (``gz``, ``bz2``, ``zst``, ``lz4``)
+        batch_size: int
+            The (maximum) number of records in each list
+        kwargs: Any
+            Any additional arguments
+
+        Returns
+        -------
+        Generator[List, None, None]
+            A generator for lists of node and edge records
+        """
+        records = self.parse(filename, format=format, compression=compression, **kwargs)
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            yield batch
+
+    def read_knowledge_graph(self, filename: str, compression: Optional[str] = None) -> Generator:
+        """
+        Read node and edge records from a TRAPI JSON, in a single streaming pass.
+
+        The nodes and edges of the knowledge graph of a TRAPI Response
+        (``message.knowledge_graph``) or Message (``knowledge_graph``)
+        may be given as objects keyed by their identifiers or as lists.
+        Node records are yielded before edge records: any edges found
+        ahead of the nodes are spooled to a temporary file until then.
+        The (top level) ``biolink_version`` is also picked up on the way.
+
         Parameters
         ----------
         filename: str
             The filename to read from
         compression: Optional[str]
             The compression type
+
+        Returns
+        -------
+        Generator
+            A generator for node and edge records
         """
-        try:
-            if compression == 'gz':
-                with gzip.open(filename, 'rt') as f:
-                    data = json.load(f)
-            else:
-                with open(filename, 'r') as f:
-                    data = json.load(f)
-                    
-            if 'biolink_version' in data:
-                self.biolink_version = data['biolink_version']
-            elif 'message' in data and 'biolink_version' in data:
-                self.biolink_version = data['biolink_version']
-                
-        except Exception as e:
-            log.warning(f"Could not extract biolink version from file {filename}: {e}")
+        yield from self.read_json(filename, compression, NODE_PREFIXES, EDGE_PREFIXES)
+
+    def read_json_node(self, node: Dict, key: Optional[str] = None) -> Optional[Tuple[str, Dict]]:
+        """
+        Read a TRAPI node, as found by ``read_json``.
+
+        Parameters
+        ----------
+        node: Dict
+            The TRAPI node
+        key: Optional[str]
+            The identifier of the node, if read from an object, rather than from a list
+
+        Returns
+        -------
+        Optional[Tuple[str, Dict]]
+            The node record
+        """
+        if key is not None:
+            node['id'] = key
+        elif 'id' not in node:
+            return None
+        return self.load_node(node)
+
+    def read_json_edge(self, edge: Dict, key: Optional[str] = None) -> Optional[Tuple[str, str, str, Dict]]:
+        """
+        Read a TRAPI edge, as found by ``read_json``.
+
+        Parameters
+        ----------
+        edge: Dict
+            The TRAPI edge
+        key: Optional[str]
+            The identifier of the edge, if read from an object, rather than from a list
+
+        Returns
+        -------
+        Optional[Tuple[str, str, str, Dict]]
+            The edge record
+        """
+        if key is not None:
+            edge['id'] = key
+        elif not (
+            all(k in edge for k in ['id', 'source_id', 'target_id'])
+            or all(k in edge for k in ['id', 'subject', 'object'])
+        ):
+            return None
+        return self.load_edge(edge)
+
+    def read_json_event(self, prefix: str, event: str, value: Any) -> None:
+        """
+        Pick up the ``biolink_version`` of a TRAPI JSON, as found by ``read_json``.
+
+        Parameters
+        ----------
+        prefix: str
+            The ijson prefix
+        event: str
+            The ijson event
+        value: Any
+            The value of the event
+        """
+        if prefix == "biolink_version" and event == "string":
+            self.biolink_version = value
 
     def read_nodes(self, filename: str, compression: Optional[str] = None) -> Generator:
         """
@@ -110,93 +206,9 @@ class TrapiSource(JsonSource):
         Generator
             A generator for node records
         """
-        # First, try to parse nodes using regular JSON loading
-        try:
-            if compression == 'gz':
-                with gzip.open(filename, 'rt') as f:
-                    data = json.load(f)
-            else:
-                with open(filename, 'r') as f:
-                    data = json.load(f)
-
-            # Try different paths for nodes
-            if 'message' in data and 'knowledge_graph' in data['message'] and 'nodes' in data['message']['knowledge_graph']:
-                nodes = data['message']['knowledge_graph']['nodes']
-            elif 'knowledge_graph' in data and 'nodes' in data['knowledge_graph']:
-                nodes = data['knowledge_graph']['nodes']
-            else:
-                nodes = None
-
-            # Handle nodes as a list or as a dictionary
-            if nodes is not None:
-                if isinstance(nodes, list):
-                    # Nodes is a list of node objects
-                    for node in nodes:
-                        if 'id' in node:
-                            yield self.load_node(node)
-                elif isinstance(nodes, dict):
-                    # Nodes is a dictionary with IDs as keys
-                    for node_id, node_data in nodes.items():
-                        node_data['id'] = node_id
-                        yield self.load_node(node_data)
-                return  # Found and processed nodes, so exit
-
-        except Exception as e:
-            log.warning(f"Error reading nodes from {filename} using standard JSON parsing: {e}")
-
-        # Fallback to ijson streaming if standard parsing fails
-        if compression == "gz":
-            FH = gzip.open(filename, "rb")
-        else:
-            FH = open(filename, "rb")
-        
-        # First try message.knowledge_graph.nodes path (TRAPI Response)
-        nodes_found = False
-        try:
-            for node_id, node_data in ijson.kvitems(FH, 'message.knowledge_graph.nodes'):
-                nodes_found = True
-                node_data['id'] = node_id
-                yield self.load_node(node_data)
-        except (KeyError, ijson.JSONError):
-            if nodes_found:
-                # If we found nodes but then got an error, it's a real error
-                FH.close()
-                log.error(f"Error parsing nodes from {filename}")
-                return
-        
-        # Try knowledge_graph.nodes as a dictionary with IDs as keys
-        if not nodes_found:
-            FH.close()
-            if compression == "gz":
-                FH = gzip.open(filename, "rb")
-            else:
-                FH = open(filename, "rb")
-                
-            try:
-                for node_id, node_data in ijson.kvitems(FH, 'knowledge_graph.nodes'):
-                    node_data['id'] = node_id
-                    yield self.load_node(node_data)
-            except (KeyError, ijson.JSONError):
-                pass
-            finally:
-                FH.close()
-                
-        # Try knowledge_graph.nodes as a list
-        if not nodes_found:
-            FH.close()
-            if compression == "gz":
-                FH = gzip.open(filename, "rb")
-            else:
-                FH = open(filename, "rb")
-                
-            try:
-                for node in ijson.items(FH, 'knowledge_graph.nodes.item'):
-                    if 'id' in node:
-                        yield self.load_node(node)
-            except (KeyError, ijson.JSONError) as e:
-                log.warning(f"Could not find nodes in TRAPI format in {filename}: {str(e)}")
-            finally:
-                FH.close()
+        for rec in self.read_knowledge_graph(filename, compression):
+            if len(rec) == 2:
+                yield rec
 
     def read_edges(self, filename: str, compression: Optional[str] = None) -> Generator:
         """
@@ -214,94 +226,10 @@ class TrapiSource(JsonSource):
         Generator
             A generator for edge records
         """
-        # First, try to parse edges using regular JSON loading
-        try:
-            if compression == 'gz':
-                with gzip.open(filename, 'rt') as f:
-                    data = json.load(f)
-            else:
-                with open(filename, 'r') as f:
-                    data = json.load(f)
-
-            # Try different paths for edges
-            if 'message' in data and 'knowledge_graph' in data['message'] and 'edges' in data['message']['knowledge_graph']:
-                edges = data['message']['knowledge_graph']['edges']
-            elif 'knowledge_graph' in data and 'edges' in data['knowledge_graph']:
-                edges = data['knowledge_graph']['edges']
-            else:
-                edges = None
-
-            # Handle edges as a list or as a dictionary
-            if edges is not None:
-                if isinstance(edges, list):
-                    # Edges is a list of edge objects
-                    for edge in edges:
-                        if all(k in edge for k in ['id', 'source_id', 'target_id']) or \
-                           all(k in edge for k in ['id', 'subject', 'object']):
-                            yield self.load_edge(edge)
-                elif isinstance(edges, dict):
-                    # Edges is a dictionary with IDs as keys
-                    for edge_id, edge_data in edges.items():
-                        edge_data['id'] = edge_id
-                        yield self.load_edge(edge_data)
-                return  # Found and processed edges, so exit
-
-        except Exception as e:
-            log.warning(f"Error reading edges from {filename} using standard JSON parsing: {e}")
-
-        # Fallback to ijson streaming if standard parsing fails
-        if compression == "gz":
-            FH = gzip.open(filename, "rb")
-        else:
-            FH = open(filename, "rb")
-            
-        # First try message.knowledge_graph.edges path (TRAPI Response)
-        edges_found = False
-        try:
-            for edge_id, edge_data in ijson.kvitems(FH, 'message.knowledge_graph.edges'):
-                edges_found = True
-                edge_data['id'] = edge_id
-                yield self.load_edge(edge_data)
-        except (KeyError, ijson.JSONError):
-            if edges_found:
-                # If we found edges but then got an error, it's a real error
-                FH.close()
-                log.error(f"Error parsing edges from {filename}")
-                return
-                
-        # Try knowledge_graph.edges as a dictionary with IDs as keys
-        if not edges_found:
-            FH.close()
-            if compression == "gz":
-                FH = gzip.open(filename, "rb")
-            else:
-                FH = open(filename, "rb")
-                
-            try:
-                for edge_id, edge_data in ijson.kvitems(FH, 'knowledge_graph.edges'):
-                    edge_data['id'] = edge_id
-                    yield self.load_edge(edge_data)
-            except (KeyError, ijson.JSONError):
-                pass
-            finally:
-                FH.close()
-                
-        # Try knowledge_graph.edges as a list
-        if not edges_found:
-            FH.close()
-            if compression == "gz":
-                FH = gzip.open(filename, "rb")
-            else:
-                FH = open(filename, "rb")
-                
-            try:
-                for edge in ijson.items(FH, 'knowledge_graph.edges.item'):
-                    yield self.load_edge(edge)
-            except (KeyError, ijson.JSONError) as e:
-                log.warning(f"Could not find edges in TRAPI format in {filename}: {str(e)}")
-            finally:
-                FH.close()
-                
+        for rec in self.read_knowledge_graph(filename, compression):
+            if len(rec) == 4:
+                yield rec
+
     def read_nodes_jsonl(self, filename: str, compression: Optional[str] = None) -> Generator:
         """
         Read node records from a TRAPI JSONL file.
@@ -318,11 +246,8 @@ class TrapiSource(JsonSource):
         Generator
             A generator for node records
         """
-        if compression == "gz":
-            FH = gzip.open(filename, 'rt')
-        else:
-            FH = open(filename, 'r')
-            
+        FH = open_compressed_reader(filename, compression, mode="rt")
+
         for line in FH:
             try:
                 record = json.loads(line)
@@ -364,11 +289,8 @@ class TrapiSource(JsonSource):
         Generator
             A generator for edge records
         """
-        if compression == "gz":
-            FH = gzip.open(filename, 'rt')
-        else:
-            FH = open(filename, 'r')
-            
+        FH = open_compressed_reader(filename, compression, mode="rt")
+
         for line in FH:
             try:
                 record = json.loads(line)
@@ -1,17 +1,30 @@
+import os
+import pickle
 import re
+import shutil
 import tarfile
+import tempfile
 import typing
+from contextlib import nullcontext
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
 from typing import Dict, Tuple, Any, Generator, Optional, List
 import pandas as pd
 
 from kgx.config import get_logger
+from kgx.error_detection import ErrorDetecting
 from kgx.source.source import Source
 from kgx.utils.kgx_utils import (
-    generate_uuid,
     generate_edge_key,
     extension_types,
-    archive_read_mode,
-    sanitize_import
+    sanitize_import,
+    get_pool_processes,
+)
+from kgx.utils.compression_utils import (
+    COMPRESSION_TYPES,
+    archive_compression,
+    open_compressed_reader,
 )
 log = get_logger()
 
@@ -69,9 +82,14 @@ class TsvSource(Source):
         format: str
             The format (``tsv``, ``csv``)
         compression: Optional[str]
-            The compression type (``tar``, ``tar.gz``)
+            The compression type, either of an archive of nodes and edges files
+            (``tar``, ``tar.gz``, ``tar.bz2``, ``tar.zst``, ``tar.lz4``)
+            or of the file (``gz``, ``bz2``, ``zst``, ``lz4``)
         kwargs: Any
-            Any additional arguments
+            Any additional arguments, e.g. ``processes``, the number of processes
+            parsing the members of a tar archive, or the chunks of a file, in parallel,
+            and ``archive_directory``, the directory into which the members of a tar
+            archive parsed in parallel are extracted (the system default, if not given)
 
         Returns
         -------
@@ -79,6 +97,8 @@ class TsvSource(Source):
             A generator for node and edge records
 
         """
+        processes = get_pool_processes(kwargs.pop("processes", None))
+        archive_directory = kwargs.pop("archive_directory", None)
         if "delimiter" not in kwargs:
             # infer delimiter from file format
             kwargs["delimiter"] = extension_types[format]
@@ -89,15 +109,21 @@ class TsvSource(Source):
         if "list_delimeter" in kwargs:
             self.list_delimiter = kwargs["list_delimiter"]
 
-        mode = (
-            archive_read_mode[compression] if compression in archive_read_mode else None
-        )
+        # the (not yet consumed) arguments of the processes parsing archive members
+        member_kwargs = dict(kwargs)
         self.set_provenance_map(kwargs)
 
         if format == "tsv":
             kwargs["quoting"] = 3
-        if mode:
-            with tarfile.open(filename, mode=mode) as tar:
+        if compression in archive_compression and processes > 1:
+            yield from self._parse_archive_members(
+                filename, format, compression, processes, member_kwargs, archive_directory
+            )
+        elif compression in archive_compression:
+            # the archive is decompressed on a background thread
+            with open_compressed_reader(
+                filename, archive_compression[compression]
+            ) as FH, tarfile.open(fileobj=FH, mode="r:") as tar:
                 # Alas, the order that tar file members is important in some streaming operations
                 # (e.g. graph-summary and validation) in that generally, all the node files need to be
                 # loaded first,  followed by the  associated edges files can be loaded and analysed.
@@ -162,27 +188,151 @@ class TsvSource(Source):
                         self.edge_properties.update(chunk.columns)
                         yield from self.read_edges(chunk)
         else:
-            file_iter = pd.read_csv(
-                filename,
-                dtype=str,
-                chunksize=10000,
-                low_memory=False,
-                keep_default_na=False,
-                **kwargs,
-            )
-            if re.search(f"nodes.{format}", filename):
-                for chunk in file_iter:
-                    self.node_properties.update(chunk.columns)
-                    yield from self.read_nodes(chunk)
-            elif re.search(f"edges.{format}", filename):
-                for chunk in file_iter:
-                    self.edge_properties.update(chunk.columns)
-                    yield from self.read_edges(chunk)
-            else:
-                # This used to throw an exception but perhaps we should simply ignore it.
-                log.warning(
-                    f"Parse function cannot resolve the KGX file type in name {filename}. Skipped..."
+            # without a (known) compression type, pandas
+            # infers the compression from the filename
+            with (
+                open_compressed_reader(filename, compression)
+                if compression in COMPRESSION_TYPES
+                else nullcontext(filename)
+            ) as FH:
+                file_iter = pd.read_csv(
+                    FH,
+                    dtype=str,
+                    chunksize=10000,
+                    low_memory=False,
+                    keep_default_na=False,
+                    **kwargs,
                 )
+                if re.search(f"nodes.{format}", filename):
+                    if processes > 1:
+                        # the chunks are turned into records by a pool of processes
+                        yield from self.read_in_pool(
+                            "read_nodes",
+                            self._read_columns(file_iter, self.node_properties),
+                            processes,
+                            member_kwargs,
+                        )
+                    else:
+                        for chunk in file_iter:
+                            self.node_properties.update(chunk.columns)
+                            yield from self.read_nodes(chunk)
+                elif re.search(f"edges.{format}", filename):
+                    if processes > 1:
+                        yield from self.read_in_pool(
+                            "read_edges",
+                            self._read_columns(file_iter, self.edge_properties),
+                            processes,
+                            member_kwargs,
+                        )
+                    else:
+                        for chunk in file_iter:
+                            self.edge_properties.update(chunk.columns)
+                            yield from self.read_edges(chunk)
+                else:
+                    # This used to throw an exception but perhaps we should simply ignore it.
+                    log.warning(
+                        f"Parse function cannot resolve the KGX file type in name {filename}. Skipped..."
+                    )
+
+    def get_pool_state(self) -> Dict[str, Any]:
+        """
+        Get the (picklable) attributes copied onto the
+        Sources of the processes reading records in parallel.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The attributes, by name
+
+        """
+        state = super().get_pool_state()
+        state["list_delimiter"] = self.list_delimiter
+        return state
+
+    @staticmethod
+    def _read_columns(chunks: typing.Iterable, properties: set) -> Generator:
+        # the columns of each chunk are noted before it is sent to the pool
+        for chunk in chunks:
+            properties.update(chunk.columns)
+            yield chunk
+
+    def _parse_archive_members(
+        self,
+        filename: str,
+        format: str,
+        compression: str,
+        processes: int,
+        kwargs: Dict,
+        archive_directory: Optional[str] = None,
+    ) -> Generator:
+        # The members of the archive are extracted, in a single pass over the
+        # archive, into a temporary directory and handed over to a pool of
+        # processes as they are extracted, each of which spools the records of
+        # a member to a file (and removes the member). The records of every node
+        # file are yielded before the records of any edge file: the node files
+        # are extracted at most 2 * processes ahead of their records being
+        # yielded, whereas the records of the edge files are spooled until the
+        # whole archive has been read (as a node file may still follow them).
+        with tempfile.TemporaryDirectory(prefix="kgx-tar-", dir=archive_directory) as directory:
+            members = 0
+            node_results: deque = deque()
+            edge_results: deque = deque()
+            with Pool(processes=processes) as pool, open_compressed_reader(
+                filename, archive_compression[compression]
+            ) as FH, tarfile.open(fileobj=FH, mode="r|") as tar:
+                for member in tar:
+                    if not member.isfile():
+                        continue
+                    if re.search(f"nodes.{format}", member.name):
+                        results = node_results
+                    elif re.search(f"edges.{format}", member.name):
+                        results = edge_results
+                    else:
+                        log.warning(
+                            f"Tar archive contains an unrecognized file: {member.name}. Skipped..."
+                        )
+                        continue
+                    # numbered, as members of different directories may share a name
+                    path = os.path.join(
+                        directory,
+                        f"{members}_{os.path.basename(member.name)}",
+                    )
+                    members += 1
+                    with tar.extractfile(member) as src, open(path, "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                    results.append(
+                        pool.apply_async(
+                            _parse_member, ((type(self), self.get_pool_state(), path, format, kwargs),)
+                        )
+                    )
+                    while len(node_results) > 2 * processes:
+                        yield from self._merge_member(*node_results.popleft().get())
+                for results in (node_results, edge_results):
+                    while results:
+                        yield from self._merge_member(*results.popleft().get())
+
+    def _merge_member(
+        self,
+        path: str,
+        spool: str,
+        node_properties: set,
+        edge_properties: set,
+        catalog: Dict,
+        owner: ErrorDetecting,
+    ) -> Generator:
+        self.node_properties.update(node_properties)
+        self.edge_properties.update(edge_properties)
+        if self.infores_context:
+            self.infores_context.catalog.update(catalog)
+        if hasattr(self.owner, "merge_errors"):
+            self.owner.merge_errors(owner)
+        with open(spool, "rb") as FH:
+            while True:
+                try:
+                    yield from pickle.load(FH)
+                except EOFError:
+                    break
+        os.remove(spool)
 
     def read_nodes(self, df: pd.DataFrame) -> Generator:
         """
@@ -266,7 +416,7 @@ class TsvSource(Source):
             return None
         edge_data = sanitize_import(edge.copy(), self.list_delimiter)
         if "id" not in edge_data:
-            edge_data["id"] = generate_uuid()
+            edge_data["id"] = self.generate_edge_id(edge_data)
         s = edge_data["subject"]
         o = edge_data["object"]
         self.set_edge_provenance(edge_data)
@@ -275,3 +425,25 @@ class TsvSource(Source):
         if self.check_edge_filter(edge_data):
             self.edge_properties.update(edge_data.keys())
             return s, o, key, edge_data
+
+
+def _parse_member(args: Tuple) -> Tuple:
+    # parses an (extracted) archive member in a pool process,
+    # spooling its records to a file next to the member
+    cls, state, path, format, kwargs = args
+    owner = ErrorDetecting(error_log=None)
+    source = cls(owner)
+    for k, v in state.items():
+        setattr(source, k, v)
+    spool = f"{path}.records"
+    records = source.parse(path, format, **kwargs)
+    with open(spool, "wb") as FH:
+        # spooled in batches, which are much faster to pickle than single records
+        while True:
+            batch = list(islice(records, 10000))
+            if not batch:
+                break
+            pickle.dump([rec for rec in batch if rec], FH, protocol=pickle.HIGHEST_PROTOCOL)
+    os.remove(path)
+    catalog = source.infores_context.get_catalog() if source.infores_context else {}
+    return path, spool, source.node_properties, source.edge_properties, catalog, owner
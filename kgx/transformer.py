@@ -1,8 +1,10 @@
+import functools
 import itertools
 import os
+from contextlib import closing
 from os.path import exists
 from sys import stderr
-from typing import Dict, Generator, List, Optional, Callable, Set
+from typing import Dict, Generator, Iterable, List, Optional, Callable, Set, Union
 
 from kgx.config import get_logger
 from kgx.error_detection import ErrorType, MessageLevel, ErrorDetecting
@@ -23,6 +25,7 @@ from kgx.source import (
 )
 from kgx.sink import (
     Sink,
+    DedupSink,
     GraphSink,
     JsonSink,
     JsonlSink,
@@ -39,6 +42,11 @@ from kgx.utils.kgx_utils import (
     GraphEntityType,
     knowledge_provenance_properties,
 )
+from kgx.utils.identifier_map import IdentifierMap, remap_node_identifiers
+from kgx.utils.inspector_fanout import InspectorFanOut
+from kgx.utils.node_index import NodeSet
+from kgx.utils.parse_cache import ParseCache
+from kgx.utils.pipeline_utils import read_ahead
 
 SOURCE_MAP = {
     "tsv": TsvSource,
@@ -98,7 +106,8 @@ class Transformer(ErrorDetecting):
             self,
             stream: bool = False,
             infores_catalog: Optional[str] = None,
-            error_log=None
+            error_log=None,
+            pipelined: bool = False,
     ):
         """
 
@@ -108,19 +117,24 @@ class Transformer(ErrorDetecting):
         Optional dump of a TSV file of InfoRes CURIE to Knowledge Source mappings
     error_log:
         Where to write any graph processing error message (stderr, by default).
+    pipelined: bool
+        Whether to read the records of a source on a background thread, such
+        that the parsing of the records overlaps with their writing to a sink
 
         """
 
         ErrorDetecting.__init__(self, error_log)
 
         self.stream = stream
+        self.pipelined = pipelined
         self.node_filters = {}
         self.edge_filters = {}
 
         self.inspector: Optional[Callable[[GraphEntityType, List], None]] = None
 
         self.store = self.get_source("graph")
-        self._seen_nodes = set()
+        # approximate: a (very unlikely) hash collision lets an edge of a filtered out node through
+        self._seen_nodes = NodeSet()
         self._infores_catalog: Dict[str, str] = dict()
 
         if infores_catalog and exists(infores_catalog):
@@ -136,7 +150,13 @@ class Transformer(ErrorDetecting):
         self,
         input_args: Dict,
         output_args: Optional[Dict] = None,
-        inspector: Optional[Callable[[GraphEntityType, List], None]] = None,
+        inspector: Optional[
+            Union[
+                Callable[[GraphEntityType, List], None],
+                List[Callable[[GraphEntityType, List], None]],
+            ]
+        ] = None,
+        inspector_workers: Optional[str] = None,
     ) -> None:
         """
         Transform an input source and write to an output sink.
@@ -144,6 +164,12 @@ class Transformer(ErrorDetecting):
         If ``output_args`` is not defined then the data is persisted to
         an in-memory graph.
 
+        The optional 'remap_node_identifier' entry of ``input_args`` rewrites
+        node identifiers (and the subject, object and key of edges) as the
+        records stream from the source, using an identifier mapping file
+        and/or the value of an 'alternative_property' of each node
+        (see ``Transformer.get_identifier_map``).
+
         The 'inspector' argument is an optional Callable which the
         transformer.process() method applies to 'inspect' source records
         prior to writing them out to the Sink. The first (GraphEntityType)
@@ -152,14 +178,38 @@ class Transformer(ErrorDetecting):
         itself. This Callable is strictly meant to be procedural and should
         *not* mutate the record.
 
+        When streaming, the optional 'deduplicate' entry of ``output_args``
+        merges the records of the same node (or edge) into a single record,
+        as in the in-memory graph, while holding only a bounded number of
+        records in memory (see ``kgx.sink.dedup_sink.DedupSink``).
+
+        The optional 'edge_id_type' entry of ``input_args`` sets how edges
+        without an id are given one: a random UUID ('uuid', the default) or a
+        UUID derived from a hash of the edge ('hash'), such that the output of
+        a transform is the same on every run (see ``Source.set_edge_id_type``).
+
+        The optional 'cache_directory' entry of ``input_args`` caches the
+        records parsed from each input file in that directory, keyed by the
+        content of the file and the arguments of the transform, such that a
+        later transform of an unchanged file reads its records back instead
+        of parsing the file again (see ``kgx.utils.parse_cache.ParseCache``).
+
+        A list of such Callables may be given instead, in which case
+        every record is handed to each one of them, in a single pass over
+        the data. With ``inspector_workers``, each inspector runs in a
+        worker thread or process of its own, fed with batches of records
+        (see ``kgx.utils.inspector_fanout.InspectorFanOut``).
+
         Parameters
         ----------
         input_args: Dict
             Arguments relevant to your input source
         output_args: Optional[Dict]
             Arguments relevant to your output sink (
-        inspector: Optional[Callable[[GraphEntityType, List], None]]
-            Optional Callable to 'inspect' source records during processing.
+        inspector: Optional[Union[Callable[[GraphEntityType, List], None], List[Callable[[GraphEntityType, List], None]]]]
+            Optional Callable (or list of Callables) to 'inspect' source records during processing.
+        inspector_workers: Optional[str]
+            Optional 'thread' or 'process', to run each inspector in a worker of its own
         """
         sources = []
         generators = []
@@ -170,13 +220,23 @@ class Transformer(ErrorDetecting):
         node_filters = input_args.pop("node_filters", {})
         edge_filters = input_args.pop("edge_filters", {})
         operations = input_args.pop("operations", [])
+        remap_node_identifier = input_args.pop("remap_node_identifier", {})
+        edge_id_type = input_args.pop("edge_id_type", None)
+        cache_directory = input_args.pop("cache_directory", None)
+        parse_cache = ParseCache(cache_directory) if cache_directory else None
 
         # Optional process() data stream inspector
+        if isinstance(inspector, (list, tuple)) or (inspector and inspector_workers):
+            if not isinstance(inspector, (list, tuple)):
+                inspector = [inspector]
+            inspector = InspectorFanOut(inspector, workers=inspector_workers)
         self.inspector = inspector
 
         if input_format in {"neo4j", "arangodb", "graph"}:
             source = self.get_source(input_format)
             source.set_prefix_map(prefix_map)
+            if edge_id_type:
+                source.set_edge_id_type(edge_id_type)
             source.set_node_filters(node_filters)
             self.node_filters = source.node_filters
             self.edge_filters = source.edge_filters
@@ -198,6 +258,8 @@ class Transformer(ErrorDetecting):
             for f in filename:
                 source = self.get_source(input_format)
                 source.set_prefix_map(prefix_map)
+                if edge_id_type:
+                    source.set_edge_id_type(edge_id_type)
                 if isinstance(source, RdfSource):
                     source.set_predicate_mapping(predicate_mappings)
                     source.set_node_property_predicates(node_property_predicates)
@@ -209,78 +271,71 @@ class Transformer(ErrorDetecting):
                 self.edge_filters = source.edge_filters
 
                 default_provenance = os.path.basename(f)
-                g = source.parse(f, default_provenance=default_provenance, **input_args)
+                if parse_cache:
+                    # the arguments which the records parsed from the file depend upon
+                    cache_args = {
+                        k: v
+                        for k, v in input_args.items()
+                        if k not in {"processes", "node_cache_directory", "archive_directory"}
+                    }
+                    cache_args.update(
+                        default_provenance=default_provenance,
+                        prefix_map=prefix_map,
+                        predicate_mappings=predicate_mappings,
+                        node_property_predicates=node_property_predicates,
+                        node_filters=node_filters,
+                        edge_filters=edge_filters,
+                        edge_id_type=edge_id_type,
+                    )
+                    g = parse_cache.parse(
+                        source,
+                        f,
+                        cache_args,
+                        functools.partial(
+                            source.parse, f, default_provenance=default_provenance, **input_args
+                        ),
+                    )
+                else:
+                    g = source.parse(f, default_provenance=default_provenance, **input_args)
 
                 sources.append(source)
                 generators.append(g)
 
         source_generator = itertools.chain(*generators)
 
-        if output_args:
-            if self.stream:
-                if output_args["format"] in {"tsv", "csv"}:
-                    if "node_properties" not in output_args or "edge_properties" not in output_args:
-                        error_type = ErrorType.MISSING_PROPERTY
-                        self.log_error(
-                            entity=f"{output_args['format']} stream",
-                            error_type=error_type,
-                            message=f"'node_properties' and 'edge_properties' must be defined for output while"
-                                    f"streaming. The exported format will be limited to a subset of the columns.",
-                            message_level=MessageLevel.WARNING
-                        )
-                sink = self.get_sink(**output_args)
-                if "reverse_prefix_map" in output_args:
-                    sink.set_reverse_prefix_map(output_args["reverse_prefix_map"])
-                if isinstance(sink, RdfSink):
-                    if "reverse_predicate_mapping" in output_args:
-                        sink.set_reverse_predicate_mapping(
-                            output_args["reverse_predicate_mapping"]
-                        )
-                    if "property_types" in output_args:
-                        sink.set_property_types(output_args["property_types"])
-                # stream from source to sink
-                self.process(source_generator, sink)
-                sink.finalize()
-            else:
-                # stream from source to intermediate
-                intermediate_sink = GraphSink(self)
-                intermediate_sink.node_properties.update(self.store.node_properties)
-                intermediate_sink.edge_properties.update(self.store.edge_properties)
-                self.process(source_generator, intermediate_sink)
-                for s in sources:
-                    intermediate_sink.node_properties.update(s.node_properties)
-                    intermediate_sink.edge_properties.update(s.edge_properties)
-                apply_graph_operations(intermediate_sink.graph, operations)
-                # stream from intermediate to output sink
-                intermediate_source = self.get_source("graph")
-                intermediate_source.node_properties.update(
-                    intermediate_sink.node_properties
-                )
-                intermediate_source.edge_properties.update(
-                    intermediate_sink.edge_properties
-                )
-
-                # Need to propagate knowledge source specifications here?
-                ks_args = dict()
-                for ksf in knowledge_provenance_properties:
-                    if ksf in input_args:
-                        ks_args[ksf] = input_args[ksf]
-
-                intermediate_source_generator = intermediate_source.parse(
-                    intermediate_sink.graph, **ks_args
-                )
-
-                if output_args["format"] in {"tsv", "csv"}:
-                    if "node_properties" not in output_args:
-                        output_args[
-                            "node_properties"
-                        ] = intermediate_source.node_properties
-                        log.debug("output_args['node_properties']: " + str(output_args["node_properties"]), file=stderr)
-                    if "edge_properties" not in output_args:
-                        output_args[
-                            "edge_properties"
-                        ] = intermediate_source.edge_properties
-                    sink = self.get_sink(**output_args)
+        identifier_map: Optional[IdentifierMap] = None
+        if remap_node_identifier:
+            # rewrite node identifiers (and edge subject/object) as records stream by
+            identifier_map = self.get_identifier_map(remap_node_identifier)
+            source_generator = remap_node_identifiers(
+                source_generator,
+                identifier_map,
+                category=remap_node_identifier.get("category"),
+                alternative_property=remap_node_identifier.get("alternative_property"),
+                prefix=remap_node_identifier.get("prefix"),
+            )
+
+        try:
+            if output_args:
+                if self.stream:
+                    if output_args["format"] in {"tsv", "csv"}:
+                        # undeclared columns may rather be discovered from the
+                        # records, with 'discover_properties' (at some cost)
+                        if (
+                            "node_properties" not in output_args or "edge_properties" not in output_args
+                        ) and not output_args.get("discover_properties", False):
+                            error_type = ErrorType.MISSING_PROPERTY
+                            self.log_error(
+                                entity=f"{output_args['format']} stream",
+                                error_type=error_type,
+                                message=f"'node_properties' and 'edge_properties' must be defined for output while"
+                                        f"streaming. The exported format will be limited to a subset of the columns.",
+                                message_level=MessageLevel.WARNING
+                            )
+                    deduplicate = output_args.get("deduplicate", False)
+                    sink = self.get_sink(
+                        **{k: v for k, v in output_args.items() if k != "deduplicate"}
+                    )
                     if "reverse_prefix_map" in output_args:
                         sink.set_reverse_prefix_map(output_args["reverse_prefix_map"])
                     if isinstance(sink, RdfSink):
@@ -288,30 +343,96 @@ class Transformer(ErrorDetecting):
                             sink.set_reverse_predicate_mapping(
                                 output_args["reverse_predicate_mapping"]
                             )
-                    if "property_types" in output_args:
-                        sink.set_property_types(output_args["property_types"])
+                        if "property_types" in output_args:
+                            sink.set_property_types(output_args["property_types"])
+                    if deduplicate:
+                        # merge duplicate nodes and edges, spilling to disk, as the graph sink would
+                        sink = DedupSink(self, sink)
+                    # stream from source to sink
+                    self.process(source_generator, sink)
+                    sink.finalize()
                 else:
-                    sink = self.get_sink(**output_args)
-                    sink.node_properties.update(intermediate_source.node_properties)
-                    sink.edge_properties.update(intermediate_source.edge_properties)
-
-                self.process(intermediate_source_generator, sink)
+                    # stream from source to intermediate
+                    intermediate_sink = GraphSink(self)
+                    intermediate_sink.node_properties.update(self.store.node_properties)
+                    intermediate_sink.edge_properties.update(self.store.edge_properties)
+                    self.process(source_generator, intermediate_sink)
+                    for s in sources:
+                        intermediate_sink.node_properties.update(s.node_properties)
+                        intermediate_sink.edge_properties.update(s.edge_properties)
+                    apply_graph_operations(intermediate_sink.graph, operations)
+                    # stream from intermediate to output sink
+                    intermediate_source = self.get_source("graph")
+                    intermediate_source.node_properties.update(
+                        intermediate_sink.node_properties
+                    )
+                    intermediate_source.edge_properties.update(
+                        intermediate_sink.edge_properties
+                    )
+
+                    # Need to propagate knowledge source specifications here?
+                    ks_args = dict()
+                    for ksf in knowledge_provenance_properties:
+                        if ksf in input_args:
+                            ks_args[ksf] = input_args[ksf]
+
+                    # the records of the intermediate graph were sanitized as they were
+                    # read, and only need to be again if graph operations changed them
+                    intermediate_source_generator = intermediate_source.parse(
+                        intermediate_sink.graph, trusted=not operations, **ks_args
+                    )
+
+                    if output_args["format"] in {"tsv", "csv"}:
+                        if "node_properties" not in output_args:
+                            output_args[
+                                "node_properties"
+                            ] = intermediate_source.node_properties
+                            log.debug("output_args['node_properties']: " + str(output_args["node_properties"]), file=stderr)
+                        if "edge_properties" not in output_args:
+                            output_args[
+                                "edge_properties"
+                            ] = intermediate_source.edge_properties
+                        sink = self.get_sink(**output_args)
+                        if "reverse_prefix_map" in output_args:
+                            sink.set_reverse_prefix_map(output_args["reverse_prefix_map"])
+                        if isinstance(sink, RdfSink):
+                            if "reverse_predicate_mapping" in output_args:
+                                sink.set_reverse_predicate_mapping(
+                                    output_args["reverse_predicate_mapping"]
+                                )
+                        if "property_types" in output_args:
+                            sink.set_property_types(output_args["property_types"])
+                    else:
+                        sink = self.get_sink(**output_args)
+                        sink.node_properties.update(intermediate_source.node_properties)
+                        sink.edge_properties.update(intermediate_source.edge_properties)
+
+                    self.process(intermediate_source_generator, sink)
+                    sink.finalize()
+                    self.store.node_properties.update(sink.node_properties)
+                    self.store.edge_properties.update(sink.edge_properties)
+            else:
+                # stream from source to intermediate
+                sink = GraphSink(self)
+                self.process(source_generator, sink)
+                sink.node_properties.update(self.store.node_properties)
+                sink.edge_properties.update(self.store.edge_properties)
+                for s in sources:
+                    sink.node_properties.update(s.node_properties)
+                    sink.edge_properties.update(s.edge_properties)
                 sink.finalize()
                 self.store.node_properties.update(sink.node_properties)
                 self.store.edge_properties.update(sink.edge_properties)
-        else:
-            # stream from source to intermediate
-            sink = GraphSink(self)
-            self.process(source_generator, sink)
-            sink.node_properties.update(self.store.node_properties)
-            sink.edge_properties.update(self.store.edge_properties)
-            for s in sources:
-                sink.node_properties.update(s.node_properties)
-                sink.edge_properties.update(s.edge_properties)
-            sink.finalize()
-            self.store.node_properties.update(sink.node_properties)
-            self.store.edge_properties.update(sink.edge_properties)
-            apply_graph_operations(sink.graph, operations)
+                apply_graph_operations(sink.graph, operations)
+        finally:
+            try:
+                if isinstance(self.inspector, InspectorFanOut):
+                    # wait for any inspector workers to finish, whether or not the transform failed
+                    self.inspector.close()
+            finally:
+                if identifier_map:
+                    # removes a temporary database, whether or not the transform failed
+                    identifier_map.close()
 
         # Aggregate the InfoRes catalogs from  all sources
         for s in sources:
@@ -325,6 +446,46 @@ class Transformer(ErrorDetecting):
         """
         return self._infores_catalog
 
+    @staticmethod
+    def get_identifier_map(args: Dict) -> IdentifierMap:
+        """
+        Get an instance of IdentifierMap, loaded with mappings from
+        an (optional) external mapping file.
+
+        Parameters
+        ----------
+        args: Dict
+            The 'remap_node_identifier' input arguments, i.e.
+            ``filename`` (the mapping file), ``format`` (``tsv`` or ``sssom``),
+            ``database`` (an optional SQLite file to hold the mappings),
+            ``category``, ``alternative_property`` and ``prefix``
+
+        Returns
+        -------
+        kgx.utils.identifier_map.IdentifierMap
+            An instance of IdentifierMap
+
+        """
+        identifier_map = IdentifierMap(filename=args.get("database"))
+        filename = args.get("filename")
+        if filename:
+            mapping_format = args.get("format", "tsv")
+            if mapping_format == "sssom":
+                predicates = args.get("predicates")
+                identifier_map.load_sssom(
+                    filename, predicates=set(predicates) if predicates else None
+                )
+            elif mapping_format in {"tsv", "csv"}:
+                identifier_map.load_tsv(
+                    filename,
+                    delimiter="\t" if mapping_format == "tsv" else ",",
+                    skip_header=args.get("skip_header", False),
+                )
+            else:
+                identifier_map.close()
+                raise TypeError(f"{mapping_format} in an unrecognized identifier mapping format")
+        return identifier_map
+
     def process(self, source: Generator, sink: Sink) -> None:
         """
         This method is responsible for reading from ``source``
@@ -334,6 +495,10 @@ class Transformer(ErrorDetecting):
         .. note::
             The streamed data must not be mutated.
 
+        When the Transformer is ``pipelined``, the ``source`` generator runs
+        on a background thread (see ``kgx.utils.pipeline_utils.read_ahead``),
+        while the inspector and the sink are called on the calling thread.
+
         Parameters
         ----------
         source: Generator
@@ -342,6 +507,19 @@ class Transformer(ErrorDetecting):
             An instance of Sink
 
         """
+        try:
+            if self.pipelined:
+                with closing(read_ahead(source)) as records:
+                    self._process(records, sink)
+            else:
+                self._process(source, sink)
+        except BaseException:
+            # stops any processes of the sink (e.g. of an RdfSink), as it is never finalized
+            if hasattr(sink, "close"):
+                sink.close()
+            raise
+
+    def _process(self, source: Iterable, sink: Sink) -> None:
         for rec in source:
             if rec:
                 log.debug("length of rec", len(rec), "rec", rec)
@@ -0,0 +1,488 @@
+"""
+Compressed input and output files: output is written in blocks which are
+compressed in parallel and input is decompressed on a background thread.
+"""
+import bz2
+import gzip
+import io
+import os
+import queue
+import shutil
+import tarfile
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, BinaryIO, Callable, Deque, List, Optional, TextIO, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+# size of the blocks of (uncompressed) bytes which are compressed independently
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+# per-file compression types
+COMPRESSION_TYPES = ("gz", "bz2", "zst", "lz4")
+
+# compression of the tar archive types
+archive_compression = {
+    "tar": None,
+    "tar.gz": "gz",
+    "tar.bz2": "bz2",
+    "tar.zst": "zst",
+    "tar.lz4": "lz4",
+}
+
+
+def default_compression_threads() -> int:
+    """
+    Default number of threads compressing blocks of output.
+
+    Returns
+    -------
+    int
+        The number of threads
+
+    """
+    return min(4, os.cpu_count() or 1)
+
+
+def _check_compression_package(compression: str) -> None:
+    if compression == "zst" and zstandard is None:
+        raise ImportError("zstd compression requires the 'zstandard' package")
+    if compression == "lz4" and lz4 is None:
+        raise ImportError("lz4 compression requires the 'lz4' package")
+
+
+def get_block_compressor(
+    compression: Optional[str], level: Optional[int] = None
+) -> Callable[[bytes], bytes]:
+    """
+    Get a function compressing a block of bytes into a self-contained
+    gzip member, bzip2 stream, zstd or lz4 frame. A sequence of such blocks,
+    written one after the other, is itself a valid compressed file.
+
+    Parameters
+    ----------
+    compression: Optional[str]
+        The compression type (``gz``, ``bz2``, ``zst``, ``lz4``), or None for no compression
+    level: Optional[int]
+        The compression level, or None for the default level of the compression type
+
+    Returns
+    -------
+    Callable[[bytes], bytes]
+        The block compressor
+
+    """
+    if not compression:
+        return bytes
+    if compression == "gz":
+        gz_level = zlib.Z_DEFAULT_COMPRESSION if level is None else level
+
+        def compress_gz(block: bytes) -> bytes:
+            compressor = zlib.compressobj(gz_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            return compressor.compress(block) + compressor.flush()
+
+        return compress_gz
+    if compression == "bz2":
+        bz2_level = 9 if level is None else level
+        return lambda block: bz2.compress(block, bz2_level)
+    if compression == "zst":
+        _check_compression_package(compression)
+        zst_level = 3 if level is None else level
+        # a ZstdCompressor must not be shared between threads
+        return lambda block: zstandard.ZstdCompressor(level=zst_level).compress(block)
+    if compression == "lz4":
+        _check_compression_package(compression)
+        lz4_level = 0 if level is None else level
+        return lambda block: lz4.frame.compress(block, compression_level=lz4_level)
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+class BlockCompressedWriter(io.RawIOBase):
+    """
+    A (binary) writer which compresses its output in blocks of ``block_size``
+    bytes, each compressed independently (like pigz), on a pool of threads.
+    zlib, bz2, zstandard and lz4 release the GIL while compressing, such that the
+    blocks are compressed in parallel with one another and with the code
+    producing the output. Compressed blocks are written in order.
+
+    Parameters
+    ----------
+    FH: BinaryIO
+        The file handle to which the compressed blocks are written
+    compression: Optional[str]
+        The compression type (``gz``, ``bz2``, ``zst``, ``lz4``), or None for no compression
+    threads: Optional[int]
+        Number of threads compressing blocks, 0 to compress them on the calling thread
+    block_size: int
+        Number of (uncompressed) bytes in each block
+    level: Optional[int]
+        The compression level
+
+    """
+
+    def __init__(
+        self,
+        FH: BinaryIO,
+        compression: Optional[str],
+        threads: Optional[int] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        level: Optional[int] = None,
+    ):
+        super().__init__()
+        self.FH = FH
+        self.compress = get_block_compressor(compression, level)
+        self.threads = default_compression_threads() if threads is None else threads
+        self.block_size = block_size
+        # number of uncompressed bytes written
+        self.size = 0
+        self._buffer = bytearray()
+        self._pending: Deque[Future] = deque()
+        self._executor = (
+            ThreadPoolExecutor(max_workers=self.threads) if self.threads > 0 else None
+        )
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        n = memoryview(data).nbytes
+        self._buffer += data
+        self.size += n
+        if len(self._buffer) >= self.block_size:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        return n
+
+    def _submit(self, block: bytes) -> None:
+        if not self._executor:
+            self.FH.write(self.compress(block))
+            return
+        self._pending.append(self._executor.submit(self.compress, block))
+        # bounds the number of blocks held in memory
+        while len(self._pending) > 2 * self.threads:
+            self.FH.write(self._pending.popleft().result())
+
+    def close(self) -> None:
+        """
+        Compress and write the remaining output, and close the file handle.
+        """
+        if self.closed:
+            return
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self.FH.write(self._pending.popleft().result())
+        finally:
+            if self._executor:
+                self._executor.shutdown(cancel_futures=True)
+            self.FH.close()
+            super().close()
+
+
+def open_compressed_writer(
+    filename: str,
+    compression: Optional[str] = None,
+    threads: Optional[int] = None,
+    level: Optional[int] = None,
+) -> TextIO:
+    """
+    Open a (text) file for writing, compressed in parallel blocks.
+
+    Parameters
+    ----------
+    filename: str
+        The filename to write to
+    compression: Optional[str]
+        The compression type (``gz``, ``bz2``, ``zst``, ``lz4``), or None for no compression
+    threads: Optional[int]
+        Number of threads compressing blocks
+    level: Optional[int]
+        The compression level
+
+    Returns
+    -------
+    TextIO
+        The file handle
+
+    """
+    if not compression:
+        return open(filename, "w")
+    writer = BlockCompressedWriter(
+        open(filename, "wb"), compression, threads=threads, level=level
+    )
+    return io.TextIOWrapper(
+        io.BufferedWriter(writer, DEFAULT_BLOCK_SIZE), encoding="utf-8"
+    )
+
+
+def write_tar_archive(
+    filename: str,
+    members: List[Tuple[str, str, int]],
+    compression: Optional[str] = None,
+    level: Optional[int] = None,
+) -> None:
+    """
+    Write a tar archive out of files which each hold the already compressed
+    (see ``BlockCompressedWriter``) content of a member of the archive.
+
+    The tar header of each member, which holds the (uncompressed) size of the
+    member and so cannot be written ahead of its content, is compressed on its
+    own and written before a byte for byte copy of the compressed content.
+    The content therefore is never decompressed nor compressed again.
+
+    Parameters
+    ----------
+    filename: str
+        The filename of the archive
+    members: List[Tuple[str, str, int]]
+        The name in the archive, the filename of the compressed content
+        and the uncompressed size of each member
+    compression: Optional[str]
+        The compression type (``gz``, ``bz2``, ``zst``, ``lz4``), of both the archive and its members
+    level: Optional[int]
+        The compression level
+
+    """
+    compress = get_block_compressor(compression, level)
+    padding = b""
+    offset = 0
+    with open(filename, "wb") as AFH:
+        for name, path, size in members:
+            info = tarfile.TarInfo(name)
+            info.size = size
+            info.mode = 0o644
+            info.mtime = int(time.time())
+            header = info.tobuf(tarfile.DEFAULT_FORMAT, tarfile.ENCODING, "surrogateescape")
+            AFH.write(compress(padding + header))
+            with open(path, "rb") as FH:
+                shutil.copyfileobj(FH, AFH)
+            offset += len(padding) + len(header) + size
+            padding = tarfile.NUL * (-size % tarfile.BLOCKSIZE)
+        # the end of an archive are two zero blocks, padded to the record size
+        end = padding + tarfile.NUL * (2 * tarfile.BLOCKSIZE)
+        offset += len(end)
+        end += tarfile.NUL * (-offset % tarfile.RECORDSIZE)
+        AFH.write(compress(end))
+
+
+def open_decompressed(filename: str, compression: str) -> BinaryIO:
+    """
+    Open a compressed file for reading (on the calling thread),
+    including files of several concatenated compressed blocks.
+
+    Parameters
+    ----------
+    filename: str
+        The filename to read from
+    compression: str
+        The compression type (``gz``, ``bz2``, ``zst``, ``lz4``)
+
+    Returns
+    -------
+    BinaryIO
+        The (binary) file handle of the decompressed content
+
+    """
+    if compression == "gz":
+        return gzip.open(filename, "rb")
+    if compression == "bz2":
+        return bz2.open(filename, "rb")
+    if compression == "zst":
+        _check_compression_package(compression)
+        return zstandard.ZstdDecompressor().stream_reader(
+            open(filename, "rb"), read_across_frames=True, closefd=True
+        )
+    if compression == "lz4":
+        _check_compression_package(compression)
+        return lz4.frame.open(filename, "rb")
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+class BackgroundReader(io.RawIOBase):
+    """
+    A (binary) reader of the blocks read, on a background thread, from a file
+    handle, such that e.g. the decompression of a file runs in parallel with
+    the parsing of its content. zlib, bz2, zstandard and lz4 release the GIL
+    while they decompress. The background thread stays at most ``queue_size``
+    blocks ahead of the reader.
+
+    Seeking forward skips blocks, while seeking backward reopens the file
+    handle and reads it again from the start, like a gzip file does.
+
+    Parameters
+    ----------
+    opener: Callable[[], BinaryIO]
+        Function opening the file handle
+    block_size: int
+        Number of bytes read from the file handle at a time
+    queue_size: int
+        Maximum number of blocks read ahead
+
+    """
+
+    def __init__(
+        self,
+        opener: Callable[[], BinaryIO],
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        queue_size: int = 16,
+    ):
+        super().__init__()
+        self.opener = opener
+        self.block_size = block_size
+        self.queue_size = queue_size
+        self._start()
+
+    def _start(self) -> None:
+        self._position = 0
+        self._block = memoryview(b"")
+        self._eof = False
+        self._queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        self._stop = threading.Event()
+        # the file handle is opened here, such that e.g. a missing file is
+        # reported right away, and the thread holds no reference to the reader,
+        # such that an abandoned reader is still closed (stopping the thread)
+        # when it is garbage collected
+        self._thread = threading.Thread(
+            target=BackgroundReader._run,
+            args=(self.opener(), self.block_size, self._queue, self._stop),
+            daemon=True,
+        )
+        self._thread.start()
+
+    @staticmethod
+    def _run(
+        FH: BinaryIO,
+        block_size: int,
+        blocks: queue.Queue,
+        stop: threading.Event,
+    ) -> None:
+        try:
+            with FH:
+                while not stop.is_set():
+                    block = FH.read(block_size)
+                    if not block:
+                        break
+                    BackgroundReader._put(blocks, stop, block)
+            BackgroundReader._put(blocks, stop, None)
+        except Exception as e:
+            # raised, in turn, by the reader
+            BackgroundReader._put(blocks, stop, e)
+
+    @staticmethod
+    def _put(blocks: queue.Queue, stop: threading.Event, item) -> None:
+        while not stop.is_set():
+            try:
+                blocks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _stop_thread(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _next_block(self) -> bool:
+        if self._eof:
+            return False
+        item = self._queue.get()
+        if item is None:
+            self._eof = True
+            return False
+        if isinstance(item, Exception):
+            self._eof = True
+            raise item
+        self._block = memoryview(item)
+        return True
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if not len(self._block) and not self._next_block():
+            return 0
+        n = min(len(b), len(self._block))
+        b[:n] = self._block[:n]
+        self._block = self._block[n:]
+        self._position += n
+        return n
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            while len(self._block) or self._next_block():
+                self._position += len(self._block)
+                self._block = memoryview(b"")
+            offset += self._position
+        if offset < self._position:
+            self._stop_thread()
+            self._start()
+        while self._position < offset and (len(self._block) or self._next_block()):
+            n = min(offset - self._position, len(self._block))
+            self._block = self._block[n:]
+            self._position += n
+        return self._position
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop_thread()
+            super().close()
+
+
+def open_compressed_reader(
+    filename: str,
+    compression: Optional[str] = None,
+    mode: str = "rb",
+    background: bool = True,
+) -> IO:
+    """
+    Open a (possibly) compressed file for reading, decompressing
+    its content on a background thread (see ``BackgroundReader``).
+
+    Parameters
+    ----------
+    filename: str
+        The filename to read from
+    compression: Optional[str]
+        The compression type (``gz``, ``bz2``, ``zst``, ``lz4``), or None for no compression
+    mode: str
+        Either ``rb``, to read bytes, or ``rt`` (or ``r``) to read (UTF-8) text
+    background: bool
+        Whether to decompress on a background thread, rather than on the calling thread
+
+    Returns
+    -------
+    IO
+        The file handle
+
+    """
+    binary = "b" in mode
+    if not compression:
+        return open(filename, "rb" if binary else "r")
+    if background:
+        FH = io.BufferedReader(
+            BackgroundReader(lambda: open_decompressed(filename, compression)),
+            DEFAULT_BLOCK_SIZE,
+        )
+    else:
+        FH = open_decompressed(filename, compression)
+    return FH if binary else io.TextIOWrapper(FH, encoding="utf-8")
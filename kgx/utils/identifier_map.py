@@ -0,0 +1,389 @@
+"""
+Bounded-memory node identifier mapping and streaming identifier remapping.
+"""
+import csv
+import gzip
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, Generator, Iterable, Optional, Set, Tuple
+
+from cachetools import LRUCache
+
+from kgx.config import get_logger
+from kgx.utils.kgx_utils import generate_edge_key
+from kgx.utils.node_index import NodeSet
+
+log = get_logger()
+
+DEFAULT_SSSOM_MAPPING_PREDICATES = {"skos:exactMatch"}
+
+
+def select_alternative_identifier(
+    node_data: Dict,
+    category: Optional[str],
+    alternative_property: str,
+    prefix: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Select the value of ``alternative_property`` that ought to replace the
+    'id' of a node, if any.
+
+    Parameters
+    ----------
+    node_data: Dict
+        The node data
+    category: Optional[str]
+        category referring to nodes whose 'id' needs to be remapped
+        (nodes of any category, if None)
+    alternative_property: str
+        property name from which the new value is pulled from
+    prefix: Optional[str]
+        signifies that the value for ``alternative_property`` is a list
+        and the ``prefix`` indicates which value to pick from the list
+
+    Returns
+    -------
+    Optional[str]
+        The new identifier for the node, or None if the node is not to be remapped
+        (e.g. if its ``alternative_property`` is an empty list)
+
+    """
+    if category and "category" in node_data and category not in node_data["category"]:
+        return None
+    if alternative_property not in node_data:
+        return None
+
+    alternative_values = node_data[alternative_property]
+    if isinstance(alternative_values, (list, set, tuple)):
+        if prefix:
+            for v in alternative_values:
+                if prefix in v:
+                    # take the first occurring value that contains the given prefix
+                    return v
+        elif alternative_values:
+            # no prefix defined; pick the 1st one from list
+            return next(iter(alternative_values))
+    elif isinstance(alternative_values, str):
+        if not prefix or alternative_values.startswith(prefix):
+            return alternative_values
+    else:
+        log.error(
+            f"Cannot use {alternative_values} from alternative_property {alternative_property}"
+        )
+    return None
+
+
+class IdentifierMap(object):
+    """
+    A mapping of node identifiers to their replacement identifiers.
+
+    The mapping is held in an SQLite table (on disk, by default, in a temporary
+    file) so that tens of millions of identifier mappings may be used without
+    holding them all in memory. Recently used lookups are kept in a small
+    LRU cache and new mappings are buffered before being written in batches.
+    The map may be used from any one thread at a time, e.g. remapping records
+    read ahead on another thread (see ``Transformer.pipelined``).
+
+    Parameters
+    ----------
+    filename: Optional[str]
+        SQLite database file backing the map. A temporary file is used,
+        and removed on ``close()``, if no filename is given.
+    cache_size: int
+        Maximum number of lookups to keep in the LRU cache
+    batch_size: int
+        Number of new mappings to buffer before writing them to the database
+
+    """
+
+    def __init__(
+        self,
+        filename: Optional[str] = None,
+        cache_size: int = 100000,
+        batch_size: int = 50000,
+    ):
+        self._temporary = filename is None
+        if self._temporary:
+            fd, filename = tempfile.mkstemp(prefix="kgx-idmap-", suffix=".db")
+            os.close(fd)
+        self.filename = filename
+        self.batch_size = batch_size
+        # used (one at a time) from other threads than the one opening the map
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS id_map (source TEXT PRIMARY KEY, target TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self._pending: Dict[str, str] = dict()
+        self._cache = LRUCache(maxsize=cache_size)
+        self._size = self._conn.execute("SELECT COUNT(*) FROM id_map").fetchone()[0]
+
+    def __len__(self) -> int:
+        self.flush()
+        return self._size
+
+    def __contains__(self, source: str) -> bool:
+        return self.get(source) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def add(self, source: str, target: str) -> None:
+        """
+        Add (or replace) a mapping from ``source`` to ``target``.
+
+        Parameters
+        ----------
+        source: str
+            The identifier to be replaced
+        target: str
+            The replacement identifier
+
+        """
+        with self._lock:
+            self._pending[source] = target
+            self._cache.pop(source, None)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def update(self, mappings: Iterable[Tuple[str, str]]) -> None:
+        """
+        Add a collection of ``(source, target)`` mappings.
+
+        Parameters
+        ----------
+        mappings: Iterable[Tuple[str, str]]
+            The identifier mappings
+
+        """
+        for source, target in mappings:
+            self.add(source, target)
+
+    def flush(self) -> None:
+        """
+        Write buffered mappings to the database.
+        """
+        with self._lock:
+            if self._pending:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO id_map (source, target) VALUES (?, ?)",
+                        self._pending.items(),
+                    )
+                self._pending.clear()
+                self._size = self._conn.execute("SELECT COUNT(*) FROM id_map").fetchone()[0]
+
+    def get(self, source: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Get the replacement identifier for ``source``.
+
+        Parameters
+        ----------
+        source: str
+            The identifier to look up
+        default: Optional[str]
+            Value returned if there is no mapping for ``source``
+
+        Returns
+        -------
+        Optional[str]
+            The replacement identifier, or ``default``
+
+        """
+        with self._lock:
+            if source in self._pending:
+                return self._pending[source]
+            try:
+                target = self._cache[source]
+            except KeyError:
+                row = self._conn.execute(
+                    "SELECT target FROM id_map WHERE source = ?", (source,)
+                ).fetchone()
+                target = row[0] if row else None
+                self._cache[source] = target
+        return target if target is not None else default
+
+    def load_tsv(
+        self,
+        filename: str,
+        source_column: int = 0,
+        target_column: int = 1,
+        delimiter: str = "\t",
+        skip_header: bool = False,
+    ) -> None:
+        """
+        Load mappings from a delimited text file, one mapping per line.
+        Lines starting with ``#`` are ignored.
+
+        Parameters
+        ----------
+        filename: str
+            The file to read from (may be gzip compressed, with a ``.gz`` extension)
+        source_column: int
+            Column index of the identifier to be replaced
+        target_column: int
+            Column index of the replacement identifier
+        delimiter: str
+            The column delimiter
+        skip_header: bool
+            Whether the first (non-comment) line is a header
+
+        """
+        with _open_text(filename) as FH:
+            reader = csv.reader(
+                (line for line in FH if not line.startswith("#")),
+                delimiter=delimiter,
+            )
+            if skip_header:
+                next(reader, None)
+            for row in reader:
+                if len(row) <= max(source_column, target_column):
+                    continue
+                source = row[source_column].strip()
+                target = row[target_column].strip()
+                if source and target:
+                    self.add(source, target)
+        self.flush()
+
+    def load_sssom(
+        self,
+        filename: str,
+        predicates: Optional[Set[str]] = None,
+    ) -> None:
+        """
+        Load mappings from an SSSOM TSV, mapping ``subject_id`` to ``object_id``.
+
+        Parameters
+        ----------
+        filename: str
+            The SSSOM file to read from (may be gzip compressed, with a ``.gz`` extension)
+        predicates: Optional[Set[str]]
+            The mapping predicates (``predicate_id``) of the rows to use
+            (``skos:exactMatch``, by default)
+
+        """
+        if predicates is None:
+            predicates = DEFAULT_SSSOM_MAPPING_PREDICATES
+        with _open_text(filename) as FH:
+            reader = csv.DictReader(
+                (line for line in FH if not line.startswith("#")), delimiter="\t"
+            )
+            for row in reader:
+                if predicates and row.get("predicate_id") not in predicates:
+                    continue
+                source = row.get("subject_id")
+                target = row.get("object_id")
+                if source and target:
+                    self.add(source, target)
+        self.flush()
+
+    def close(self) -> None:
+        """
+        Close the underlying database, removing it if it is a temporary file.
+        """
+        with self._lock:
+            if self._conn:
+                self.flush()
+                self._conn.close()
+                self._conn = None
+                if self._temporary and os.path.exists(self.filename):
+                    os.remove(self.filename)
+
+
+def _open_text(filename: str):
+    if filename.endswith(".gz"):
+        return gzip.open(filename, "rt", newline="")
+    return open(filename, "r", newline="")
+
+
+def remap_node_identifiers(
+    records: Iterable,
+    identifier_map: IdentifierMap,
+    category: Optional[str] = None,
+    alternative_property: Optional[str] = None,
+    prefix: Optional[str] = None,
+) -> Generator:
+    """
+    Rewrite node identifiers, and edge subject, object and key values,
+    of a stream of node and edge records as they pass through.
+
+    If ``alternative_property`` is given, then a mapping from the 'id' of each
+    node (of ``category``) to the value of its ``alternative_property`` is also
+    captured into ``identifier_map`` as the node records stream by. This assumes
+    that all node records are seen before the edge records, as is the case for
+    all KGX sources, but not for a chain of files listing edges before nodes:
+    the edges of a node streamed before the node are left unmapped, and a
+    warning is logged once all the records are streamed.
+
+    Parameters
+    ----------
+    records: Iterable
+        A stream of node ``(n, data)`` and edge ``(u, v, k, data)`` records
+    identifier_map: IdentifierMap
+        The identifier mappings
+    category: Optional[str]
+        category referring to nodes whose 'id' needs to be remapped
+        (only used with ``alternative_property``)
+    alternative_property: Optional[str]
+        property name from which the new value is pulled from
+    prefix: Optional[str]
+        signifies that the value for ``alternative_property`` is a list
+        and the ``prefix`` indicates which value to pick from the list
+
+    Returns
+    -------
+    Generator
+        A generator for remapped node and edge records
+
+    """
+    # the (unmapped) subjects and objects of the edges streamed so far, whose
+    # nodes ought not to be mapped later on, when capturing mappings (approximate,
+    # as a hash collision would only count a node as late, in the warning below)
+    unmapped: Optional[NodeSet] = NodeSet() if alternative_property else None
+    late_nodes = 0
+    late_node = None
+    for rec in records:
+        if not rec:
+            yield rec
+        elif len(rec) == 4:
+            u, v, k, data = rec
+            s = identifier_map.get(u, u)
+            o = identifier_map.get(v, v)
+            if s != u or o != v:
+                data["subject"] = s
+                data["object"] = o
+                k = generate_edge_key(s, data.get("predicate"), o)
+            if unmapped is not None:
+                if s == u:
+                    unmapped.add(u)
+                if o == v:
+                    unmapped.add(v)
+            yield s, o, k, data
+        else:
+            n, data = rec
+            if alternative_property:
+                new_id = select_alternative_identifier(
+                    data, category, alternative_property, prefix
+                )
+                if new_id:
+                    identifier_map.add(n, new_id)
+                    if n in unmapped:
+                        late_nodes += 1
+                        late_node = late_node or n
+            new_id = identifier_map.get(n)
+            if new_id:
+                n = data["id"] = new_id
+            yield n, data
+    if late_nodes:
+        log.warning(
+            f"{late_nodes} node(s) (e.g. '{late_node}') mapped to an alternative identifier "
+            f"only after some of their edges were streamed, which were left unmapped; "
+            f"nodes ought to be streamed before edges (e.g. node files listed before edge files)"
+        )
@@ -2,7 +2,7 @@
 Information Resource (InfoRes) utilities
 """
 import re
-from typing import Optional, Tuple, Callable, Dict, List, Any
+from typing import Optional, Tuple, Callable, Dict, List, Any, Pattern, Hashable
 
 from kgx.utils.kgx_utils import knowledge_provenance_properties, column_types
 from kgx.error_detection import ErrorType, MessageLevel
@@ -10,6 +10,14 @@ from kgx.config import get_logger
 
 log = get_logger()
 
+# maximum number of the values of a knowledge source field
+# whose rewrite is memoized (the memo is cleared when full)
+MEMO_SIZE = 100000
+
+_WHITESPACE = re.compile(r"\s+")
+_DOTS = re.compile(r"\.+")
+_NON_WORD = re.compile(r"[\W]")
+
 
 class InfoResContext:
     """
@@ -28,6 +36,14 @@ class InfoResContext:
         # name to infores associations for the given graph
         self.catalog: Dict[str, str] = dict()
 
+        # the rewritten values of the knowledge source fields whose mappings
+        # are set up from rewrite rules, by field and raw value
+        self._memo: Dict[str, Dict[Hashable, Any]] = dict()
+
+        # the compiled patterns of the knowledge source fields
+        # mapped by pattern, by field
+        self._patterns: Dict[str, List[Tuple[str, Pattern]]] = dict()
+
     def get_catalog(self) -> Dict[str, str]:
         """
         Retrieves the catalog of mappings of Knowledge Source names to an InfoRes.
@@ -159,10 +175,10 @@ class InfoResContext:
                 infores = self.prefix + " " + infores
                 infores = infores.strip()
                 infores = infores.lower()
-                infores = re.sub(r"\s+", "_", infores)
-                infores = re.sub(r"\.+", "_", infores)
-                infores = re.sub(r"[\W]", "", infores)
-                infores = re.sub(r"_", "-", infores)
+                infores = _WHITESPACE.sub("_", infores)
+                infores = _DOTS.sub("_", infores)
+                infores = _NON_WORD.sub("", infores)
+                infores = infores.replace("_", "-")
 
                 infores = "infores:" + infores
                 return infores
@@ -339,6 +355,9 @@ class InfoResContext:
         """
         if "default_provenance" in kwargs:
             self.default_provenance = kwargs.pop("default_provenance")
+        for memo in self._memo.values():
+            memo.clear()
+        self._patterns.clear()
 
         ksf_found = []
         for ksf in knowledge_provenance_properties:
@@ -346,6 +365,13 @@ class InfoResContext:
                 ksf_found.append(ksf)
                 ksf_value = kwargs.pop(ksf)
                 if isinstance(ksf_value, dict):
+                    # (a pattern of) the field is mapped by a Callable other than
+                    # those of rewrite rules, whose results may not be memoized
+                    self._set_memo(
+                        ksf,
+                        all(_is_rewrite_rule(v) for v in ksf_value.values())
+                        and (ksf not in self.mapping or ksf in self._memo),
+                    )
                     for ksf_pattern in ksf_value.keys():
                         log.debug("ksf_pattern: ", ksf_pattern)
                         if ksf not in self.mapping:
@@ -360,6 +386,7 @@ class InfoResContext:
                 else:
                     ir = self.get_mapping(ksf)
                     self.mapping[ksf] = ir.set_provenance_map_entry(ksf_value)
+                    self._set_memo(ksf, _is_rewrite_rule(ksf_value))
         # if none specified, add at least one generic 'knowledge_source'
         if len(ksf_found) == 0:
             ir = self.get_mapping("knowledge_source")
@@ -367,14 +394,32 @@ class InfoResContext:
                 self.mapping["knowledge_source"] = ir.default(kwargs["name"])
             else:
                 self.mapping["knowledge_source"] = ir.default(self.default_provenance)
+            self._set_memo("knowledge_source", True)
         if "provided_by" not in self.mapping:
             ir = self.get_mapping("provided_by")
             self.mapping["provided_by"] = ir.default(self.default_provenance)
+            self._set_memo("provided_by", True)
+
+    def _set_memo(self, ksf: str, memoize: bool) -> None:
+        if memoize:
+            self._memo[ksf] = dict()
+        else:
+            self._memo.pop(ksf, None)
+
+    def _get_patterns(self, ksf: str) -> List[Tuple[str, Pattern]]:
+        # the patterns of a field, compiled once
+        if ksf not in self._patterns:
+            self._patterns[ksf] = [
+                (pattern, re.compile(pattern)) for pattern in self.mapping[ksf].keys()
+            ]
+        return self._patterns[ksf]
 
     def set_provenance(self, ksf: str, data: Dict):
         """
         Compute the knowledge_source value for the current node or edge data, using the
         infores rewrite context previously established by a call to set_provenance_map().
+        The rewritten value is memoized, by field and raw value, such that a knowledge
+        source value seen before is rewritten by a dictionary lookup.
 
         Parameters
         ----------
@@ -392,41 +437,62 @@ class InfoResContext:
                 # dictionary, then just set the value to the default
                 data[ksf] = [self.default_provenance]
         else:
-            # If data is s a non-string iterable then, coerce into a simple list of sources
-            if isinstance(data[ksf], (list, set, tuple)):
-                sources = list(data[ksf])
+            memo = self._memo.get(ksf)
+            key = _memo_key(data[ksf]) if memo is not None else None
+            if key is not None and key in memo:
+                value = memo[key]
+                # every record gets a list of its own
+                data[ksf] = list(value) if isinstance(value, list) else value
             else:
-                # wraps knowledge sources that are multivalued in a list even if single valued
-                # in ingest data
-                if column_types[ksf] == list:
-                    sources = [data[ksf]]
-                else:
-                    sources = data[ksf]
-            if ksf in self.mapping:
-                log.debug("self.mapping[ksf]", self.mapping[ksf])
-                if isinstance(self.mapping[ksf], dict):
-                    log.debug("self.mapping[ksf].keys()", self.mapping[ksf].keys())
-                    for pattern in self.mapping[ksf].keys():
-                        log.debug("pattern", pattern)
-                        for source in sources:
-                            log.debug("source", source)
-                            if re.compile(pattern).match(source):
-                                index_of_source = data[ksf].index(source)
-                                del data[ksf][index_of_source]
-                                data[ksf] = data[ksf] + self.mapping[ksf][pattern]([source])
-                            else:
-                                if source not in data[ksf] and source not in self.mapping[ksf].keys():
-                                    data[ksf].append(source)
-                        log.debug("data[ksf]", data[ksf])
-                else:
-                    data[ksf] = self.mapping[ksf](sources)
-            else:  # leave data intact if no mapping found
-                data[ksf] = sources
+                self._rewrite(ksf, data)
+                if key is not None:
+                    if len(memo) >= MEMO_SIZE:
+                        memo.clear()
+                    value = data[ksf]
+                    memo[key] = list(value) if isinstance(value, list) else value
 
         # ignore if still empty at this point
         if not data[ksf]:
             data.pop(ksf)
 
+    def _rewrite(self, ksf: str, data: Dict):
+        """
+        Rewrite the knowledge_source value of the current node or edge data.
+
+        Parameters
+        ----------
+        ksf: str
+            Knowledge source field being processed.
+        data: Dict
+            Current node or edge data entry being processed.
+
+        """
+        # If data is s a non-string iterable then, coerce into a simple list of sources
+        if isinstance(data[ksf], (list, set, tuple)):
+            sources = list(data[ksf])
+        else:
+            # wraps knowledge sources that are multivalued in a list even if single valued
+            # in ingest data
+            if column_types[ksf] == list:
+                sources = [data[ksf]]
+            else:
+                sources = data[ksf]
+        if ksf in self.mapping:
+            if isinstance(self.mapping[ksf], dict):
+                for pattern, regex in self._get_patterns(ksf):
+                    for source in sources:
+                        if regex.match(source):
+                            index_of_source = data[ksf].index(source)
+                            del data[ksf][index_of_source]
+                            data[ksf] = data[ksf] + self.mapping[ksf][pattern]([source])
+                        else:
+                            if source not in data[ksf] and source not in self.mapping[ksf]:
+                                data[ksf].append(source)
+            else:
+                data[ksf] = self.mapping[ksf](sources)
+        else:  # leave data intact if no mapping found
+            data[ksf] = sources
+
     def set_node_provenance(self, node_data: Dict):
         """
         Sets the node knowledge_source value for the current node.
@@ -457,3 +523,24 @@ class InfoResContext:
         for ksf in self.mapping:
             if ksf != "provided_by":
                 self.set_provenance(ksf, edge_data)
+
+
+def _is_rewrite_rule(ksf_value: Any) -> bool:
+    # a value of a knowledge source field which set_provenance_map_entry
+    # turns into a mapping by InfoResMapping.processor() or default()
+    return isinstance(ksf_value, (str, bool, list, set, tuple))
+
+
+def _memo_key(value: Any) -> Optional[Hashable]:
+    # the key of a raw value of a knowledge source field, distinguishing
+    # its type (None if the rewrite of the value is not to be memoized)
+    if isinstance(value, str):
+        return str, value
+    if isinstance(value, (list, tuple)):
+        key = type(value), tuple(value)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    return None
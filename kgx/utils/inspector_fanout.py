@@ -0,0 +1,255 @@
+"""
+Dispatch of streamed graph records to several Transformer inspectors.
+"""
+import multiprocessing
+import pickle
+import queue
+import threading
+import traceback
+from typing import Callable, List, Optional
+
+from kgx.config import get_logger
+from kgx.utils.kgx_utils import GraphEntityType
+
+log = get_logger()
+
+INSPECTOR_WORKER_TYPES = ("thread", "process")
+
+
+class InspectorFanOut(object):
+    """
+    A Transformer 'inspector' Callable which hands every record
+    it is given to each one of a list of inspectors, such that
+    a single pass over the data serves all of the inspectors.
+
+    By default, the inspectors are called in turn, on the calling thread.
+    With ``workers``, each inspector runs in a worker thread or process of its
+    own, which is sent batches of records through a bounded queue. A slow
+    inspector then no longer delays the others, until its queue fills up,
+    at which point the reading of the records waits for it (back-pressure).
+
+    Process workers receive a copy of their inspector and, on ``close()``, the
+    final state (attributes) of each copy is copied back onto the original
+    inspector. Such inspectors, and the records, must therefore be picklable.
+
+    As the workers inspect a record after the call has returned, they are given
+    a copy of it: of its (top level) attributes dictionary, that is, which may
+    still share nested values (e.g. lists) with the record. Inspectors must not
+    change the records, nor rely on nested values not being changed later.
+
+    Parameters
+    ----------
+    inspectors: List[Callable[[GraphEntityType, List], None]]
+        The inspectors
+    workers: Optional[str]
+        Either 'thread' or 'process', to run each inspector in a worker of its own
+    queue_size: int
+        Maximum number of batches of records queued for each worker
+    batch_size: int
+        Number of records sent to the workers at a time
+
+    """
+
+    def __init__(
+        self,
+        inspectors: List[Callable[[GraphEntityType, List], None]],
+        workers: Optional[str] = None,
+        queue_size: int = 16,
+        batch_size: int = 1000,
+    ):
+        if workers and workers not in INSPECTOR_WORKER_TYPES:
+            raise ValueError(f"workers must be one of {INSPECTOR_WORKER_TYPES}")
+        self.inspectors = list(inspectors)
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self._batch: List = list()
+        self._workers: List[_InspectorWorker] = list()
+        if workers:
+            for inspector in self.inspectors:
+                if workers == "process":
+                    worker = _InspectorProcess(inspector, queue_size)
+                else:
+                    worker = _InspectorThread(inspector, queue_size)
+                worker.start()
+                self._workers.append(worker)
+
+    def __call__(self, entity_type: GraphEntityType, rec: List):
+        """
+        Transformer 'inspector' Callable, dispatching
+        a record to each one of the inspectors.
+
+        Parameters
+        ----------
+        entity_type: GraphEntityType
+            indicates what kind of record being passed to the function for analysis.
+        rec: List
+            The record
+
+        """
+        if not self._workers:
+            for inspector in self.inspectors:
+                inspector(entity_type, rec)
+        else:
+            # the records are copied, as the transform may still change them
+            self._batch.append((entity_type, _copy_record(rec)))
+            if len(self._batch) >= self.batch_size:
+                try:
+                    self._dispatch()
+                except RuntimeError:
+                    # stop all of the workers, reporting the first failure
+                    self._batch = list()
+                    self.close()
+                    raise
+
+    def _dispatch(self):
+        if self._batch:
+            batch = self._batch
+            self._batch = list()
+            if self.workers == "process":
+                # pickled once, here, rather than by each queue's feeder thread
+                batch = pickle.dumps(batch, protocol=pickle.HIGHEST_PROTOCOL)
+            for worker in self._workers:
+                worker.put(batch)
+
+    def close(self) -> None:
+        """
+        Send any remaining records to the workers and wait for them to finish.
+
+        Raises
+        ------
+        RuntimeError
+            If any one of the inspectors failed
+
+        """
+        if not self._workers:
+            return
+        error = None
+        try:
+            self._dispatch()
+        except RuntimeError as e:
+            error = e
+        for worker in self._workers:
+            try:
+                worker.close()
+            except RuntimeError as e:
+                error = error or e
+        self._workers = list()
+        if error:
+            raise error
+
+
+def _copy_record(rec: List) -> List:
+    # a shallow copy of the attributes dictionary, the last element of the record
+    return type(rec)(list(rec[:-1]) + [dict(rec[-1])])
+
+
+class _InspectorWorker(object):
+    def __init__(self, inspector: Callable[[GraphEntityType, List], None]):
+        self.inspector = inspector
+
+    def start(self):
+        raise NotImplementedError()
+
+    def put(self, batch):
+        raise NotImplementedError()
+
+    def close(self):
+        raise NotImplementedError()
+
+
+class _InspectorThread(_InspectorWorker):
+    def __init__(self, inspector: Callable[[GraphEntityType, List], None], queue_size: int):
+        _InspectorWorker.__init__(self, inspector)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.error: Optional[str] = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                break
+            if self.error:
+                # keep draining the queue, so as not to block the reader
+                continue
+            try:
+                for entity_type, rec in batch:
+                    self.inspector(entity_type, rec)
+            except Exception:
+                self.error = traceback.format_exc()
+
+    def put(self, batch):
+        if self.error:
+            raise RuntimeError(f"Inspector {self.inspector} failed:\n{self.error}")
+        self.queue.put(batch)
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        if self.error:
+            raise RuntimeError(f"Inspector {self.inspector} failed:\n{self.error}")
+
+
+def _run_inspector_process(inspector, batches, results):
+    error = None
+    while True:
+        batch = batches.get()
+        if batch is None:
+            break
+        if error:
+            continue
+        try:
+            for entity_type, rec in pickle.loads(batch):
+                inspector(entity_type, rec)
+        except Exception:
+            error = traceback.format_exc()
+    if error:
+        results.put((error, None))
+    else:
+        results.put((None, inspector))
+
+
+class _InspectorProcess(_InspectorWorker):
+    def __init__(self, inspector: Callable[[GraphEntityType, List], None], queue_size: int):
+        _InspectorWorker.__init__(self, inspector)
+        self.batches = multiprocessing.Queue(maxsize=queue_size)
+        self.results = multiprocessing.Queue()
+        self.process = multiprocessing.Process(
+            target=_run_inspector_process,
+            args=(inspector, self.batches, self.results),
+            daemon=True,
+        )
+
+    def start(self):
+        self.process.start()
+
+    def put(self, batch):
+        while True:
+            try:
+                self.batches.put(batch, timeout=1)
+                return
+            except queue.Full:
+                if not self.process.is_alive():
+                    raise RuntimeError(f"Inspector {self.inspector} process died")
+
+    def close(self):
+        self.put(None)
+        while True:
+            try:
+                error, inspector = self.results.get(timeout=1)
+                break
+            except queue.Empty:
+                if not self.process.is_alive() and self.results.empty():
+                    raise RuntimeError(f"Inspector {self.inspector} process died")
+        self.process.join()
+        if error:
+            raise RuntimeError(f"Inspector {self.inspector} failed:\n{error}")
+        if hasattr(inspector, "__dict__") and inspector is not self.inspector:
+            # the final state of the inspector comes back from the worker process,
+            # less what is not carried over to copies (e.g. an open error log)
+            state = inspector.__getstate__() if hasattr(inspector, "__getstate__") else None
+            vars(self.inspector).update(state if isinstance(state, dict) else vars(inspector))
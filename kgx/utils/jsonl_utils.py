@@ -0,0 +1,195 @@
+"""
+Fast reading and writing of JSON Lines, with orjson when it is installed.
+"""
+import json
+from typing import Any, BinaryIO, Dict, Generator, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# size of the blocks of bytes read from (and written to) JSON Lines files
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+
+def loads(line: bytes) -> Any:
+    """
+    Decode a JSON document (e.g. a line of JSON Lines).
+
+    Documents that orjson rejects (e.g. with integers beyond 64 bits)
+    are decoded with the json module of the standard library instead.
+
+    Parameters
+    ----------
+    line: bytes
+        The (UTF-8 encoded) JSON document
+
+    Returns
+    -------
+    Any
+        The decoded document
+
+    """
+    if orjson:
+        try:
+            return orjson.loads(line)
+        except ValueError:
+            pass
+    return json.loads(line)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode an object as a (UTF-8 encoded) single line JSON document.
+
+    Objects that orjson does not support (e.g. integers beyond 64 bits)
+    are encoded with the json module of the standard library instead.
+
+    Parameters
+    ----------
+    obj: Any
+        The object
+
+    Returns
+    -------
+    bytes
+        The JSON document
+
+    """
+    if orjson:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    # as compact as orjson, such that the output does not depend on whether it is installed
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def read_jsonl_blocks(FH: BinaryIO, block_size: int = DEFAULT_BLOCK_SIZE) -> Generator[bytes, None, None]:
+    """
+    Read a JSON Lines (binary) file handle in blocks of (about)
+    ``block_size`` bytes, each one ending at the end of a line.
+
+    Parameters
+    ----------
+    FH: BinaryIO
+        The file handle
+    block_size: int
+        Number of bytes read at a time
+
+    Returns
+    -------
+    Generator[bytes, None, None]
+        A generator for the blocks of whole lines
+
+    """
+    remainder = b""
+    while True:
+        block = FH.read(block_size)
+        if not block:
+            break
+        end = block.rfind(b"\n") + 1
+        if not end:
+            remainder += block
+            continue
+        yield remainder + block[:end]
+        remainder = block[end:]
+    if remainder:
+        yield remainder
+
+
+def read_jsonl_block(block: bytes) -> Generator[Any, None, None]:
+    """
+    Decode the JSON documents of a block of JSON Lines. Empty lines are skipped.
+
+    Parameters
+    ----------
+    block: bytes
+        The block of lines
+
+    Returns
+    -------
+    Generator[Any, None, None]
+        A generator for the decoded documents
+
+    """
+    for line in block.split(b"\n"):
+        if line.strip():
+            yield loads(line)
+
+
+def read_jsonl(FH: BinaryIO, block_size: int = DEFAULT_BLOCK_SIZE) -> Generator[Any, None, None]:
+    """
+    Read the JSON documents of a JSON Lines (binary) file handle,
+    in blocks of bytes which are split on newlines. Empty lines are skipped.
+
+    Parameters
+    ----------
+    FH: BinaryIO
+        The file handle
+    block_size: int
+        Number of bytes read at a time
+
+    Returns
+    -------
+    Generator[Any, None, None]
+        A generator for the decoded documents
+
+    """
+    for block in read_jsonl_blocks(FH, block_size):
+        yield from read_jsonl_block(block)
+
+
+class JsonlWriter(object):
+    """
+    A writer of JSON Lines to a (binary) file handle, which buffers
+    the encoded lines, writing them in blocks of ``flush_size`` bytes.
+
+    Parameters
+    ----------
+    FH: BinaryIO
+        The file handle
+    flush_size: int
+        Number of bytes buffered before writing them to the file handle
+
+    """
+
+    def __init__(self, FH: BinaryIO, flush_size: int = DEFAULT_BLOCK_SIZE):
+        self.FH = FH
+        self.flush_size = flush_size
+        self._buffer: List[bytes] = list()
+        self._buffered = 0
+
+    def write(self, record: Dict) -> None:
+        """
+        Write a record as a line of JSON.
+
+        Parameters
+        ----------
+        record: Dict
+            The record
+
+        """
+        line = dumps(record)
+        self._buffer.append(line)
+        self._buffer.append(b"\n")
+        self._buffered += len(line) + 1
+        if self._buffered >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the buffered lines to the file handle.
+        """
+        if self._buffer:
+            self.FH.write(b"".join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+
+    def close(self) -> None:
+        """
+        Write the buffered lines and close the file handle.
+        """
+        self.flush()
+        self.FH.close()
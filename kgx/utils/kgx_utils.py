@@ -1,10 +1,13 @@
 import importlib
+import multiprocessing
 import re
 import time
 import uuid
 import sqlite3
+from copy import deepcopy
 from enum import Enum
 from functools import lru_cache
+from hashlib import blake2b
 from typing import List, Dict, Set, Optional, Any, Union
 import stringcase
 from inflection import camelize
@@ -403,6 +406,35 @@ def get_cache(maxsize=10000):
     return cache
 
 
+def get_pool_processes(processes: Optional[int]) -> int:
+    """
+    Get the number of processes of a pool, to be opened by the current process.
+
+    A daemonic process, e.g. a worker of the pool parsing the sources of a
+    transform (or merge) configuration, cannot have children of its own,
+    in which case there is a single process (no pool): the current one.
+
+    Parameters
+    ----------
+    processes: Optional[int]
+        The number of processes asked for
+
+    Returns
+    -------
+    int
+        The number of processes
+
+    """
+    processes = processes or 1
+    if processes > 1 and multiprocessing.current_process().daemon:
+        log.warning(
+            f"Using a single process, rather than {processes}, "
+            f"within the daemonic process {multiprocessing.current_process().name}"
+        )
+        return 1
+    return processes
+
+
 def current_time_in_millis():
     """
     Get current time in milliseconds.
@@ -679,6 +711,43 @@ def prepare_data_dict(d1: Dict, d2: Dict, preserve: bool = True) -> Dict:
     return new_data
 
 
+def merge_counts(target: Dict, source: Dict) -> Dict:
+    """
+    Merge a (nested) dictionary of statistics into another, in place.
+
+    Numeric values are summed, sets are unioned, lists are extended with
+    values not already present and nested dictionaries are merged recursively.
+    Any other value (e.g. a string label) is only copied if missing from ``target``.
+
+    Parameters
+    ----------
+    target: Dict
+        The dictionary to merge into
+    source: Dict
+        The dictionary to merge from (left unchanged)
+
+    Returns
+    -------
+    Dict
+        The ``target`` dictionary
+
+    """
+    for key, value in source.items():
+        if key not in target:
+            target[key] = deepcopy(value)
+        elif isinstance(value, dict):
+            merge_counts(target[key], value)
+        elif isinstance(value, set):
+            target[key].update(value)
+        elif isinstance(value, list):
+            target[key].extend([x for x in value if x not in target[key]])
+        elif isinstance(value, bool):
+            target[key] = target[key] or value
+        elif isinstance(value, (int, float)):
+            target[key] += value
+    return target
+
+
 def apply_filters(
     graph: BaseGraph,
     node_filters: Dict[str, Union[str, Set]],
@@ -778,6 +847,55 @@ def generate_uuid():
     return f"urn:uuid:{uuid.uuid4()}"
 
 
+# properties which change the meaning of an edge (rather than its provenance or
+# evidence) and so make up its identity, along with any '*_qualifier' property
+EDGE_ID_PROPERTIES = frozenset(
+    {
+        "subject",
+        "predicate",
+        "object",
+        "negated",
+        "logical_interpretation",
+        "qualified_predicate",
+        "qualifiers",
+    }
+)
+
+
+def generate_edge_hash_id(edge: Dict) -> str:
+    """
+    Generates a deterministic identifier for an edge, from a (blake2b) hash of
+    its subject, predicate, object and qualifiers (as well as of its ``negated``
+    and ``logical_interpretation`` values), such that the same edge is given the
+    same identifier on every run. The identifier is formatted as a (custom,
+    version 8) UUID, like the (random) UUIDs of ``generate_uuid``.
+
+    Parameters
+    ----------
+    edge: Dict
+        The edge
+
+    Returns
+    -------
+    str
+        A UUID
+
+    """
+    name = []
+    for key in sorted(edge):
+        if key in EDGE_ID_PROPERTIES or key.endswith("_qualifier"):
+            value = edge[key]
+            if isinstance(value, (list, set, tuple)):
+                value = "|".join(sorted(str(v) for v in value))
+            name.append(f"{key}={value}")
+    digest = bytearray(blake2b("\t".join(name).encode("utf-8"), digest_size=16).digest())
+    # the version (8) and variant (RFC 4122) bits of the UUID
+    digest[6] = (digest[6] & 0x0F) | 0x80
+    digest[8] = (digest[8] & 0x3F) | 0x80
+    h = digest.hex()
+    return f"urn:uuid:{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
 def generate_edge_identifiers(graph: BaseGraph):
     """
     Generate unique identifiers for edges in a graph that do not
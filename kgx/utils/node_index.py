@@ -0,0 +1,504 @@
+"""
+Compact, numpy backed, indices of node identifiers for large graphs.
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+import weakref
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+def hash_node_id(n: str) -> int:
+    """
+    Hash a node identifier into a 64-bit integer key.
+
+    With 64-bit keys, the probability of any two of 50 million
+    distinct node identifiers colliding is below 1 in 10,000.
+
+    Parameters
+    ----------
+    n: str
+        The node identifier
+
+    Returns
+    -------
+    int
+        The 64-bit key of the node identifier
+
+    """
+    return int.from_bytes(
+        blake2b(n.encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+class NodeCatalog(object):
+    """
+    A compact mapping of node identifiers to the (int) indices of their categories.
+
+    Node identifiers are held as 64-bit hashes (see ``hash_node_id``) and every
+    distinct combination of category indices is interned, so that each node
+    costs 12 bytes once catalogued: its key in a sorted ``uint64`` array and the
+    id of its category combination in a parallel ``uint32`` array. New nodes
+    are buffered in a dictionary and, every ``batch_size`` nodes, written into
+    a new sorted run. Runs are merged with runs of a similar size, such that a
+    lookup searches at most a few (logarithmically many) runs.
+
+    Parameters
+    ----------
+    directory: Optional[str]
+        Directory in which to spill large sorted runs, as memory-mapped files,
+        rather than holding them in memory
+    batch_size: int
+        Number of new nodes to buffer before writing them into a sorted run
+
+    """
+
+    def __init__(self, directory: Optional[str] = None, batch_size: int = 1000000):
+        self.directory = directory
+        self.batch_size = batch_size
+        self._pending: Dict[int, int] = dict()
+        self._runs: List[Tuple[np.ndarray, np.ndarray, Optional[str]]] = list()
+        self._size: int = 0
+        self._category_sets: List[Tuple[int, ...]] = list()
+        self._category_set_index: Dict[Tuple[int, ...], int] = dict()
+        self._spill_directory: Optional[str] = None
+        self._finalizer: Optional[weakref.finalize] = None
+        self._hand_over: bool = False
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, n: str) -> bool:
+        return self._lookup(hash_node_id(n)) is not None
+
+    def __getitem__(self, n: str) -> Tuple[int, ...]:
+        csid = self._lookup(hash_node_id(n))
+        if csid is None:
+            raise KeyError(n)
+        return self._category_sets[csid]
+
+    def __setitem__(self, n: str, cids: Iterable[int]) -> None:
+        key = hash_node_id(n)
+        if self._lookup(key) is None:
+            self._size += 1
+        self._pending[key] = self._intern(tuple(cids))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def get(self, n: str, default=None) -> Optional[Tuple[int, ...]]:
+        """
+        Get the category indices of a node.
+
+        Parameters
+        ----------
+        n: str
+            The node identifier
+        default:
+            Value returned if the node is not in the catalog
+
+        Returns
+        -------
+        Optional[Tuple[int, ...]]
+            The category indices of the node, or ``default``
+
+        """
+        csid = self._lookup(hash_node_id(n))
+        if csid is None:
+            return default
+        return self._category_sets[csid]
+
+    def flush(self) -> None:
+        """
+        Write buffered nodes into a sorted run.
+        """
+        if self._pending:
+            keys = np.fromiter(self._pending.keys(), dtype=np.uint64, count=len(self._pending))
+            values = np.fromiter(self._pending.values(), dtype=np.uint32, count=len(self._pending))
+            self._pending.clear()
+            order = np.argsort(keys)
+            self._add_run(keys[order], values[order])
+
+    def update(self, other: "NodeCatalog", cid_map: Optional[Dict[int, int]] = None) -> int:
+        """
+        Add the nodes of another NodeCatalog to this NodeCatalog.
+        Nodes already in this NodeCatalog are left unchanged.
+
+        Parameters
+        ----------
+        other: NodeCatalog
+            The NodeCatalog whose nodes are to be added
+        cid_map: Optional[Dict[int, int]]
+            Mapping of the category indices of the other NodeCatalog
+            onto the category indices of this NodeCatalog
+
+        Returns
+        -------
+        int
+            Number of nodes of the other NodeCatalog which were already in this NodeCatalog
+
+        """
+        other.flush()
+        if not other._runs:
+            return 0
+        self.flush()
+
+        csid_map = np.array(
+            [
+                self._intern(tuple(cid_map.get(c, c) for c in category_set) if cid_map else category_set)
+                for category_set in other._category_sets
+            ],
+            dtype=np.uint32,
+        )
+        keys, values = other._merged_runs()
+        values = csid_map[values]
+
+        duplicated = self._duplicated(keys)
+        duplicates = int(duplicated.sum())
+        if duplicates:
+            keys = keys[~duplicated]
+            values = values[~duplicated]
+
+        self._size += len(keys)
+        self._add_run(np.array(keys), np.array(values))
+        return duplicates
+
+    def count_common(self, other: "NodeCatalog") -> int:
+        """
+        Count the nodes of another NodeCatalog which are also in this NodeCatalog.
+
+        Parameters
+        ----------
+        other: NodeCatalog
+            The other NodeCatalog
+
+        Returns
+        -------
+        int
+            Number of nodes in both NodeCatalogs
+
+        """
+        other.flush()
+        if not other._runs:
+            return 0
+        self.flush()
+        keys, _ = other._merged_runs()
+        return int(self._duplicated(keys).sum())
+
+    def _merged_runs(self) -> Tuple[np.ndarray, np.ndarray]:
+        keys, values = self._runs[0][:2]
+        for run_keys, run_values, _ in self._runs[1:]:
+            keys, values = self._merge_runs(keys, values, run_keys, run_values)
+        return keys, values
+
+    def _duplicated(self, keys: np.ndarray) -> np.ndarray:
+        # flags the keys already in (the runs of) this catalog
+        duplicated = np.zeros(len(keys), dtype=bool)
+        for run_keys, _, _ in self._runs:
+            idx = np.searchsorted(run_keys, keys)
+            idx[idx == len(run_keys)] = 0
+            duplicated |= run_keys[idx] == keys
+        return duplicated
+
+    def _intern(self, category_set: Tuple[int, ...]) -> int:
+        csid = self._category_set_index.get(category_set)
+        if csid is None:
+            csid = self._category_set_index[category_set] = len(self._category_sets)
+            self._category_sets.append(category_set)
+        return csid
+
+    def _lookup(self, key: int) -> Optional[int]:
+        csid = self._pending.get(key)
+        if csid is not None:
+            return csid
+        key = np.uint64(key)
+        for keys, values, _ in reversed(self._runs):
+            i = keys.searchsorted(key)
+            if i < len(keys) and keys[i] == key:
+                return int(values[i])
+        return None
+
+    @staticmethod
+    def _merge_runs(
+        keys1: np.ndarray, values1: np.ndarray, keys2: np.ndarray, values2: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # values of the second (newer) run take precedence
+        keys = np.concatenate((keys1, keys2))
+        values = np.concatenate((values1, values2))
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        values = values[order]
+        last = np.append(keys[1:] != keys[:-1], True)
+        return keys[last], values[last]
+
+    def _add_run(self, keys: np.ndarray, values: np.ndarray) -> None:
+        if not len(keys):
+            return
+        while self._runs and len(self._runs[-1][0]) <= len(keys):
+            run_keys, run_values, path = self._runs.pop()
+            keys, values = self._merge_runs(run_keys, run_values, keys, values)
+            self._remove_spilled_run(path)
+        path = None
+        if self.directory and len(keys) >= self.batch_size:
+            keys, values, path = self._spill_run(keys, values)
+        self._runs.append((keys, values, path))
+
+    def _spill_run(
+        self, keys: np.ndarray, values: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, str]:
+        if not self._spill_directory:
+            self._spill_directory = tempfile.mkdtemp(prefix="kgx-nodes-", dir=self.directory)
+            self._remove_spill_directory_on_collection()
+        fd, path = tempfile.mkstemp(dir=self._spill_directory)
+        os.close(fd)
+        np.save(f"{path}.keys.npy", keys)
+        np.save(f"{path}.values.npy", values)
+        os.remove(path)
+        return self._load_spilled_run(path) + (path,)
+
+    @staticmethod
+    def _load_spilled_run(path: str) -> Tuple[np.ndarray, np.ndarray]:
+        return (
+            np.load(f"{path}.keys.npy", mmap_mode="r"),
+            np.load(f"{path}.values.npy", mmap_mode="r"),
+        )
+
+    def _remove_spill_directory_on_collection(self) -> None:
+        # spilled runs are removed once the catalog is garbage collected
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self._spill_directory, True)
+
+    def hand_over(self) -> None:
+        """
+        Hand the spilled runs of this catalog over to the copy next made of it,
+        e.g. when sent back from a worker process, such that they are removed
+        once the copy, rather than this catalog, is garbage collected.
+        """
+        self.flush()
+        if self._finalizer:
+            self._finalizer.detach()
+            self._finalizer = None
+        self._hand_over = self._spill_directory is not None
+
+    def _remove_spilled_run(self, path: Optional[str]) -> None:
+        if path and self._spill_directory and path.startswith(self._spill_directory):
+            for suffix in (".keys.npy", ".values.npy"):
+                try:
+                    os.remove(f"{path}{suffix}")
+                except OSError:
+                    pass
+
+    def __getstate__(self):
+        # spilled runs are shared with copies of the
+        # catalog (e.g. in other processes) by file name
+        self.flush()
+        state = self.__dict__.copy()
+        state["_runs"] = [
+            (None, None, path) if path else (keys, values, path)
+            for keys, values, path in self._runs
+        ]
+        state["_finalizer"] = None
+        state["_hand_over"] = False
+        if self._hand_over:
+            # ...and removed by the (first) copy they were handed over to
+            self._hand_over = False
+        else:
+            state["_spill_directory"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._runs = [
+            self._load_spilled_run(path) + (path,) if path else (keys, values, path)
+            for keys, values, path in self._runs
+        ]
+        if self._spill_directory:
+            self._remove_spill_directory_on_collection()
+
+
+class NodeSet(object):
+    """
+    A compact set of node identifiers, e.g. of the nodes seen so far in a stream.
+
+    Like the NodeCatalog, node identifiers are held as 64-bit hashes (see
+    ``hash_node_id``), here in a ``uint64`` open addressing (linear probing)
+    hash table, at most three quarters full. Each node then costs 11 to 21
+    bytes, rather than the 100 or more bytes per node of a Python set of
+    identifiers.
+
+    By default, the set is approximate: an identifier whose hash collides
+    with that of an identifier of the set is taken as one of the set (a false
+    positive, which is very unlikely, see ``hash_node_id``). With ``exact``,
+    the identifiers are also written to an SQLite table (in a temporary file)
+    and any identifier whose hash is found in the table is verified against
+    it, such that the set is exact, at the cost of a lookup of the SQLite
+    table for each identifier found (or colliding). The exact mode therefore
+    suits sets which are mostly checked for identifiers they do not hold,
+    e.g. to skip the rare duplicates of a stream of nodes.
+
+    Parameters
+    ----------
+    capacity: int
+        Initial number of slots of the table (rounded up to a power of two),
+        which doubles whenever the table is three quarters full
+    exact: bool
+        Whether to verify the identifiers found against the identifiers themselves
+    directory: Optional[str]
+        Directory of the SQLite database of an exact set (the system default, if not given)
+    batch_size: int
+        Number of identifiers of an exact set to buffer before writing them to the table
+
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1 << 16,
+        exact: bool = False,
+        directory: Optional[str] = None,
+        batch_size: int = 10000,
+    ):
+        capacity = 1 << max(capacity - 1, 1).bit_length()
+        self._table = np.zeros(capacity, dtype=np.uint64)
+        self._mask = capacity - 1
+        self._size: int = 0
+        self.exact = exact
+        self.directory = directory
+        self.batch_size = batch_size
+        self._pending: Set[str] = set()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._finalizer: Optional[weakref.finalize] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, n: str) -> bool:
+        found, _ = self._probe(self._key(n))
+        return found and (not self.exact or self._verify(n))
+
+    def add(self, n: str) -> None:
+        """
+        Add a node to the set.
+
+        Parameters
+        ----------
+        n: str
+            The node identifier
+
+        """
+        key = self._key(n)
+        found, i = self._probe(key)
+        if found and (not self.exact or self._verify(n)):
+            return
+        if not found:
+            self._table[i] = key
+        # else, a distinct identifier of the same hash, held by the table of identifiers only
+        self._size += 1
+        if self.exact:
+            self._pending.add(n)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+        if 4 * self._size > 3 * len(self._table):
+            self._resize(2 * len(self._table))
+
+    def flush(self) -> None:
+        """
+        Write the identifiers buffered by an exact set to its table.
+        """
+        if self._pending:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO ids (id) VALUES (?)",
+                    ((n,) for n in self._pending),
+                )
+            self._pending.clear()
+
+    def clear(self) -> None:
+        """
+        Remove all of the nodes from the set.
+        """
+        self._table[:] = 0
+        self._size = 0
+        self._pending.clear()
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute("DELETE FROM ids")
+
+    def close(self) -> None:
+        """
+        Remove the table of identifiers of an exact set (also done once the set is garbage collected).
+        """
+        if self._finalizer:
+            self._finalizer()
+            self._finalizer = None
+        self._conn = None
+        self._pending.clear()
+
+    def _probe(self, key: int) -> Tuple[bool, int]:
+        # whether the key is in the table, and its slot (or the empty slot for it)
+        table = self._table
+        i = key & self._mask
+        while True:
+            k = table.item(i)
+            if k == key:
+                return True, i
+            if not k:
+                return False, i
+            i = (i + 1) & self._mask
+
+    def _verify(self, n: str) -> bool:
+        if n in self._pending:
+            return True
+        if self._conn is None:
+            return False
+        return (
+            self._conn.execute("SELECT 1 FROM ids WHERE id = ?", (n,)).fetchone()
+            is not None
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            fd, filename = tempfile.mkstemp(
+                prefix="kgx-ids-", suffix=".db", dir=self.directory
+            )
+            os.close(fd)
+            self._conn = sqlite3.connect(filename, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=OFF")
+            self._conn.execute("PRAGMA synchronous=OFF")
+            self._conn.execute("CREATE TABLE ids (id TEXT PRIMARY KEY) WITHOUT ROWID")
+            self._finalizer = weakref.finalize(self, _remove_database, self._conn, filename)
+        return self._conn
+
+    @staticmethod
+    def _key(n: str) -> int:
+        # 0 marks an empty slot
+        return hash_node_id(n) or 1
+
+    def _resize(self, capacity: int) -> None:
+        keys = self._table[self._table != 0]
+        table = np.zeros(capacity, dtype=np.uint64)
+        mask = np.uint64(capacity - 1)
+        slots = keys & mask
+        # keys are placed in rounds: of the keys whose slot is empty, one
+        # key per slot is placed, while the others move on to the next slot
+        while len(keys):
+            candidates = np.nonzero(table[slots] == 0)[0]
+            _, first = np.unique(slots[candidates], return_index=True)
+            placed = candidates[first]
+            table[slots[placed]] = keys[placed]
+            remaining = np.ones(len(keys), dtype=bool)
+            remaining[placed] = False
+            keys = keys[remaining]
+            slots = (slots[remaining] + np.uint64(1)) & mask
+        self._table = table
+        self._mask = capacity - 1
+
+
+def _remove_database(conn: sqlite3.Connection, filename: str) -> None:
+    conn.close()
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
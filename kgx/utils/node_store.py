@@ -0,0 +1,248 @@
+"""
+Bounded-memory store of the (partial) node records accumulated while parsing.
+"""
+import os
+import pickle
+import sqlite3
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, Generator, Iterator, List, Optional, Tuple
+
+from kgx.utils.node_index import NodeSet
+
+# marks a missing entry (as None is a valid default)
+_MISSING = object()
+
+
+class NodeStore(object):
+    """
+    A dictionary of node records, keyed by node identifier, which holds the
+    records recently used in memory and spills the others to an SQLite table
+    (in a temporary file), e.g. to accumulate the properties of every node of
+    a billion-triple RDF dump without holding them all in memory.
+
+    Records are held in a write-back LRU cache: a record got from the store may
+    be updated in place, and is written to the table (pickled) when evicted
+    from the cache, in batches. The identifiers of the records written to the
+    table are noted in a NodeSet, such that looking up a new identifier rarely
+    reaches the table. Iterating over the store yields its records in the order
+    of their identifiers.
+
+    Parameters
+    ----------
+    directory: Optional[str]
+        Directory of the SQLite database (the system default, if not given)
+    cache_size: int
+        Maximum number of records held in memory
+    batch_size: int
+        Number of evicted records to buffer before writing them to the table
+
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        cache_size: int = 100000,
+        batch_size: int = 10000,
+    ):
+        self.directory = directory
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self._cache: OrderedDict = OrderedDict()
+        self._pending: Dict[str, Any] = dict()
+        self._spilled = NodeSet()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._filename: Optional[str] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            fd, self._filename = tempfile.mkstemp(
+                prefix="kgx-nodes-", suffix=".db", dir=self.directory
+            )
+            os.close(fd)
+            self._conn = sqlite3.connect(self._filename)
+            self._conn.execute("PRAGMA journal_mode=OFF")
+            self._conn.execute("PRAGMA synchronous=OFF")
+            self._conn.execute(
+                "CREATE TABLE nodes (id TEXT PRIMARY KEY, data BLOB NOT NULL) WITHOUT ROWID"
+            )
+        return self._conn
+
+    def _load(self, n: str) -> Any:
+        if n in self._pending:
+            return self._pending.pop(n)
+        if self._conn is None or n not in self._spilled:
+            return _MISSING
+        row = self._conn.execute("SELECT data FROM nodes WHERE id = ?", (n,)).fetchone()
+        return pickle.loads(row[0]) if row else _MISSING
+
+    def _get(self, n: str) -> Any:
+        cache = self._cache
+        if n in cache:
+            cache.move_to_end(n)
+            return cache[n]
+        data = self._load(n)
+        if data is not _MISSING:
+            self._put(n, data)
+        return data
+
+    def _put(self, n: str, data: Any) -> None:
+        cache = self._cache
+        cache[n] = data
+        cache.move_to_end(n)
+        if len(cache) > self.cache_size:
+            evicted, evicted_data = cache.popitem(last=False)
+            self._pending[evicted] = evicted_data
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the evicted records to the table.
+        """
+        if self._pending:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO nodes (id, data) VALUES (?, ?)",
+                    (
+                        (n, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+                        for n, data in self._pending.items()
+                    ),
+                )
+            for n in self._pending:
+                self._spilled.add(n)
+            self._pending.clear()
+
+    def __contains__(self, n: str) -> bool:
+        return self._get(n) is not _MISSING
+
+    def __getitem__(self, n: str) -> Dict:
+        data = self._get(n)
+        if data is _MISSING:
+            raise KeyError(n)
+        return data
+
+    def __setitem__(self, n: str, data: Dict) -> None:
+        self._pending.pop(n, None)
+        self._put(n, data)
+
+    def __delitem__(self, n: str) -> None:
+        if self.pop(n, _MISSING) is _MISSING:
+            raise KeyError(n)
+
+    def get(self, n: str, default: Any = None) -> Any:
+        """
+        Get the record of a node.
+
+        Parameters
+        ----------
+        n: str
+            The node identifier
+        default: Any
+            Value returned if there is no record for the node
+
+        Returns
+        -------
+        Any
+            The record of the node, or ``default``
+
+        """
+        data = self._get(n)
+        return default if data is _MISSING else data
+
+    def pop(self, n: str, default: Any = _MISSING) -> Any:
+        """
+        Remove the record of a node and return it.
+
+        Parameters
+        ----------
+        n: str
+            The node identifier
+        default: Any
+            Value returned if there is no record for the node
+            (``KeyError`` is raised if not given)
+
+        Returns
+        -------
+        Any
+            The record of the node, or ``default``
+
+        """
+        if n in self._cache:
+            data = self._cache.pop(n)
+        else:
+            data = self._load(n)
+        if self._conn is not None and n in self._spilled:
+            self._conn.execute("DELETE FROM nodes WHERE id = ?", (n,))
+        if data is _MISSING:
+            if default is _MISSING:
+                raise KeyError(n)
+            return default
+        return data
+
+    def __len__(self) -> int:
+        self._spill_all()
+        return self._conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0] if self._conn else 0
+
+    def __iter__(self) -> Iterator[str]:
+        return (n for n, _ in self.items())
+
+    def keys(self) -> Iterator[str]:
+        """
+        Iterate over the node identifiers, in order.
+        """
+        return iter(self)
+
+    def items(self) -> Generator[Tuple[str, Dict], None, None]:
+        """
+        Iterate over the node identifiers and records, in the order of the identifiers.
+
+        Returns
+        -------
+        Generator[Tuple[str, Dict], None, None]
+            A generator for node identifiers and records
+
+        """
+        self._spill_all()
+        if self._conn is None:
+            return
+        cursor = self._conn.execute("SELECT id, data FROM nodes ORDER BY id")
+        while True:
+            rows: List = cursor.fetchmany(self.batch_size)
+            if not rows:
+                break
+            for n, data in rows:
+                yield n, pickle.loads(data)
+
+    def _spill_all(self) -> None:
+        # every record is written to the table, for a scan in order
+        self._pending.update(self._cache)
+        self._cache.clear()
+        if self._pending:
+            self.flush()
+
+    def clear(self) -> None:
+        """
+        Remove every record, and the SQLite database.
+        """
+        self._cache.clear()
+        self._pending.clear()
+        self._spilled = NodeSet()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            os.remove(self._filename)
+            self._filename = None
+
+    def close(self) -> None:
+        """
+        Remove every record, and the SQLite database.
+        """
+        self.clear()
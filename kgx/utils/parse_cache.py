@@ -0,0 +1,187 @@
+"""
+Content addressed cache of the records parsed from input files.
+"""
+import json
+import os
+import pickle
+import tempfile
+from hashlib import blake2b
+from itertools import islice
+from typing import Any, Callable, Dict, Generator
+
+import kgx
+from kgx.config import get_logger
+
+log = get_logger()
+
+# suffix of the files of the cache
+CACHE_FILE_SUFFIX = ".records"
+
+# number of records pickled at a time
+BATCH_SIZE = 10000
+
+
+def _canonical(o: Any) -> Any:
+    # sets are sorted, such that arguments hash the same in every process
+    if isinstance(o, (set, frozenset)):
+        return sorted(o, key=str)
+    # anything else (e.g. a Callable knowledge source rule) has no canonical
+    # form: its repr() would differ in every run (e.g. its memory address)
+    raise TypeError(f"no cache key for an argument of type {type(o).__name__}")
+
+
+class ParseCache(object):
+    """
+    A directory of the records parsed from input files, such that a later
+    transform (or merge) of an unchanged input file, with unchanged arguments,
+    reads the records back rather than parsing the file once again.
+
+    The records of a file are stored under a key hashing the content of the file,
+    the arguments of the parse (e.g. prefix map, filters and knowledge source
+    rules) and the version of KGX. Alongside the records, the node and edge
+    properties and InfoRes catalog of the Source are stored, and restored onto
+    the Source when the records are read back. Messages (e.g. warnings) logged
+    while parsing are not, however, logged again. Files parsed with arguments
+    which cannot be hashed the same in every run (e.g. a Callable knowledge
+    source rule) are not cached.
+
+    Parameters
+    ----------
+    directory: str
+        The directory of the cache (created if it does not exist)
+
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, filename: str, args: Dict) -> str:
+        """
+        Get the key of the records parsed from a file.
+
+        Parameters
+        ----------
+        filename: str
+            The input file
+        args: Dict
+            Arguments which the parsed records depend upon
+
+        Returns
+        -------
+        str
+            The key
+
+        Raises
+        ------
+        TypeError
+            If an argument (e.g. a Callable) cannot be hashed the same in every run
+
+        """
+        h = blake2b(digest_size=20)
+        h.update(
+            json.dumps(
+                {"kgx": kgx.__version__, "args": args}, sort_keys=True, default=_canonical
+            ).encode("utf-8")
+        )
+        with open(filename, "rb") as FH:
+            for block in iter(lambda: FH.read(1 << 20), b""):
+                h.update(block)
+        return h.hexdigest()
+
+    def path(self, key: str) -> str:
+        """
+        Get the path of the cache file of a key.
+
+        Parameters
+        ----------
+        key: str
+            The key
+
+        Returns
+        -------
+        str
+            The path of the cache file
+
+        """
+        return os.path.join(self.directory, f"{key}{CACHE_FILE_SUFFIX}")
+
+    def parse(
+        self, source, filename: str, args: Dict, parse: Callable[[], Generator]
+    ) -> Generator:
+        """
+        Yield the records parsed from a file, either from the cache or, when not
+        in the cache, from the parse of the file, storing them in the cache.
+
+        Parameters
+        ----------
+        source: kgx.source.source.Source
+            The Source parsing the file
+        filename: str
+            The input file
+        args: Dict
+            Arguments which the parsed records depend upon
+        parse: Callable[[], Generator]
+            Function starting the parse of the file by the Source
+
+        Returns
+        -------
+        Generator
+            A generator for node and edge records
+
+        """
+        try:
+            key = self.key(filename, args)
+        except TypeError as e:
+            log.warning(f"Not caching the records of {filename}: {e}")
+            yield from parse()
+            return
+        path = self.path(key)
+        if os.path.exists(path):
+            log.info(f"Reading the records of {filename} from the cache ({path})")
+            yield from self._read(source, path)
+        else:
+            yield from self._write(source, path, parse())
+
+    @staticmethod
+    def _read(source, path: str) -> Generator:
+        with open(path, "rb") as FH:
+            while True:
+                try:
+                    item = pickle.load(FH)
+                except EOFError:
+                    break
+                if isinstance(item, dict):
+                    # the state of the Source, last in the file
+                    source.node_properties.update(item["node_properties"])
+                    source.edge_properties.update(item["edge_properties"])
+                    if source.infores_context:
+                        source.infores_context.catalog.update(item["infores_catalog"])
+                else:
+                    yield from item
+
+    def _write(self, source, path: str, records: Generator) -> Generator:
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        complete = False
+        try:
+            with os.fdopen(fd, "wb") as FH:
+                while True:
+                    batch = list(islice(records, BATCH_SIZE))
+                    if not batch:
+                        break
+                    batch = [rec for rec in batch if rec]
+                    pickle.dump(batch, FH, protocol=pickle.HIGHEST_PROTOCOL)
+                    yield from batch
+                state = {
+                    "node_properties": source.node_properties,
+                    "edge_properties": source.edge_properties,
+                    "infores_catalog": source.get_infores_catalog(),
+                }
+                pickle.dump(state, FH, protocol=pickle.HIGHEST_PROTOCOL)
+            # only the records of a complete parse are cached
+            os.replace(tmp, path)
+            complete = True
+        finally:
+            if not complete and os.path.exists(tmp):
+                os.remove(tmp)
+
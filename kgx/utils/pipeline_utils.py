@@ -0,0 +1,96 @@
+"""
+Pipelining of the reading of graph records with their processing.
+"""
+import queue
+import threading
+from typing import Generator, Iterable, Iterator
+
+# number of records handed over from the background thread at a time
+DEFAULT_BATCH_SIZE = 1000
+
+
+def read_ahead(
+    records: Iterable,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    queue_size: int = 16,
+) -> Generator:
+    """
+    Iterate over records on a background thread, yielding them, in order,
+    on the calling thread. The parsing of the records by a Source then
+    overlaps with whatever is done with them, e.g. the (blocking) writes of
+    a Sink to a file, a compressor or a database connection.
+
+    The records are handed over in batches, the background thread staying
+    at most ``queue_size`` batches ahead (back-pressure). An exception
+    raised while iterating over the records is raised, in turn, by this
+    generator. Closing this generator stops the background thread.
+
+    Parameters
+    ----------
+    records: Iterable
+        The records, e.g. a generator from a Source
+    batch_size: int
+        Number of records handed over at a time
+    queue_size: int
+        Maximum number of batches of records read ahead
+
+    Returns
+    -------
+    Generator
+        A generator for the records
+
+    """
+    batches: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    iterator = iter(records)
+    thread = threading.Thread(
+        target=_run, args=(iterator, batch_size, batches, stop), daemon=True
+    )
+    thread.start()
+    try:
+        while True:
+            batch = batches.get()
+            if batch is None:
+                break
+            if isinstance(batch, BaseException):
+                raise batch
+            yield from batch
+    finally:
+        stop.set()
+        thread.join()
+        if hasattr(iterator, "close"):
+            # e.g. closes the files of an abandoned Source generator
+            iterator.close()
+
+
+def _run(
+    records: Iterator,
+    batch_size: int,
+    batches: queue.Queue,
+    stop: threading.Event,
+) -> None:
+    try:
+        batch = list()
+        for rec in records:
+            batch.append(rec)
+            if len(batch) >= batch_size:
+                if not _put(batches, stop, batch):
+                    return
+                batch = list()
+        if batch and not _put(batches, stop, batch):
+            return
+        _put(batches, stop, None)
+    except BaseException as e:
+        # raised, in turn, on the calling thread, which would otherwise wait
+        # forever for the end of the records (e.g. on a KeyboardInterrupt)
+        _put(batches, stop, e)
+
+
+def _put(batches: queue.Queue, stop: threading.Event, item) -> bool:
+    while not stop.is_set():
+        try:
+            batches.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
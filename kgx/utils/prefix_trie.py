@@ -0,0 +1,143 @@
+"""
+Compiled prefix maps, for the contraction of IRIs to CURIEs and the expansion
+of CURIEs to IRIs without a scan over every one of the prefixes of a map.
+"""
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from kgx.config import get_jsonld_context
+
+# key of the (namespace, prefixes) of the trie node ending a namespace;
+# never the key of a child, which is a single character
+_END = ""
+
+
+class PrefixTrie(object):
+    """
+    A character trie of the namespaces of one or more prefix maps.
+
+    Contracting an IRI walks the trie along the IRI, collecting every namespace
+    which the IRI starts with, in a single pass over the characters of the IRI,
+    whatever the number of prefixes. Of the CURIEs of these namespaces, the
+    shortest is the contraction, as with ``prefixcommons.curie_util.contract_uri``,
+    CURIEs of the same length being told apart by the longest namespace, then
+    by lexical order.
+
+    Expanding a CURIE is a lookup of its prefix, the prefix maps taking precedence
+    in the order given, as with ``prefixcommons.curie_util.expand_uri``.
+
+    Parameters
+    ----------
+    prefix_maps: Iterable[Dict[str, str]]
+        Prefix to IRI maps
+
+    """
+
+    def __init__(self, prefix_maps: Iterable[Dict[str, str]]):
+        self.expansions: Dict[str, str] = dict()
+        self._root: Dict = dict()
+        for prefix_map in prefix_maps:
+            for prefix, namespace in prefix_map.items():
+                if not isinstance(namespace, str):
+                    continue
+                self.expansions.setdefault(prefix, namespace)
+                if namespace:
+                    self._add(prefix, namespace)
+
+    def _add(self, prefix: str, namespace: str) -> None:
+        node = self._root
+        for c in namespace:
+            child = node.get(c)
+            if child is None:
+                child = node[c] = dict()
+            node = child
+        if _END in node:
+            node[_END] = (namespace, tuple(sorted({*node[_END][1], prefix})))
+        else:
+            node[_END] = (namespace, (prefix,))
+
+    def matches(self, iri: str) -> List[Tuple[str, Tuple[str, ...]]]:
+        """
+        Get the namespaces which an IRI starts with.
+
+        Parameters
+        ----------
+        iri: str
+            An IRI
+
+        Returns
+        -------
+        List[Tuple[str, Tuple[str, ...]]]
+            The namespaces (shortest first), each with its prefixes
+
+        """
+        matches = list()
+        node = self._root
+        for c in iri:
+            node = node.get(c)
+            if node is None:
+                break
+            if _END in node:
+                matches.append(node[_END])
+        return matches
+
+    def contract(self, iri: str) -> Optional[str]:
+        """
+        Contract an IRI to a CURIE.
+
+        Parameters
+        ----------
+        iri: str
+            An IRI
+
+        Returns
+        -------
+        Optional[str]
+            The CURIE, or None if the IRI starts with none of the namespaces
+
+        """
+        best = None
+        for namespace, prefixes in self.matches(iri):
+            for prefix in prefixes:
+                c = iri.replace(namespace, f"{prefix}:")
+                key = (len(c), -len(namespace), c)
+                if best is None or key < best:
+                    best = key
+        return best[2] if best else None
+
+    def expand(self, curie: str) -> Optional[str]:
+        """
+        Expand a CURIE to an IRI.
+
+        Parameters
+        ----------
+        curie: str
+            A CURIE
+
+        Returns
+        -------
+        Optional[str]
+            The IRI, or None if the prefix of the CURIE is in none of the prefix maps
+
+        """
+        prefix, sep, reference = curie.partition(":")
+        if not sep or prefix not in self.expansions:
+            return None
+        return self.expansions[prefix] + reference
+
+
+@lru_cache(maxsize=1)
+def get_default_prefix_trie() -> PrefixTrie:
+    """
+    Get the PrefixTrie of the default prefix maps (the Monarch and OBO JSON-LD
+    contexts) to which a PrefixManager falls back, compiled once.
+
+    Returns
+    -------
+    PrefixTrie
+        The PrefixTrie of the default prefix maps
+
+    """
+    return PrefixTrie(
+        [get_jsonld_context("monarch_context"), get_jsonld_context("obo_context")]
+    )
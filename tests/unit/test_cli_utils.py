@@ -5,9 +5,10 @@ import csv
 import json
 import os
 import pytest
+import yaml
 from click.testing import CliRunner
 from pprint import pprint
-from kgx.cli.cli_utils import validate, neo4j_upload, neo4j_download, merge, get_output_file_types
+from kgx.cli.cli_utils import validate, neo4j_upload, neo4j_download, merge, get_output_file_types, inspect_graph
 from kgx.cli import cli, get_input_file_types, graph_summary, get_report_format_types, transform
 from tests import RESOURCE_DIR, TARGET_DIR
 from tests.unit import (
@@ -309,6 +310,147 @@ def test_kgx_graph_summary():
     assert "biolink:interacts_with" in summary_stats["edge_stats"]["predicates"]
 
 
+@pytest.mark.parametrize("report_type", ["kgx-map", "meta-knowledge-graph"])
+def test_graph_summary_processes(report_type):
+    """
+    Test graph summary of input files summarized in parallel.
+    """
+    inputs = [
+        os.path.join(RESOURCE_DIR, "graph_nodes.tsv"),
+        os.path.join(RESOURCE_DIR, "graph_edges.tsv"),
+    ]
+    output = os.path.join(TARGET_DIR, "graph_stats_parallel.json")
+    summary_args = {
+        "input_format": "tsv",
+        "input_compression": None,
+        "output": output,
+        "report_type": report_type,
+        "report_format": "json",
+        "node_facet_properties": ["provided_by"],
+        "edge_facet_properties": ["aggregator_knowledge_source"],
+    }
+    summary_stats = graph_summary(inputs, **summary_args)
+    parallel_summary_stats = graph_summary(inputs, processes=2, **summary_args)
+
+    assert os.path.exists(output)
+    if report_type == "kgx-map":
+        assert (
+            parallel_summary_stats["edge_stats"] == summary_stats["edge_stats"]
+        )
+        assert parallel_summary_stats["node_stats"]["total_nodes"] == 512
+        assert (
+            parallel_summary_stats["node_stats"]["count_by_category"]
+            == summary_stats["node_stats"]["count_by_category"]
+        )
+    else:
+        assert parallel_summary_stats["nodes"] == summary_stats["nodes"]
+        assert len(parallel_summary_stats["edges"]) == 13
+        assert sum(e["count"] for e in parallel_summary_stats["edges"]) == sum(
+            e["count"] for e in summary_stats["edges"]
+        )
+
+
+@pytest.mark.parametrize("report_type", ["kgx-map", "meta-knowledge-graph"])
+def test_graph_summary_processes_duplicate_nodes(report_type, tmp_path):
+    """
+    Test graph summary of input files summarized in parallel,
+    where duplicate nodes are split across the node files.
+    """
+    with open(os.path.join(RESOURCE_DIR, "graph_nodes.tsv")) as f:
+        header, *lines = f.readlines()
+    inputs = []
+    for i in range(2):
+        filename = str(tmp_path / f"part{i}_nodes.tsv")
+        with open(filename, "w") as f:
+            f.writelines([header] + lines[i::2])
+        inputs.append(filename)
+    inputs.append(os.path.join(RESOURCE_DIR, "graph_edges.tsv"))
+    summary_args = {
+        "input_format": "tsv",
+        "input_compression": None,
+        "output": str(tmp_path / "graph_stats.json"),
+        "report_type": report_type,
+        "report_format": "json",
+        "node_facet_properties": ["provided_by"],
+    }
+    summary_stats = graph_summary(inputs, **summary_args)
+    parallel_summary_stats = graph_summary(
+        inputs,
+        processes=2,
+        node_catalog_directory=str(tmp_path),
+        **summary_args,
+    )
+
+    if report_type == "kgx-map":
+        node_stats = parallel_summary_stats["node_stats"]
+        assert node_stats["total_nodes"] == 512
+        for stat in ["count_by_category", "count_by_id_prefixes"]:
+            assert node_stats[stat] == summary_stats["node_stats"][stat]
+    else:
+        assert parallel_summary_stats["nodes"] == summary_stats["nodes"]
+
+
+@pytest.mark.parametrize("inspector_workers", [None, "thread", "process"])
+def test_inspect_graph(inspector_workers):
+    """
+    Test validation and graph summaries generated in a single pass.
+    """
+    inputs = [
+        os.path.join(RESOURCE_DIR, "graph_nodes.tsv"),
+        os.path.join(RESOURCE_DIR, "graph_edges.tsv"),
+    ]
+    outputs = {
+        "validation_output": os.path.join(TARGET_DIR, "inspect_validation.json"),
+        "graph_summary_output": os.path.join(TARGET_DIR, "inspect_graph_stats.yaml"),
+        "meta_knowledge_graph_output": os.path.join(TARGET_DIR, "inspect_mkg.json"),
+    }
+    results = inspect_graph(
+        inputs, "tsv", None, inspector_workers=inspector_workers, **outputs
+    )
+    for output in outputs.values():
+        assert os.path.exists(output)
+
+    summary_stats = graph_summary(
+        inputs, "tsv", None, os.path.join(TARGET_DIR, "graph_stats.yaml"), "kgx-map"
+    )
+    mkg_stats = graph_summary(
+        inputs, "tsv", None, os.path.join(TARGET_DIR, "mkg.json"), "meta-knowledge-graph"
+    )
+    errors = validate(inputs, "tsv", None, os.path.join(TARGET_DIR, "validation.json"))
+    assert results["graph_summary"] == summary_stats
+    assert results["meta_knowledge_graph"] == mkg_stats
+    assert results["validation"] == errors
+
+
+def test_inspect_graph_error_log(tmp_path):
+    """
+    Test that the reports of both graph summaries are written to the error log.
+    """
+    inputs = [
+        os.path.join(RESOURCE_DIR, "graph_nodes.tsv"),
+        os.path.join(RESOURCE_DIR, "graph_edges.tsv"),
+    ]
+    error_log = str(tmp_path / "errors.json")
+    inspect_graph(
+        inputs,
+        "tsv",
+        None,
+        graph_summary_output=str(tmp_path / "graph_stats.yaml"),
+        meta_knowledge_graph_output=str(tmp_path / "mkg.json"),
+        error_log=error_log,
+    )
+    with open(error_log) as f:
+        content = f.read()
+    decoder = json.JSONDecoder()
+    reports = []
+    position = 0
+    while content[position:].strip():
+        position += len(content[position:]) - len(content[position:].lstrip())
+        report, position = decoder.raw_decode(content, position)
+        reports.append(report)
+    assert len(reports) == 2
+
+
 def test_chebi_tsv_to_tsv_transform():
 
     inputs = [
@@ -867,6 +1009,116 @@ def test_transform2():
     assert os.path.exists(os.path.join(RESOURCE_DIR, "graph_edges.tsv"))
 
 
+@pytest.mark.parametrize(
+    "input_format,input_compression,filenames",
+    [
+        ("tsv", None, ["graph_nodes.tsv", "graph_edges.tsv"]),
+        ("tsv", "tar.gz", ["test.tar.gz"]),
+        ("jsonl", None, ["valid_nodes.jsonl", "valid_edges.jsonl"]),
+    ],
+)
+def test_transform_config_processes(input_format, input_compression, filenames, tmp_path):
+    """
+    Transform from a transform YAML whose source is read with several processes,
+    within (daemonic) worker processes of the transform, which read it serially.
+    """
+    transform_config = tmp_path / "transform.yaml"
+    with open(transform_config, "w") as f:
+        yaml.dump(
+            {
+                "configuration": {"output_directory": str(tmp_path), "checkpoint": False},
+                "transform": {
+                    "source": {
+                        "test_graph": {
+                            "name": "Test Graph",
+                            "input": {
+                                "format": input_format,
+                                "compression": input_compression,
+                                "filename": [os.path.join(RESOURCE_DIR, f) for f in filenames],
+                                "processes": 2,
+                            },
+                            "output": {"format": "jsonl", "filename": ["graph"]},
+                        }
+                    }
+                },
+            },
+            f,
+        )
+    transform(inputs=None, transform_config=str(transform_config))
+
+    # as read with a single process
+    output = str(tmp_path / "serial")
+    transform(
+        inputs=[os.path.join(RESOURCE_DIR, f) for f in filenames],
+        input_format=input_format,
+        input_compression=input_compression,
+        output=output,
+        output_format="jsonl",
+    )
+    def read_records(filename):
+        with open(filename) as f:
+            records = [json.loads(line) for line in f]
+        # edges without an id are given a (random) uuid
+        return sorted(
+            json.dumps({k: v for k, v in r.items() if k != "id" or "subject" not in r})
+            for r in records
+        )
+
+    for entity in ["nodes", "edges"]:
+        assert read_records(tmp_path / f"graph_{entity}.jsonl") == read_records(
+            f"{output}_{entity}.jsonl"
+        )
+
+
+def test_transform_discover_properties(tmp_path):
+    """
+    Stream a transform to TSV, discovering its columns, from the
+    command line arguments and from a transform YAML, which yields
+    the same columns as a transform building the graph in memory.
+    """
+    inputs = [
+        os.path.join(RESOURCE_DIR, "graph_nodes.tsv"),
+        os.path.join(RESOURCE_DIR, "graph_edges.tsv"),
+    ]
+    transform(inputs, input_format="tsv", output=str(tmp_path / "graph"), output_format="tsv")
+    transform(
+        inputs,
+        input_format="tsv",
+        output=str(tmp_path / "streamed"),
+        output_format="tsv",
+        stream=True,
+        discover_properties=True,
+    )
+    transform_config = tmp_path / "transform.yaml"
+    with open(transform_config, "w") as f:
+        yaml.dump(
+            {
+                "configuration": {"output_directory": str(tmp_path), "checkpoint": False},
+                "transform": {
+                    "source": {
+                        "test_graph": {
+                            "input": {"format": "tsv", "filename": inputs},
+                            "output": {
+                                "format": "tsv",
+                                "filename": ["configured"],
+                                "discover_properties": True,
+                            },
+                        }
+                    }
+                },
+            },
+            f,
+        )
+    transform(inputs=None, transform_config=str(transform_config), stream=True)
+
+    for entity in ["nodes", "edges"]:
+        headers = []
+        for name in ["graph", "streamed", "configured"]:
+            with open(tmp_path / f"{name}_{entity}.tsv") as f:
+                headers.append(f.readline())
+        assert headers[0] == headers[1] == headers[2]
+
+
 def test_transform_rdf_to_tsv():
     """
     Transform from a test transform YAML.
@@ -0,0 +1,121 @@
+import bz2
+import gzip
+import io
+import os
+import tarfile
+
+import pytest
+
+from kgx.utils.compression_utils import (
+    BackgroundReader,
+    BlockCompressedWriter,
+    open_compressed_reader,
+    open_compressed_writer,
+    write_tar_archive,
+)
+from tests import TARGET_DIR
+
+DECOMPRESS = {None: bytes, "gz": gzip.decompress, "bz2": bz2.decompress}
+
+
+@pytest.mark.parametrize("compression", [None, "gz", "bz2"])
+@pytest.mark.parametrize("threads", [0, 3])
+def test_block_compressed_writer(compression, threads):
+    filename = os.path.join(TARGET_DIR, f"test_block_compressed_writer_{threads}")
+    data = b"".join(f"line {i}\n".encode() for i in range(10000))
+    writer = BlockCompressedWriter(
+        open(filename, "wb"), compression, threads=threads, block_size=1000
+    )
+    for i in range(0, len(data), 777):
+        writer.write(data[i:i + 777])
+    writer.close()
+    assert writer.size == len(data)
+    with open(filename, "rb") as FH:
+        assert DECOMPRESS[compression](FH.read()) == data
+
+
+def test_open_compressed_writer():
+    filename = os.path.join(TARGET_DIR, "test_open_compressed_writer.tsv.gz")
+    with open_compressed_writer(filename, "gz") as FH:
+        FH.write("id\tname\n")
+        FH.write("CURIE:1\tsürname\n")
+    with gzip.open(filename, "rt", encoding="utf-8") as FH:
+        assert FH.read() == "id\tname\nCURIE:1\tsürname\n"
+
+
+@pytest.mark.parametrize("compression,mode", [(None, "r"), ("gz", "r:gz"), ("bz2", "r:bz2")])
+def test_write_tar_archive(compression, mode):
+    members = []
+    for name, data in [("a.tsv", b"a" * 513), ("b.tsv", b"b\n" * 10000)]:
+        path = os.path.join(TARGET_DIR, f"test_write_tar_archive_{name}")
+        writer = BlockCompressedWriter(open(path, "wb"), compression, block_size=4096)
+        writer.write(data)
+        writer.close()
+        members.append((name, path, writer.size))
+    filename = os.path.join(TARGET_DIR, "test_write_tar_archive.tar")
+    write_tar_archive(filename, members, compression)
+    with tarfile.open(filename, mode) as tar:
+        assert tar.getnames() == ["a.tsv", "b.tsv"]
+        assert tar.extractfile("a.tsv").read() == b"a" * 513
+        assert tar.extractfile("b.tsv").read() == b"b\n" * 10000
+
+
+@pytest.mark.parametrize("compression", [None, "gz", "bz2"])
+def test_open_compressed_reader(compression):
+    filename = os.path.join(TARGET_DIR, "test_open_compressed_reader")
+    data = b"".join(f"line {i}\n".encode() for i in range(10000))
+    writer = BlockCompressedWriter(open(filename, "wb"), compression, block_size=1000)
+    writer.write(data)
+    writer.close()
+    with open_compressed_reader(filename, compression) as FH:
+        assert FH.read() == data
+    with open_compressed_reader(filename, compression, mode="rt") as FH:
+        assert FH.readline() == "line 0\n"
+        assert sum(1 for _ in FH) == 9999
+
+
+def test_background_reader_seek():
+    data = bytes(range(256)) * 100
+    reader = BackgroundReader(lambda: io.BytesIO(data), block_size=1000, queue_size=2)
+    assert reader.read(10) == data[:10]
+    assert reader.seek(5000) == 5000
+    assert reader.read(10) == data[5000:5010]
+    assert reader.seek(-10, io.SEEK_CUR) == 5000
+    assert reader.seek(100) == 100
+    assert reader.read(10) == data[100:110]
+    assert reader.seek(0, io.SEEK_END) == len(data)
+    assert reader.read(10) == b""
+    reader.close()
+    assert not reader._thread.is_alive()
+
+
+@pytest.mark.parametrize("compression,package", [("zst", "zstandard"), ("lz4", "lz4.frame")])
+def test_compressed_round_trip(compression, package):
+    module = pytest.importorskip(package)
+    filename = os.path.join(TARGET_DIR, f"test_compressed_round_trip.tsv.{compression}")
+    with open_compressed_writer(filename, compression) as FH:
+        for i in range(10000):
+            FH.write(f"CURIE:{i}\tsürname {i}\n")
+    expected = "".join(f"CURIE:{i}\tsürname {i}\n" for i in range(10000))
+    with open(filename, "rb") as FH:
+        data = FH.read()
+    if compression == "zst":
+        data = module.ZstdDecompressor().decompress(data)
+    else:
+        data = module.decompress(data)
+    assert data.decode("utf-8") == expected
+    with open_compressed_reader(filename, compression, mode="rt") as FH:
+        assert FH.read() == expected
+
+
+def test_background_reader_error():
+    class FailingReader(io.BytesIO):
+        def read(self, size=-1):
+            raise OSError("corrupt")
+
+    with pytest.raises(FileNotFoundError):
+        open_compressed_reader(os.path.join(TARGET_DIR, "missing.gz"), "gz")
+    reader = BackgroundReader(lambda: FailingReader(b"data"))
+    with pytest.raises(OSError, match="corrupt"):
+        reader.read()
+    reader.close()
@@ -303,6 +303,18 @@ def test_remap_node_identifier_alias():
     assert e2["edge_key"] == "Z-biolink:subclass_of-A"
 
 
+def test_remap_node_identifier_no_category():
+    """
+    Test remap node identifier operation without a category,
+    which leaves every node with a category as is.
+    """
+    graphs = get_graphs2()
+    g = remap_node_identifier(graphs[1], None, alternative_property="xref")
+    assert g.has_node("A")
+    assert g.has_node("B")
+    assert g.has_node("C")
+
+
 def test_remap_node_identifier_xref():
     """
     Test remap node identifier operation.
@@ -0,0 +1,177 @@
+import os
+import tempfile
+
+import pytest
+
+from kgx.transformer import Transformer
+from kgx.utils import identifier_map
+from kgx.utils.identifier_map import (
+    IdentifierMap,
+    remap_node_identifiers,
+    select_alternative_identifier,
+)
+from tests import RESOURCE_DIR, TARGET_DIR
+
+
+def test_identifier_map():
+    """
+    Test adding and looking up mappings in an IdentifierMap.
+    """
+    with IdentifierMap(batch_size=2) as m:
+        m.add("A", "X:1")
+        assert m.get("A") == "X:1"
+        m.update([("B", "X:2"), ("C", "X:3")])
+        assert len(m) == 3
+        assert "B" in m
+        assert "D" not in m
+        assert m.get("D", "D") == "D"
+        m.add("A", "X:4")
+        assert m.get("A") == "X:4"
+        assert len(m) == 3
+        filename = m.filename
+    assert not os.path.exists(filename)
+
+
+def test_identifier_map_persistent():
+    """
+    Test an IdentifierMap backed by a named database file.
+    """
+    filename = os.path.join(TARGET_DIR, "test_identifier_map.db")
+    if os.path.exists(filename):
+        os.remove(filename)
+    with IdentifierMap(filename=filename) as m:
+        m.add("A", "X:1")
+    assert os.path.exists(filename)
+    with IdentifierMap(filename=filename) as m:
+        assert len(m) == 1
+        assert m.get("A") == "X:1"
+
+
+def test_identifier_map_load_tsv():
+    """
+    Test loading an IdentifierMap from a TSV.
+    """
+    with IdentifierMap() as m:
+        m.load_tsv(os.path.join(RESOURCE_DIR, "node_identifier_mapping.tsv"))
+        assert len(m) == 2
+        assert m.get("CURIE:123") == "HGNC:123"
+        assert m.get("CURIE:456") == "MONDO:456"
+
+
+def test_identifier_map_load_sssom():
+    """
+    Test loading an IdentifierMap from an SSSOM TSV.
+    """
+    with IdentifierMap() as m:
+        m.load_sssom(os.path.join(RESOURCE_DIR, "sssom_example1.tsv"))
+        assert len(m) == 0
+        m.load_sssom(
+            os.path.join(RESOURCE_DIR, "sssom_example1.tsv"),
+            predicates={"owl:equivalentClass"},
+        )
+        assert m.get("MP:0012051") == "HP:0001257"
+
+
+def test_select_alternative_identifier():
+    """
+    Test selecting the alternative identifier of a node.
+    """
+    node = {"id": "A", "category": ["biolink:Gene"], "xref": ["UniProtKB:1", "NCBIGene:1"]}
+    assert select_alternative_identifier(node, "biolink:Gene", "xref") == "UniProtKB:1"
+    assert select_alternative_identifier(node, "biolink:Gene", "xref", "NCBIGene") == "NCBIGene:1"
+    assert select_alternative_identifier(node, "biolink:Disease", "xref") is None
+    assert select_alternative_identifier(node, "biolink:Gene", "alias") is None
+    assert select_alternative_identifier(node, None, "xref") == "UniProtKB:1"
+    assert select_alternative_identifier({"id": "A", "xref": []}, None, "xref") is None
+
+
+def test_remap_node_identifiers():
+    """
+    Test remapping node identifiers of a stream of records.
+    """
+    records = [
+        ("A", {"id": "A", "category": ["biolink:Gene"], "alias": "NCBIGene:1"}),
+        ("B", {"id": "B", "category": ["biolink:Disease"], "alias": "MONDO:1"}),
+        ("C", {"id": "C", "category": ["biolink:Gene"]}),
+        ("A", "B", "A-biolink:related_to-B", {"subject": "A", "predicate": "biolink:related_to", "object": "B"}),
+        ("C", "A", "C-biolink:related_to-A", {"subject": "C", "predicate": "biolink:related_to", "object": "A"}),
+        ("C", "B", "C-biolink:related_to-B", {"subject": "C", "predicate": "biolink:related_to", "object": "B"}),
+    ]
+    with IdentifierMap() as m:
+        m.add("C", "HGNC:3")
+        remapped = list(
+            remap_node_identifiers(
+                records, m, category="biolink:Gene", alternative_property="alias"
+            )
+        )
+    assert [r[0] for r in remapped[:3]] == ["NCBIGene:1", "B", "HGNC:3"]
+    assert remapped[0][1]["id"] == "NCBIGene:1"
+    assert remapped[3][:3] == ("NCBIGene:1", "B", "NCBIGene:1-biolink:related_to-B")
+    assert remapped[3][3]["subject"] == "NCBIGene:1"
+    assert remapped[4][:3] == ("HGNC:3", "NCBIGene:1", "HGNC:3-biolink:related_to-NCBIGene:1")
+    assert remapped[5][3]["subject"] == "HGNC:3" and remapped[5][3]["object"] == "B"
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_transform_remap_node_identifier(pipelined):
+    """
+    Test remapping node identifiers from a mapping file while streaming
+    a transform, perhaps reading (and remapping) on another thread.
+    """
+    input_args = {
+        "filename": [
+            os.path.join(RESOURCE_DIR, "test_nodes.tsv"),
+            os.path.join(RESOURCE_DIR, "test_edges.tsv"),
+        ],
+        "format": "tsv",
+        "remap_node_identifier": {
+            "filename": os.path.join(RESOURCE_DIR, "node_identifier_mapping.tsv"),
+            "format": "tsv",
+        },
+    }
+    t = Transformer(stream=True, pipelined=pipelined)
+    t.transform(input_args)
+    graph = t.store.graph
+    assert graph.has_node("HGNC:123")
+    assert graph.has_node("MONDO:456")
+    assert not graph.has_node("CURIE:123")
+    assert graph.has_edge("HGNC:123", "MONDO:456")
+
+
+def test_remap_node_identifiers_edges_first(monkeypatch):
+    """
+    Test that the edges of nodes streamed after them are left unmapped, with a warning.
+    """
+    records = [
+        ("A", "B", "A-biolink:related_to-B", {"subject": "A", "predicate": "biolink:related_to", "object": "B"}),
+        ("A", {"id": "A", "category": ["biolink:Gene"], "alias": "NCBIGene:1"}),
+        ("B", {"id": "B", "category": ["biolink:Gene"]}),
+    ]
+    warnings = []
+    monkeypatch.setattr(identifier_map.log, "warning", warnings.append)
+    with IdentifierMap() as m:
+        remapped = list(
+            remap_node_identifiers(records, m, alternative_property="alias")
+        )
+    assert remapped[0][:2] == ("A", "B")
+    assert remapped[1][0] == "NCBIGene:1"
+    assert len(warnings) == 1 and "'A'" in warnings[0]
+
+
+def test_transform_remap_node_identifier_failure(monkeypatch, tmp_path):
+    """
+    Test that the temporary identifier map is removed when a transform fails.
+    """
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    input_args = {
+        "filename": [os.path.join(RESOURCE_DIR, "missing_nodes.tsv")],
+        "format": "tsv",
+        "remap_node_identifier": {
+            "filename": os.path.join(RESOURCE_DIR, "node_identifier_mapping.tsv"),
+            "format": "tsv",
+        },
+    }
+    t = Transformer(stream=True)
+    with pytest.raises(FileNotFoundError):
+        t.transform(input_args)
+    assert not list(tmp_path.glob("kgx-idmap-*.db"))
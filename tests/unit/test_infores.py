@@ -0,0 +1,61 @@
+import pytest
+
+from kgx.utils.infores import InfoResContext
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        (
+            {"aggregator_knowledge_source": True},
+            ["Gene Ontology (Monarch version 202012)", "infores:flybase"],
+            ["infores:gene-ontology-monarch-version-202012", "infores:flybase"],
+        ),
+        (
+            {"aggregator_knowledge_source": (r"\(.+\)", "", "monarch")},
+            ["Gene Ontology (Monarch version 202012)"],
+            ["infores:monarch-gene-ontology"],
+        ),
+        (
+            {"aggregator_knowledge_source": {"Gene Ontology.*": (r"\(.+\)",)}},
+            ["Gene Ontology (Monarch version 202012)"],
+            ["infores:gene-ontology"],
+        ),
+    ],
+)
+def test_set_edge_provenance(query):
+    """
+    Test rewriting the knowledge sources of edges, the same
+    when rewritten once again from the memo of the rewrites.
+    """
+    context = InfoResContext()
+    context.set_provenance_map(query[0])
+    records = [{"aggregator_knowledge_source": list(query[1])} for _ in range(3)]
+    for record in records:
+        context.set_edge_provenance(record)
+        assert record["aggregator_knowledge_source"] == query[2]
+    # every record has a list of its own
+    records[0]["aggregator_knowledge_source"].append("infores:x")
+    assert records[1]["aggregator_knowledge_source"] == query[2]
+    assert len(context._memo["aggregator_knowledge_source"]) > 0
+
+
+def test_set_edge_provenance_callable():
+    """
+    Test rewriting the knowledge sources of edges with a Callable,
+    which is called for every edge.
+    """
+    calls = []
+
+    def rewrite(sources=None):
+        calls.append(sources)
+        return ["infores:rewritten"]
+
+    context = InfoResContext()
+    context.set_provenance_map({"primary_knowledge_source": rewrite})
+    for _ in range(3):
+        record = {"primary_knowledge_source": "source"}
+        context.set_edge_provenance(record)
+        assert record["primary_knowledge_source"] == ["infores:rewritten"]
+    assert "primary_knowledge_source" not in context._memo
+    assert len(calls) == 6
@@ -0,0 +1,127 @@
+import io
+import os
+import pickle
+
+import pytest
+
+from kgx.error_detection import ErrorDetecting, ErrorType
+from kgx.utils.inspector_fanout import InspectorFanOut
+from kgx.transformer import Transformer
+from kgx.utils.kgx_utils import GraphEntityType
+from tests import TARGET_DIR
+
+
+class CountingInspector(object):
+    def __init__(self, fail_on=None):
+        self.nodes = 0
+        self.edges = 0
+        self.fail_on = fail_on
+
+    def __call__(self, entity_type: GraphEntityType, rec):
+        if rec[0] == self.fail_on:
+            raise ValueError(f"Failed on {rec[0]}")
+        if entity_type == GraphEntityType.EDGE:
+            self.edges += 1
+        else:
+            self.nodes += 1
+
+
+def records():
+    for i in range(25):
+        yield GraphEntityType.NODE, (f"CURIE:{i}", {"id": f"CURIE:{i}"})
+    for i in range(24):
+        yield GraphEntityType.EDGE, (f"CURIE:{i}", f"CURIE:{i + 1}", f"e{i}", {})
+
+
+@pytest.mark.parametrize("workers", [None, "thread", "process"])
+def test_inspector_fanout(workers):
+    inspectors = [CountingInspector(), CountingInspector()]
+    fanout = InspectorFanOut(inspectors, workers=workers, queue_size=2, batch_size=4)
+    for entity_type, rec in records():
+        fanout(entity_type, rec)
+    fanout.close()
+    for inspector in inspectors:
+        assert inspector.nodes == 25
+        assert inspector.edges == 24
+
+
+@pytest.mark.parametrize("workers", ["thread", "process"])
+def test_inspector_fanout_error(workers):
+    inspectors = [CountingInspector(), CountingInspector(fail_on="CURIE:7")]
+    fanout = InspectorFanOut(inspectors, workers=workers, queue_size=2, batch_size=4)
+    with pytest.raises(RuntimeError):
+        for entity_type, rec in records():
+            fanout(entity_type, rec)
+        fanout.close()
+    fanout.close()
+
+
+class RecordingInspector(object):
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, entity_type: GraphEntityType, rec):
+        self.records.append(rec)
+
+
+@pytest.mark.parametrize("workers", ["thread", "process"])
+def test_inspector_fanout_record_copies(workers):
+    """
+    Test that the workers are not affected by changes made to
+    the records (e.g. by a sink) after they were dispatched.
+    """
+    inspector = RecordingInspector()
+    fanout = InspectorFanOut([inspector], workers=workers, batch_size=4)
+    for entity_type, rec in records():
+        fanout(entity_type, rec)
+        rec[-1]["_key"] = "changed"
+    fanout.close()
+    assert len(inspector.records) == 49
+    assert all("_key" not in rec[-1] for rec in inspector.records)
+
+
+def test_inspector_fanout_workers():
+    with pytest.raises(ValueError):
+        InspectorFanOut([CountingInspector()], workers="fiber")
+
+
+class ErrorLoggingInspector(ErrorDetecting):
+    def __init__(self, error_log):
+        ErrorDetecting.__init__(self, error_log)
+
+    def __call__(self, entity_type: GraphEntityType, rec):
+        if entity_type == GraphEntityType.NODE:
+            self.log_error(rec[0], ErrorType.MISSING_CATEGORY, "Missing node 'category'")
+
+
+@pytest.mark.parametrize("workers", [None, "thread", "process"])
+def test_inspector_fanout_error_log(workers):
+    error_log = io.StringIO()
+    inspector = ErrorLoggingInspector(error_log)
+    fanout = InspectorFanOut([inspector], workers=workers, queue_size=2, batch_size=4)
+    for entity_type, rec in records():
+        fanout(entity_type, rec)
+    fanout.close()
+    # the error log stays with the inspector
+    assert inspector.error_log is error_log
+    assert "MISSING_CATEGORY" in inspector.get_errors("Error")
+    # ...and is not carried over to copies, which may still write reports
+    copy = pickle.loads(pickle.dumps(inspector))
+    assert copy.error_log is None
+    copy.write_report(io.StringIO())
+
+
+@pytest.mark.parametrize("workers", ["thread", "process"])
+def test_transform_inspector_fanout_failure(workers):
+    """
+    Test that the inspector workers of a failed transform are closed.
+    """
+    transformer = Transformer(stream=True)
+    with pytest.raises(FileNotFoundError):
+        transformer.transform(
+            input_args={"filename": [os.path.join(TARGET_DIR, "missing_nodes.tsv")], "format": "tsv"},
+            output_args={"format": "null"},
+            inspector=[CountingInspector(), CountingInspector()],
+            inspector_workers=workers,
+        )
+    assert not transformer.inspector._workers
@@ -0,0 +1,57 @@
+import io
+
+import pytest
+
+from kgx.utils import jsonl_utils
+from kgx.utils.jsonl_utils import JsonlWriter, dumps, loads, read_jsonl, read_jsonl_blocks
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 1 << 20])
+def test_read_jsonl(block_size):
+    data = b'{"id": "A:1", "name": "\xc3\xa9"}\n\n{"id": "A:2", "score": 1.5}\n{"id": "A:3"}'
+    records = list(read_jsonl(io.BytesIO(data), block_size=block_size))
+    assert records == [
+        {"id": "A:1", "name": "é"},
+        {"id": "A:2", "score": 1.5},
+        {"id": "A:3"},
+    ]
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 1 << 20])
+def test_read_jsonl_blocks(block_size):
+    data = b'{"id": "A:1"}\n\n{"id": "A:2", "score": 1.5}\n{"id": "A:3"}'
+    blocks = list(read_jsonl_blocks(io.BytesIO(data), block_size=block_size))
+    assert b"".join(blocks) == data
+    assert all(block.endswith(b"\n") for block in blocks[:-1])
+
+
+def test_dumps_loads():
+    record = {"id": "A:1", "xref": ["B:1", "B:2"], "count": 2 ** 70}
+    line = dumps(record)
+    assert b"\n" not in line
+    assert loads(line) == record
+
+
+@pytest.mark.parametrize("fast_json", [True, False])
+def test_dumps_compact(monkeypatch, fast_json):
+    # the same bytes, whether orjson is installed or not
+    if not fast_json:
+        monkeypatch.setattr(jsonl_utils, "orjson", None)
+    line = dumps({"id": "A:1", "xref": ["B:1", "B:2"], "name": "é"})
+    assert line == '{"id":"A:1","xref":["B:1","B:2"],"name":"é"}'.encode("utf-8")
+
+
+def test_jsonl_writer():
+    FH = io.BytesIO()
+    writer = JsonlWriter(FH, flush_size=40)
+    writer.write({"id": "A:1", "name": "first"})
+    assert FH.getvalue() == b""
+    writer.write({"id": "A:2", "name": "second"})
+    assert FH.getvalue().count(b"\n") == 2
+    writer.write({"id": "A:3"})
+    writer.flush()
+    assert list(read_jsonl(io.BytesIO(FH.getvalue()))) == [
+        {"id": "A:1", "name": "first"},
+        {"id": "A:2", "name": "second"},
+        {"id": "A:3"},
+    ]
@@ -1,3 +1,4 @@
+import uuid
 import pytest
 import pandas as pd
 import numpy as np
@@ -11,6 +12,7 @@ from kgx.utils.kgx_utils import (
     get_biolink_element,
     get_biolink_ancestors,
     generate_edge_key,
+    generate_edge_hash_id,
     contract,
     expand,
     camelcase_to_sentencecase,
@@ -210,6 +212,28 @@ def test_generate_uuid():
     assert s.startswith("urn:uuid:")
 
 
+def test_generate_edge_hash_id():
+    """
+    Test generation of deterministic edge identifiers by generate_edge_hash_id method.
+    """
+    edge = {
+        "subject": "HGNC:11603",
+        "predicate": "biolink:affects",
+        "object": "CHEBI:15365",
+        "object_aspect_qualifier": "activity",
+        "publications": ["PMID:1"],
+    }
+    s = generate_edge_hash_id(edge)
+    assert s.startswith("urn:uuid:")
+    assert uuid.UUID(s[len("urn:uuid:"):]).version == 8
+    # evidence and provenance do not change the identity of an edge...
+    assert generate_edge_hash_id({**edge, "publications": ["PMID:2"], "id": "X"}) == s
+    assert generate_edge_hash_id(dict(reversed(list(edge.items())))) == s
+    # ... while qualifiers do
+    assert generate_edge_hash_id({**edge, "object_aspect_qualifier": "abundance"}) != s
+    assert generate_edge_hash_id({**edge, "negated": True}) != s
+
+
 @pytest.mark.parametrize(
     "query",
     [
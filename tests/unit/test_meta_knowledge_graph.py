@@ -11,6 +11,7 @@ from kgx.graph_operations.meta_knowledge_graph import (
     MetaKnowledgeGraph,
 )
 from kgx.transformer import Transformer
+from kgx.utils.node_index import NodeCatalog
 
 from tests import RESOURCE_DIR, TARGET_DIR
 
@@ -281,3 +282,98 @@ def test_meta_knowledge_graph_of_complex_graph_data():
     data = json.load(open(output_filename))
     assert data["name"] == "Complex Test Graph"
     print(f"\n{json.dumps(data, indent=4)}")
+
+
+def test_meta_knowledge_graph_merge():
+    """
+    Test merging meta knowledge graphs compiled from shards of a graph.
+    """
+    input_args = {
+        "filename": [
+            os.path.join(RESOURCE_DIR, "graph_nodes.tsv"),
+            os.path.join(RESOURCE_DIR, "graph_edges.tsv"),
+        ],
+        "format": "tsv",
+    }
+    mkg_args = {"edge_facet_properties": ["aggregator_knowledge_source"]}
+    records = []
+    transformer = Transformer(stream=True)
+    transformer.transform(
+        input_args=input_args, inspector=lambda t, rec: records.append((t, rec))
+    )
+
+    expected = MetaKnowledgeGraph(**mkg_args)
+    for entity_type, rec in records:
+        expected(entity_type, rec)
+
+    # nodes and edges are each analysed in two shards
+    node_shards = [MetaKnowledgeGraph(**mkg_args) for _ in range(2)]
+    nodes = [r for r in records if r[0] == GraphEntityType.NODE]
+    for entity_type, rec in nodes:
+        # duplicate nodes are sharded together
+        node_shards[ord(rec[0][-1]) % 2](entity_type, rec)
+    mkg = MetaKnowledgeGraph(**mkg_args)
+    for shard in node_shards:
+        mkg.merge(shard)
+
+    edge_shards = [MetaKnowledgeGraph(**mkg_args) for _ in range(2)]
+    edges = [r for r in records if r[0] == GraphEntityType.EDGE]
+    for shard in edge_shards:
+        shard.share_node_catalog(mkg)
+    for i, (entity_type, rec) in enumerate(edges):
+        edge_shards[i % 2](entity_type, rec)
+    for shard in edge_shards:
+        shard.node_catalog = NodeCatalog()
+        mkg.merge(shard)
+
+    assert mkg.get_total_nodes_count() == 512
+    assert mkg.get_total_edges_count() == expected.get_total_edges_count()
+    assert mkg.predicates == expected.predicates
+    assert mkg.get_node_stats() == expected.get_node_stats()
+
+    def edge_key(e):
+        return e["subject"], e["predicate"], e["object"]
+
+    edge_stats = sorted(mkg.get_edge_stats(), key=edge_key)
+    expected_edge_stats = sorted(expected.get_edge_stats(), key=edge_key)
+    assert len(edge_stats) == len(expected_edge_stats) == 13
+    for edge, expected_edge in zip(edge_stats, expected_edge_stats):
+        assert edge["count"] == expected_edge["count"]
+        assert edge["count_by_source"] == expected_edge["count_by_source"]
+        assert set(edge["relations"]) == set(expected_edge["relations"])
+
+
+def test_meta_knowledge_graph_merge_duplicate_nodes():
+    """
+    Test merging meta knowledge graphs compiled from shards of a graph,
+    where duplicate nodes are split across the shards.
+    """
+    input_args = {
+        "filename": [os.path.join(RESOURCE_DIR, "graph_nodes.tsv")],
+        "format": "tsv",
+    }
+    records = []
+    transformer = Transformer(stream=True)
+    transformer.transform(
+        input_args=input_args, inspector=lambda t, rec: records.append((t, rec))
+    )
+
+    expected = MetaKnowledgeGraph()
+    for entity_type, rec in records:
+        expected(entity_type, rec)
+
+    node_shards = [MetaKnowledgeGraph() for _ in range(2)]
+    for i, (entity_type, rec) in enumerate(records):
+        node_shards[i % 2](entity_type, rec)
+    mkg = MetaKnowledgeGraph()
+    for k, shard in enumerate(node_shards):
+        # the nodes of the shard are only read again if duplicated in earlier shards
+        mkg.merge(shard, nodes=[rec for i, (_, rec) in enumerate(records) if i % 2 == k])
+
+    assert mkg.get_total_nodes_count() == 512
+    assert mkg.get_node_stats() == expected.get_node_stats()
+    assert "DUPLICATE_NODE" in mkg.get_errors("Warning")
+    category = MetaKnowledgeGraph.Category.get_category_curie_from_index(
+        mkg.get_category("biolink:Gene").get_cid()
+    )
+    assert category.startswith("biolink:")
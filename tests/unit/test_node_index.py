@@ -0,0 +1,129 @@
+import gc
+import os
+import pickle
+
+import pytest
+
+from kgx.utils.node_index import NodeCatalog, NodeSet, hash_node_id
+from tests import TARGET_DIR
+
+
+def test_hash_node_id():
+    assert hash_node_id("HGNC:11603") == hash_node_id("HGNC:11603")
+    assert hash_node_id("HGNC:11603") != hash_node_id("HGNC:11604")
+    assert 0 <= hash_node_id("HGNC:11603") < 2 ** 64
+
+
+@pytest.mark.parametrize("batch_size", [1000000, 3])
+def test_node_catalog(batch_size):
+    catalog = NodeCatalog(batch_size=batch_size)
+    for i in range(20):
+        catalog[f"CURIE:{i}"] = [i % 3, 5] if i % 2 else [i % 3]
+    assert len(catalog) == 20
+    assert "CURIE:7" in catalog
+    assert "CURIE:20" not in catalog
+    assert catalog["CURIE:7"] == (1, 5)
+    assert catalog["CURIE:8"] == (2,)
+    assert catalog.get("CURIE:20") is None
+    with pytest.raises(KeyError):
+        catalog["CURIE:20"]
+
+    catalog["CURIE:8"] = []
+    catalog.flush()
+    assert len(catalog) == 20
+    assert catalog["CURIE:8"] == ()
+
+
+def test_node_catalog_update():
+    catalog = NodeCatalog(batch_size=2)
+    catalog["A:1"] = [0]
+    catalog["A:2"] = [0, 1]
+    other = NodeCatalog(batch_size=2)
+    other["A:2"] = [1]
+    other["A:3"] = [1]
+    other["A:4"] = []
+    assert catalog.count_common(other) == 1
+    assert len(catalog) == 2
+    duplicates = catalog.update(other, {0: 0, 1: 2})
+    assert duplicates == 1
+    assert len(catalog) == 4
+    assert catalog["A:2"] == (0, 1)
+    assert catalog["A:3"] == (2,)
+    assert catalog["A:4"] == ()
+
+
+def test_node_catalog_spill():
+    directory = os.path.join(TARGET_DIR, "node_catalog")
+    os.makedirs(directory, exist_ok=True)
+    catalog = NodeCatalog(directory=directory, batch_size=4)
+    for i in range(10):
+        catalog[f"CURIE:{i}"] = [i]
+    catalog.flush()
+    assert any(path for _, _, path in catalog._runs)
+    assert catalog["CURIE:3"] == (3,)
+
+    copy = pickle.loads(pickle.dumps(catalog))
+    assert len(copy) == 10
+    assert copy["CURIE:9"] == (9,)
+    assert "CURIE:10" not in copy
+
+
+def test_node_catalog_hand_over():
+    directory = os.path.join(TARGET_DIR, "node_catalog_hand_over")
+    os.makedirs(directory, exist_ok=True)
+    catalog = NodeCatalog(directory=directory, batch_size=4)
+    for i in range(10):
+        catalog[f"CURIE:{i}"] = [i]
+    catalog.hand_over()
+    data = pickle.dumps(catalog)
+    spill_directory = catalog._spill_directory
+    # the spilled runs outlive the catalog, e.g. in a worker process...
+    del catalog
+    gc.collect()
+    assert os.path.isdir(spill_directory)
+    copy = pickle.loads(data)
+    assert copy["CURIE:9"] == (9,)
+    # ...up until the copy they were handed over to is garbage collected
+    del copy
+    gc.collect()
+    assert not os.path.exists(spill_directory)
+
+
+@pytest.mark.parametrize("capacity", [1 << 16, 2])
+def test_node_set(capacity):
+    nodes = NodeSet(capacity=capacity)
+    for i in range(200):
+        nodes.add(f"CURIE:{i}")
+    nodes.add("CURIE:7")
+    assert len(nodes) == 200
+    assert "CURIE:7" in nodes
+    assert "CURIE:200" not in nodes
+    assert all(f"CURIE:{i}" in nodes for i in range(200))
+
+    nodes.clear()
+    assert len(nodes) == 0
+    assert "CURIE:7" not in nodes
+
+
+@pytest.mark.parametrize("batch_size", [10000, 1])
+def test_node_set_exact(monkeypatch, batch_size):
+    # every identifier collides
+    monkeypatch.setattr(NodeSet, "_key", staticmethod(lambda n: 42))
+
+    approximate = NodeSet()
+    approximate.add("CURIE:1")
+    assert "CURIE:2" in approximate
+
+    nodes = NodeSet(exact=True, batch_size=batch_size)
+    nodes.add("CURIE:1")
+    assert "CURIE:2" not in nodes
+    nodes.add("CURIE:2")
+    nodes.add("CURIE:1")
+    assert len(nodes) == 2
+    assert "CURIE:1" in nodes and "CURIE:2" in nodes
+    assert "CURIE:3" not in nodes
+
+    nodes.clear()
+    assert len(nodes) == 0
+    assert "CURIE:1" not in nodes
+    nodes.close()
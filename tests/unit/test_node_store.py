@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from kgx.utils.node_store import NodeStore
+
+
+@pytest.mark.parametrize("cache_size", [100, 3])
+def test_node_store(cache_size):
+    """
+    Test adding, updating (in place), looking up and removing
+    node records in a NodeStore, spilling to disk or not.
+    """
+    with NodeStore(cache_size=cache_size, batch_size=2) as store:
+        for i in range(20):
+            store[f"CURIE:{i}"] = {"id": f"CURIE:{i}", "name": [f"node {i}"]}
+        # updated in place, after having been spilled
+        store["CURIE:0"]["name"].append("node zero")
+        store["CURIE:1"]["category"] = ["biolink:Gene"]
+        assert "CURIE:2" in store
+        assert "CURIE:20" not in store
+        assert store.get("CURIE:20") is None
+        assert store.pop("CURIE:3") == {"id": "CURIE:3", "name": ["node 3"]}
+        assert store.pop("CURIE:3", None) is None
+        with pytest.raises(KeyError):
+            del store["CURIE:3"]
+        del store["CURIE:4"]
+
+        items = list(store.items())
+        assert [n for n, _ in items] == sorted(
+            f"CURIE:{i}" for i in range(20) if i not in {3, 4}
+        )
+        records = dict(items)
+        assert records["CURIE:0"]["name"] == ["node 0", "node zero"]
+        assert records["CURIE:1"]["category"] == ["biolink:Gene"]
+        assert len(store) == 18
+        filename = store._filename
+        assert filename is not None
+    assert not os.path.exists(filename)
@@ -0,0 +1,80 @@
+import json
+import os
+import shutil
+
+from kgx.transformer import Transformer
+from kgx.utils import parse_cache
+from kgx.utils.parse_cache import CACHE_FILE_SUFFIX
+from tests import RESOURCE_DIR, TARGET_DIR
+
+
+def transform(cache_directory, name, **input_args):
+    t = Transformer(stream=True)
+    filename = os.path.join(TARGET_DIR, name)
+    t.transform(
+        input_args={
+            "filename": [
+                os.path.join(RESOURCE_DIR, "graph_nodes.tsv"),
+                os.path.join(RESOURCE_DIR, "graph_edges.tsv"),
+            ],
+            "format": "tsv",
+            "cache_directory": cache_directory,
+            **input_args,
+        },
+        output_args={"filename": filename, "format": "jsonl"},
+    )
+    with open(f"{filename}_nodes.jsonl") as NFH, open(f"{filename}_edges.jsonl") as EFH:
+        return [json.loads(line) for line in NFH], [json.loads(line) for line in EFH]
+
+
+def cache_files(cache_directory):
+    return sorted(f for f in os.listdir(cache_directory) if f.endswith(CACHE_FILE_SUFFIX))
+
+
+def test_parse_cache():
+    """
+    Transform a graph twice with a cache directory, the second transform
+    reading the records back from the cache.
+    """
+    cache_directory = os.path.join(TARGET_DIR, "parse_cache")
+    shutil.rmtree(cache_directory, ignore_errors=True)
+
+    nodes1, edges1 = transform(cache_directory, "test_parse_cache_1")
+    # one cache file per input file
+    files = cache_files(cache_directory)
+    assert len(files) == 2
+
+    nodes2, edges2 = transform(cache_directory, "test_parse_cache_2")
+    assert cache_files(cache_directory) == files
+    assert nodes2 == nodes1
+    # the random ids given to edges without an id are those cached
+    assert edges2 == edges1
+
+    # different arguments miss the cache
+    nodes3, edges3 = transform(
+        cache_directory, "test_parse_cache_3", knowledge_source="infores:kgx-test"
+    )
+    assert len(cache_files(cache_directory)) == 4
+    assert [e["id"] for e in edges3] != [e["id"] for e in edges1]
+    assert all(e["knowledge_source"] == "infores:kgx-test" for e in edges3)
+
+
+def test_parse_cache_callable(monkeypatch):
+    """
+    Transform a graph with a cache directory and a Callable knowledge
+    source rule, which is not cached, since the rule has no cache key.
+    """
+    cache_directory = os.path.join(TARGET_DIR, "parse_cache_callable")
+    shutil.rmtree(cache_directory, ignore_errors=True)
+    warnings = []
+    monkeypatch.setattr(parse_cache.log, "warning", warnings.append)
+
+    def rule(sources=None):
+        return ["infores:kgx-test"]
+
+    nodes, edges = transform(
+        cache_directory, "test_parse_cache_callable", knowledge_source=rule
+    )
+    assert not cache_files(cache_directory)
+    assert len(warnings) == 2
+    assert all(e["knowledge_source"] == ["infores:kgx-test"] for e in edges)
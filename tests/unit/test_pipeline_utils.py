@@ -0,0 +1,124 @@
+import json
+import os
+
+import pytest
+
+from kgx import transformer
+from kgx.cli.cli_utils import transform, transform_source
+from kgx.transformer import Transformer
+from kgx.utils.pipeline_utils import read_ahead
+from tests import RESOURCE_DIR, TARGET_DIR
+
+
+def records(n, fail_on=None):
+    for i in range(n):
+        if i == fail_on:
+            raise ValueError(f"Failed on {i}")
+        yield f"CURIE:{i}", {"id": f"CURIE:{i}"}
+
+
+@pytest.mark.parametrize("batch_size", [1, 4, 1000])
+def test_read_ahead(batch_size):
+    assert list(read_ahead(records(25), batch_size=batch_size, queue_size=2)) == list(
+        records(25)
+    )
+
+
+def test_read_ahead_error():
+    recs = read_ahead(records(25, fail_on=10), batch_size=4, queue_size=2)
+    with pytest.raises(ValueError):
+        for _ in recs:
+            pass
+
+
+def test_read_ahead_base_exception():
+    def source():
+        yield from records(10)
+        raise KeyboardInterrupt()
+
+    recs = read_ahead(source(), batch_size=4, queue_size=2)
+    with pytest.raises(KeyboardInterrupt):
+        for _ in recs:
+            pass
+
+
+def test_read_ahead_close():
+    closed = []
+
+    def source():
+        try:
+            yield from records(100)
+        finally:
+            closed.append(True)
+
+    recs = read_ahead(source(), batch_size=4, queue_size=2)
+    assert next(recs) == ("CURIE:0", {"id": "CURIE:0"})
+    recs.close()
+    assert closed == [True]
+
+
+def test_pipelined_transform():
+    """
+    Transform a graph with a pipelined Transformer, which yields
+    the same graph as a Transformer which is not pipelined.
+    """
+    outputs = []
+    for pipelined in (False, True):
+        t = Transformer(stream=True, pipelined=pipelined)
+        filename = os.path.join(TARGET_DIR, f"test_pipelined_{pipelined}")
+        t.transform(
+            input_args={
+                "filename": [
+                    os.path.join(RESOURCE_DIR, "graph_nodes.tsv"),
+                    os.path.join(RESOURCE_DIR, "graph_edges.tsv"),
+                ],
+                "format": "tsv",
+            },
+            output_args={"filename": filename, "format": "jsonl"},
+        )
+        with open(f"{filename}_nodes.jsonl") as NFH, open(f"{filename}_edges.jsonl") as EFH:
+            nodes = [json.loads(line) for line in NFH]
+            # edges without an id are given a random one
+            edges = [json.loads(line) for line in EFH]
+            for edge in edges:
+                edge.pop("id")
+            outputs.append((nodes, edges))
+    assert outputs[0] == outputs[1]
+
+
+def test_pipelined_cli_transform(monkeypatch):
+    """
+    Pipeline transforms from the command line arguments, and from the
+    input of a source of a transform configuration.
+    """
+    pipelined = []
+
+    def recording_read_ahead(records, *args, **kwargs):
+        pipelined.append(True)
+        return read_ahead(records, *args, **kwargs)
+
+    monkeypatch.setattr(transformer, "read_ahead", recording_read_ahead)
+    inputs = [
+        os.path.join(RESOURCE_DIR, "graph_nodes.tsv"),
+        os.path.join(RESOURCE_DIR, "graph_edges.tsv"),
+    ]
+    transform(
+        inputs,
+        input_format="tsv",
+        output=os.path.join(TARGET_DIR, "test_pipelined_cli"),
+        output_format="jsonl",
+        stream=True,
+        pipelined=True,
+    )
+    assert pipelined
+    pipelined.clear()
+    transform_source(
+        "test_graph",
+        {
+            "input": {"format": "tsv", "filename": inputs, "pipelined": True},
+            "output": {"format": "jsonl", "filename": ["test_pipelined_config"]},
+        },
+        TARGET_DIR,
+        stream=True,
+    )
+    assert pipelined
@@ -1,6 +1,9 @@
+import pickle
+
 import pytest
 
 from kgx.prefix_manager import PrefixManager
+from kgx.utils.prefix_trie import PrefixTrie
 
 
 @pytest.mark.parametrize(
@@ -120,3 +123,48 @@ def test_prefix_manager_contract(query):
     """
     pm = PrefixManager()
     assert pm.contract(query[0]) == query[1]
+
+
+def test_prefix_manager_cache():
+    """
+    Test the cache of the PrefixManager, which is invalidated by
+    changes to the prefix map.
+    """
+    pm = PrefixManager(cache_size=10)
+    iri = "http://example.org/kgx/123"
+    assert pm.contract(iri) == iri
+    assert pm.contract(iri) == iri
+    pm.update_prefix_map({"KGX": "http://example.org/kgx/"})
+    assert pm.contract(iri) == "KGX:123"
+    assert pm.expand("KGX:123") == iri
+    info = pm.cache_info()
+    assert info["contract"]["hits"] == 1
+    assert info["contract"]["misses"] == 2
+    assert info["contract"]["size"] == 1
+    assert info["contract"]["maxsize"] == 10
+    assert info["expand"]["hit_rate"] == 0.0
+
+    pm2 = pickle.loads(pickle.dumps(pm))
+    assert pm2.contract(iri) == "KGX:123"
+
+
+def test_prefix_trie():
+    """
+    Test the contraction of IRIs by a PrefixTrie, to the shortest
+    CURIE of the namespaces which the IRI starts with.
+    """
+    trie = PrefixTrie(
+        [
+            {"EX": "http://example.org/", "EXA": "http://example.org/a/"},
+            {"EXB": "http://example.org/b/", "EX": "http://example.com/"},
+        ]
+    )
+    assert trie.contract("http://example.org/123") == "EX:123"
+    assert trie.contract("http://example.org/a/123") == "EXA:123"
+    assert trie.contract("http://example.org/b/123") == "EXB:123"
+    assert trie.contract("http://example.net/123") is None
+    # the first prefix map takes precedence
+    assert trie.expand("EX:123") == "http://example.org/123"
+    assert trie.expand("EXB:123") == "http://example.org/b/123"
+    assert trie.expand("FOO:123") is None
+    assert trie.expand("123") is None
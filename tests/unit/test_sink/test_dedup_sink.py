@@ -0,0 +1,108 @@
+import json
+import os
+
+import pytest
+
+from kgx.cli.cli_utils import transform, transform_source
+from kgx.sink import DedupSink, Sink
+from kgx.transformer import Transformer
+from tests import RESOURCE_DIR, TARGET_DIR
+
+
+class ListSink(Sink):
+    def __init__(self, owner):
+        super().__init__(owner)
+        self.nodes = []
+        self.edges = []
+        self.finalized = False
+
+    def write_node(self, record):
+        self.nodes.append(record)
+
+    def write_edge(self, record):
+        self.edges.append(record)
+
+    def finalize(self):
+        self.finalized = True
+
+
+@pytest.mark.parametrize("batch_size", [100000, 2])
+def test_write_dedup(batch_size):
+    """
+    Write duplicated nodes and edges via DedupSink.
+    """
+    t = Transformer()
+    sink = ListSink(t)
+    s = DedupSink(t, sink, directory=TARGET_DIR, batch_size=batch_size)
+    s.write_node({"id": "C", "name": "Node C"})
+    s.write_node({"id": "A", "name": "Node A", "category": ["biolink:Gene"]})
+    s.write_node({"id": "B", "name": "Node B"})
+    s.write_node({"id": "A", "name": "Gene A", "taxon": "NCBITaxon:9606"})
+    s.write_node({"id": "D", "name": "Node D"})
+    s.write_node({"id": "C", "description": "C"})
+    for _ in range(3):
+        s.write_edge({"subject": "A", "predicate": "biolink:related_to", "object": "B"})
+    s.write_edge({"subject": "A", "predicate": "biolink:interacts_with", "object": "B"})
+    s.finalize()
+
+    assert sink.finalized
+    assert sink.nodes == [
+        {"id": "A", "name": "Gene A", "category": ["biolink:Gene"], "taxon": "NCBITaxon:9606"},
+        {"id": "B", "name": "Node B"},
+        {"id": "C", "name": "Node C", "description": "C"},
+        {"id": "D", "name": "Node D"},
+    ]
+    assert [e["predicate"] for e in sink.edges] == [
+        "biolink:interacts_with",
+        "biolink:related_to",
+    ]
+    assert not [f for f in os.listdir(TARGET_DIR) if f.startswith("kgx-dedup-")]
+
+
+def test_stream_transform_deduplicate():
+    """
+    Stream a graph, whose nodes are read twice, deduplicating the records.
+    """
+    nodes_file = os.path.join(RESOURCE_DIR, "graph_nodes.tsv")
+    filename = os.path.join(TARGET_DIR, "test_stream_deduplicate")
+    output_args = {"filename": filename, "format": "jsonl", "deduplicate": True}
+    t = Transformer(stream=True)
+    t.transform(
+        input_args={"filename": [nodes_file, nodes_file], "format": "tsv"},
+        output_args=output_args,
+    )
+    # the output arguments are left as they were given
+    assert output_args["deduplicate"]
+    with open(f"{filename}_nodes.jsonl") as FH:
+        ids = [json.loads(line)["id"] for line in FH]
+    assert len(ids) == 512
+    assert ids == sorted(set(ids))
+
+
+def test_cli_transform_deduplicate(tmp_path):
+    """
+    Stream a graph, whose nodes are read twice, deduplicating the records,
+    from the command line arguments and from a transform configuration.
+    """
+    nodes_file = os.path.join(RESOURCE_DIR, "graph_nodes.tsv")
+    transform(
+        [nodes_file, nodes_file],
+        input_format="tsv",
+        output=str(tmp_path / "arguments"),
+        output_format="jsonl",
+        stream=True,
+        deduplicate=True,
+    )
+    transform_source(
+        "test_graph",
+        {
+            "input": {"format": "tsv", "filename": [nodes_file, nodes_file]},
+            "output": {"format": "jsonl", "filename": ["configured"], "deduplicate": True},
+        },
+        str(tmp_path),
+        stream=True,
+    )
+    for name in ["arguments", "configured"]:
+        with open(tmp_path / f"{name}_nodes.jsonl") as FH:
+            ids = [json.loads(line)["id"] for line in FH]
+        assert len(ids) == 512
@@ -1,4 +1,5 @@
 import os
+from multiprocessing import Pool
 
 import pytest
 import rdflib
@@ -82,6 +83,81 @@ def test_write_rdf3():
     assert len(lines) == 44
 
 
+def write_rdf(filename, reify_all_edges, **kwargs):
+    graph = get_graph()
+    t = Transformer()
+    s = RdfSink(owner=t, filename=filename, reify_all_edges=reify_all_edges, **kwargs)
+    for n, data in graph.nodes(data=True):
+        s.write_node(data)
+    for i, (u, v, k, data) in enumerate(graph.edges(data=True, keys=True)):
+        # edge ids, such that the reified nodes are the same in every file
+        s.write_edge({**data, "id": f"urn:uuid:{i}"})
+    s.finalize()
+    return open(filename, "rb").read()
+
+
+@pytest.mark.parametrize("reify_all_edges", [True, False])
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"buffer_size": 1, "cache_size": 2},
+        {"processes": 2},
+    ],
+)
+def test_write_rdf_buffered(reify_all_edges, kwargs):
+    """
+    Write a graph as RDF N-Triples using RdfSink, with a small buffer and cache
+    or with a pool of processes, the same as with the defaults.
+    """
+    expected = write_rdf(
+        os.path.join(TARGET_DIR, "test_graph_buffered1.nt"), reify_all_edges
+    )
+    actual = write_rdf(
+        os.path.join(TARGET_DIR, "test_graph_buffered2.nt"), reify_all_edges, **kwargs
+    )
+    assert len(expected.splitlines()) == (44 if reify_all_edges else 18)
+    assert actual == expected
+
+
+def test_write_rdf_processes_daemonic():
+    """
+    Write a graph as RDF N-Triples using RdfSink, with several processes,
+    within a (daemonic) process of a pool, which writes it by itself.
+    """
+    expected = write_rdf(os.path.join(TARGET_DIR, "test_graph_daemonic1.nt"), True)
+    with Pool(processes=1) as pool:
+        actual = pool.apply(
+            write_rdf,
+            (os.path.join(TARGET_DIR, "test_graph_daemonic2.nt"), True),
+            {"processes": 2},
+        )
+    assert actual == expected
+
+
+def test_write_rdf_processes_failed():
+    """
+    Write a graph as RDF N-Triples using RdfSink, with several processes,
+    from records which fail to be read, which terminates the pool of processes.
+    """
+
+    def records():
+        for n, data in get_graph().nodes(data=True):
+            yield n, data
+        raise ValueError("unreadable record")
+
+    t = Transformer()
+    s = RdfSink(
+        owner=t,
+        filename=os.path.join(TARGET_DIR, "test_graph_failed.nt"),
+        processes=2,
+    )
+    s.batch_size = 1
+    with pytest.raises(ValueError):
+        t.process(records(), s)
+    assert s._pool is None
+    assert s.FH.closed
+
+
 @pytest.mark.parametrize(
     "query",
     [
@@ -2,8 +2,11 @@ import json
 import os
 import gzip
 
+import pytest
+
 from kgx.graph.nx_graph import NxGraph
 from kgx.sink.trapi_sink import TrapiSink
+from kgx.utils.node_index import NodeSet
 from tests import TARGET_DIR
 
 
@@ -216,4 +219,75 @@ def test_write_trapi_compressed():
     
     assert 'knowledge_graph' in content
     assert len(content['knowledge_graph']['nodes']) == 2
-    assert len(content['knowledge_graph']['edges']) == 1
\ No newline at end of file
+    assert len(content['knowledge_graph']['edges']) == 1
+
+def test_write_trapi_json_edges_before_nodes():
+    """
+    Write edges ahead of nodes as (compressed) TRAPI JSON using TrapiSink.
+    """
+    filename = os.path.join(TARGET_DIR, "test_trapi_edges_first.json")
+    s = TrapiSink(filename=filename, compression="gz")
+    s.write_edge({"id": "e1", "subject": "A", "object": "B", "predicate": "biolink:related_to"})
+    s.write_node({"id": "A", "name": "Node A", "category": ["biolink:NamedThing"]})
+    s.write_edge({"id": "e2", "subject": "B", "object": "A", "predicate": "biolink:related_to"})
+    s.write_node({"id": "B", "name": "Node B", "category": ["biolink:NamedThing"]})
+    s.finalize()
+
+    with gzip.open(f"{filename}.gz", 'rt') as f:
+        text = f.read()
+    content = json.loads(text)
+    assert list(content['knowledge_graph']['nodes']) == ["A", "B"]
+    assert list(content['knowledge_graph']['edges']) == ["e1", "e2"]
+    assert text.index('"edges"') > text.index('"B"')
+
+
+@pytest.mark.parametrize("format", ["json", "jsonl"])
+def test_write_trapi_duplicates(format):
+    """
+    Write nodes and edges more than once, e.g. from several input files,
+    as TRAPI using TrapiSink, each of which is written just once.
+    """
+    filename = os.path.join(TARGET_DIR, f"test_trapi_duplicates.{format}")
+    s = TrapiSink(filename=filename, format=format)
+    for name in ["Node A", "Other Node A"]:
+        s.write_node({"id": "A", "name": name, "category": ["biolink:NamedThing"]})
+        s.write_node({"id": "B", "name": "Node B", "category": ["biolink:NamedThing"]})
+        s.write_edge({"id": "e1", "subject": "A", "object": "B", "predicate": "biolink:related_to"})
+        s.write_edge({"subject": "B", "object": "A", "predicate": "biolink:related_to"})
+    s.finalize()
+
+    with open(filename) as f:
+        if format == "json":
+            def no_duplicate_keys(pairs):
+                keys = [k for k, _ in pairs]
+                assert len(keys) == len(set(keys))
+                return dict(pairs)
+
+            kg = json.load(f, object_pairs_hook=no_duplicate_keys)["knowledge_graph"]
+            nodes = kg["nodes"]
+            edges = kg["edges"]
+        else:
+            lines = [json.loads(line) for line in f]
+            nodes = {r["id"]: r for r in lines if r["type"] == "node"}
+            edges = {r["id"]: r for r in lines if r["type"] == "edge"}
+            assert len(lines) == 1 + 2 + 2
+    assert list(nodes) == ["A", "B"]
+    assert nodes["A"]["name"] == "Node A"
+    assert list(edges) == ["e1", "B-biolink:related_to-A"]
+
+
+def test_write_trapi_hash_collisions(monkeypatch):
+    """
+    Write nodes whose ids all have the same hash, none of which is skipped.
+    """
+    monkeypatch.setattr(NodeSet, "_key", staticmethod(lambda n: 42))
+    filename = os.path.join(TARGET_DIR, "test_trapi_collisions.json")
+    s = TrapiSink(filename=filename, format="json")
+    for n in ["A", "B", "C", "A"]:
+        s.write_node({"id": n, "category": ["biolink:NamedThing"]})
+    s.finalize()
+
+    with open(filename) as f:
+        nodes = json.load(f)["knowledge_graph"]["nodes"]
+    assert list(nodes) == ["A", "B", "C"]
+    assert s.duplicate_count == 1
@@ -1,9 +1,12 @@
 import os
 
+import pytest
+
 from kgx.graph.nx_graph import NxGraph
 from kgx.sink import TsvSink
+from kgx.source import TsvSource
 from kgx.transformer import Transformer
-from tests import TARGET_DIR
+from tests import RESOURCE_DIR, TARGET_DIR
 
 
 def test_write_tsv1():
@@ -153,4 +156,126 @@ def test_write_tsv3():
         s.write_edge(data)
     s.finalize()
 
-    assert os.path.exists(os.path.join(TARGET_DIR, "test_graph_archive.tar.gz"))
\ No newline at end of file
+    assert os.path.exists(os.path.join(TARGET_DIR, "test_graph_archive.tar.gz"))
+
+@pytest.mark.parametrize(
+    "compression,filenames",
+    [
+        ("gz", ["test_graph_compressed_nodes.tsv.gz", "test_graph_compressed_edges.tsv.gz"]),
+        ("bz2", ["test_graph_compressed_nodes.tsv.bz2", "test_graph_compressed_edges.tsv.bz2"]),
+        ("tar", ["test_graph_compressed.tar"]),
+        ("tar.gz", ["test_graph_compressed.tar.gz"]),
+        ("tar.bz2", ["test_graph_compressed.tar.bz2"]),
+    ],
+)
+def test_write_tsv_compressed(compression, filenames):
+    """
+    Write a graph to compressed TSV files, or a compressed TSV archive,
+    using TsvSink, and read it back using TsvSource.
+    """
+    t = Transformer()
+    s = TsvSink(
+        owner=t,
+        filename=os.path.join(TARGET_DIR, "test_graph_compressed"),
+        format="tsv",
+        compression=compression,
+        compression_threads=2,
+        node_properties={"id", "name"},
+        edge_properties={"subject", "predicate", "object"},
+    )
+    for i in range(1000):
+        s.write_node({"id": f"CURIE:{i}", "name": f"Node {i}"})
+    for i in range(1, 1000):
+        s.write_edge({"subject": f"CURIE:{i}", "predicate": "biolink:related_to", "object": f"CURIE:{i - 1}"})
+    s.finalize()
+
+    nodes = []
+    edges = []
+    for filename in filenames:
+        assert os.path.exists(os.path.join(TARGET_DIR, filename))
+        source = TsvSource(t)
+        for rec in source.parse(
+            os.path.join(TARGET_DIR, filename),
+            format="tsv",
+            compression=compression,
+        ):
+            if len(rec) == 4:
+                edges.append(rec)
+            else:
+                nodes.append(rec)
+    assert [n for n, _ in nodes] == [f"CURIE:{i}" for i in range(1000)]
+    assert nodes[42][1]["name"] == "Node 42"
+    assert len(edges) == 999
+    assert not any(name.endswith(".part") for name in os.listdir(TARGET_DIR))
+
+
+def test_write_tsv_discover_properties():
+    """
+    Write a graph to TSV files using TsvSink, discovering the
+    columns of the nodes file from the records themselves.
+    """
+    t = Transformer()
+    s = TsvSink(
+        owner=t,
+        filename=os.path.join(TARGET_DIR, "test_graph_discovered"),
+        format="tsv",
+        discover_properties=True,
+        edge_properties={"subject", "predicate", "object"},
+    )
+    s.write_node({"id": "A", "name": "Node A", "category": ["biolink:Gene"]})
+    s.write_node({"id": "B", "category": ["biolink:Gene"], "taxon": "NCBITaxon:9606"})
+    s.write_edge({"subject": "A", "predicate": "biolink:related_to", "object": "B", "extra": "x"})
+    s.finalize()
+
+    with open(os.path.join(TARGET_DIR, "test_graph_discovered_nodes.tsv")) as FH:
+        lines = FH.read().splitlines()
+    assert lines == [
+        "id\tcategory\tname\ttaxon",
+        "A\tbiolink:Gene\tNode A\t",
+        "B\tbiolink:Gene\t\tNCBITaxon:9606",
+    ]
+    with open(os.path.join(TARGET_DIR, "test_graph_discovered_edges.tsv")) as FH:
+        lines = FH.read().splitlines()
+    assert lines == ["subject\tpredicate\tobject", "A\tbiolink:related_to\tB"]
+
+
+def test_stream_transform_tsv_columns():
+    """
+    Stream a graph to TSV without declaring its columns, discovering them
+    instead, which yields the same columns as a transform building the
+    graph in memory.
+    """
+    input_args = {
+        "filename": [
+            os.path.join(RESOURCE_DIR, "graph_nodes.tsv"),
+            os.path.join(RESOURCE_DIR, "graph_edges.tsv"),
+        ],
+        "format": "tsv",
+    }
+    headers = []
+    for stream, discover_properties in ((False, False), (True, True), (True, False)):
+        t = Transformer(stream=stream)
+        filename = os.path.join(TARGET_DIR, f"test_stream_columns_{stream}")
+        output_args = {"filename": filename, "format": "tsv"}
+        if discover_properties:
+            output_args["discover_properties"] = True
+        t.transform(input_args=dict(input_args), output_args=dict(output_args))
+        # a stream without declared (nor discovered) columns is reported
+        missing_property = stream and not discover_properties
+        assert bool(t.get_errors("Warning").get("MISSING_PROPERTY")) == missing_property
+        with open(f"{filename}_nodes.tsv") as NFH, open(f"{filename}_edges.tsv") as EFH:
+            headers.append((NFH.readline(), EFH.readline()))
+    assert headers[0] == headers[1]
+    assert headers[0] != headers[2]
+
+
+def test_stream_transform_tsv_output_args():
+    """
+    Stream a graph to TSV, leaving the output arguments as they were given.
+    """
+    output_args = {"filename": os.path.join(TARGET_DIR, "test_stream_args"), "format": "tsv"}
+    Transformer(stream=True).transform(
+        input_args={"filename": [os.path.join(RESOURCE_DIR, "graph_nodes.tsv")], "format": "tsv"},
+        output_args=output_args,
+    )
+    assert output_args == {"filename": os.path.join(TARGET_DIR, "test_stream_args"), "format": "tsv"}
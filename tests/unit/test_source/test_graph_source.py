@@ -94,3 +94,42 @@ def test_read_graph2():
     assert e1["relation"] == "biolink:related_to"
     print("e1:", e1)
     assert "Test Graph" in e1["knowledge_source"]
+
+
+def test_read_graph_trusted():
+    """
+    Read from an NxGraph, holding sanitized records, using GraphSource.
+    Its records are then yielded as they are (as copies), except for nodes
+    which were only added as the subject or object of an edge.
+    """
+    graph = NxGraph()
+    graph.add_node("A", **{"id": "A", "name": "node A", "category": ["biolink:Gene"]})
+    graph.add_edge(
+        "A",
+        "C",
+        **{
+            "subject": "A",
+            "predicate": "biolink:related_to",
+            "object": "C",
+        }
+    )
+    t = Transformer()
+    s = GraphSource(t)
+
+    records = [rec for rec in s.parse(graph=graph, trusted=True) if rec]
+    nodes = {rec[0]: rec[1] for rec in records if len(rec) == 2}
+    edges = [rec for rec in records if len(rec) == 4]
+
+    assert nodes["A"]["name"] == "node A"
+    # the provenance is set on the records, rather than on the graph,
+    # and changing a record (e.g. in a sink) leaves the graph as it was
+    assert "provided_by" in nodes["A"]
+    assert "provided_by" not in graph.get_node("A")
+    nodes["A"]["_key"] = "A"
+    assert "_key" not in graph.get_node("A")
+    assert nodes["C"]["id"] == "C"
+    assert nodes["C"]["category"] == ["biolink:NamedThing"]
+    u, v, k, data = edges[0]
+    assert data["predicate"] == "biolink:related_to"
+    data["_from"] = "A"
+    assert "_from" not in graph.get_edge(u, v, k)
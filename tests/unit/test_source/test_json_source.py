@@ -1,8 +1,9 @@
+import json
 import os
 
 from kgx.source import JsonSource
 from kgx.transformer import Transformer
-from tests import RESOURCE_DIR
+from tests import RESOURCE_DIR, TARGET_DIR
 
 
 def test_read_json1():
@@ -132,3 +133,48 @@ def test_read_json_compressed():
     assert e["object"] == "MONDO:0017148"
     assert e["predicate"] == "biolink:related_to"
     assert e["relation"] == "RO:0004013"
+
+
+def test_read_json_single_pass():
+    """
+    Read from a JSON using JsonSource, in a single pass.
+    """
+    t = Transformer()
+    s = JsonSource(t)
+    s.set_provenance_map({})
+    records = list(s.read_json(os.path.join(RESOURCE_DIR, "valid.json")))
+    assert records == [rec for rec in JsonSource(t).parse(os.path.join(RESOURCE_DIR, "valid.json")) if rec]
+
+
+def test_read_json_single_pass_edges_first():
+    """
+    Read from a JSON listing edges of several graphs ahead of their nodes,
+    using JsonSource, in a single pass.
+    """
+    graphs = {
+        "graphs": [
+            {
+                "edges": [{"subject": "A:1", "predicate": "biolink:related_to", "object": "A:2"}],
+                "nodes": [{"id": "A:1"}, {"id": "A:2"}],
+            },
+            {
+                "nodes": [{"id": "A:3"}],
+                "edges": [{"subject": "A:3", "predicate": "biolink:related_to", "object": "A:1"}],
+            },
+        ]
+    }
+    filename = os.path.join(TARGET_DIR, "graphs_edges_first.json")
+    with open(filename, "w") as f:
+        json.dump(graphs, f)
+
+    t = Transformer()
+    s = JsonSource(t)
+    records = list(
+        s.read_json(
+            filename,
+            node_prefixes=("graphs.item.nodes",),
+            edge_prefixes=("graphs.item.edges",),
+        )
+    )
+    assert [rec[0] for rec in records] == ["A:1", "A:2", "A:3", "A:1", "A:3"]
+    assert [len(rec) for rec in records] == [2, 2, 2, 4, 4]
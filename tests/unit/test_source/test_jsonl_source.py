@@ -1,7 +1,9 @@
+import json
 import os
 
 from kgx.source import JsonlSource
 from kgx.transformer import Transformer
+from kgx.utils.jsonl_utils import read_jsonl_blocks
 from tests import RESOURCE_DIR
 
 
@@ -84,3 +86,41 @@ def test_read_jsonl2():
     assert e["predicate"] == "biolink:related_to"
     assert e["relation"] == "RO:0004013"
     assert "Test JSON" in e["knowledge_source"]
+
+
+def test_read_jsonl_parallel():
+    """
+    Read from JSON Lines using JsonlSource, turning blocks of lines into
+    records in parallel processes, which yields the same records, in the
+    same order, as reading them in a single process.
+    """
+    results = []
+    for processes in (1, 2):
+        t = Transformer()
+        s = JsonlSource(t)
+        records = []
+        for name in ("valid_nodes.jsonl", "valid_edges.jsonl"):
+            g = s.parse(
+                os.path.join(RESOURCE_DIR, name),
+                processes=processes,
+                knowledge_source="Test JSON",
+            )
+            records.extend(rec for rec in g if rec)
+        results.append((records, s.node_properties, s.edge_properties))
+    assert results[0] == results[1]
+    assert len(results[1][0]) == 12
+
+
+def test_read_in_pool():
+    """
+    Read blocks of JSON Lines in a pool of processes, many
+    more blocks than processes, yielding records in order.
+    """
+    t = Transformer()
+    s = JsonlSource(t)
+    with open(os.path.join(RESOURCE_DIR, "valid_nodes.jsonl"), "rb") as FH:
+        g = s.read_in_pool("read_node_lines", read_jsonl_blocks(FH, block_size=100), 2, {})
+        nodes = [rec[0] for rec in g]
+    with open(os.path.join(RESOURCE_DIR, "valid_nodes.jsonl"), "rb") as FH:
+        assert nodes == [json.loads(line)["id"] for line in FH if line.strip()]
+    assert "name" in s.node_properties
@@ -1,11 +1,18 @@
+import io
 import os
+from multiprocessing import Pool
 from pprint import pprint
 
 import pytest
+from rdflib import BNode, Literal, URIRef
+from rdflib.plugins.parsers.ntriples import ParseError
 
-from kgx.source import RdfSource
+from kgx.parsers.ntriples_parser import CustomNTriplesParser, FastNTriplesParser
+from kgx.source import RdfSource, rdf_source
+from kgx.source.rdf_source import split_triples
 from kgx.transformer import Transformer
-from tests import RESOURCE_DIR
+from kgx.utils.node_store import NodeStore
+from tests import RESOURCE_DIR, TARGET_DIR
 from tests.unit import load_graph_dictionary
 
 
@@ -389,3 +396,188 @@ def test_prepare_data_dict(query):
         assert new_data[k] == v
     for k, v in query[3].items():
         assert new_data[k] == v
+
+
+class TripleSink(object):
+    def __init__(self):
+        self.triples = []
+
+    def triple(self, s, p, o):
+        # blank nodes are given new (random) identifiers by either parser
+        self.triples.append(
+            tuple(
+                (type(x).__name__, None if isinstance(x, BNode) else x, getattr(x, "datatype", None))
+                for x in (s, p, o)
+            )
+        )
+        yield None
+
+
+def parse_triples(parser_class, f):
+    sink = TripleSink()
+    for _ in parser_class(sink).parse(f):
+        pass
+    return sink.triples
+
+
+@pytest.mark.parametrize("filename", ["test1.nt", "test2.nt", "test3.nt", "oban-test.nt"])
+def test_fast_ntriples_parser(filename):
+    """
+    Parse N-Triples with the FastNTriplesParser, which yields the
+    same triples as the CustomNTriplesParser.
+    """
+    with open(os.path.join(RESOURCE_DIR, "rdf", filename), "rb") as f:
+        expected = parse_triples(CustomNTriplesParser, f)
+    with open(os.path.join(RESOURCE_DIR, "rdf", filename), "rb") as f:
+        assert parse_triples(FastNTriplesParser, f) == expected
+
+
+def test_fast_ntriples_parser_terms():
+    """
+    Parse escaped literals and IRIs, datatypes, language tags,
+    blank nodes and CRLF line endings with the FastNTriplesParser.
+    """
+    data = (
+        '<http://example.org/x> <http://example.org/p> "caf\\u00E9 \\"q\\"\\n"@en .\r\n'
+        '<http://example.org/x> <http://example.org/p> "12"^^<http://www.w3.org/2001/XMLSchema#integer> .\r\n'
+        "_:b1 <http://example.org/p> _:b2 .\r\n"
+        '<http://example.org/y\\u00E9> <http://example.org/p> "ünï" .'
+    )
+    expected = parse_triples(CustomNTriplesParser, io.BytesIO(data.encode("utf-8")))
+    triples = parse_triples(FastNTriplesParser, io.BytesIO(data.encode("utf-8")))
+    assert triples == expected
+    assert triples[0][2] == ("Literal", Literal('café "q"\n', lang="en"), None)
+    assert triples[3][0] == ("URIRef", URIRef("http://example.org/yé"), None)
+
+    with pytest.raises(ParseError):
+        parse_triples(FastNTriplesParser, io.BytesIO(b"<http://example.org/x> .\n"))
+
+
+def test_split_triples(tmp_path):
+    """
+    Split N-Triples by their subject, every triple of a
+    subject being in the same file, in order.
+    """
+    lines = [
+        f"<http://example.org/{i % 7}> <http://example.org/p> \"{i}\" ." for i in range(100)
+    ]
+    with open(os.path.join(RESOURCE_DIR, "rdf", "test3.nt"), "rb") as f:
+        lines += f.read().decode("utf-8").splitlines()
+    paths = split_triples(io.BytesIO("\n".join(lines).encode("utf-8")), str(tmp_path), 3)
+    assert 1 < len(paths) <= 3
+    parts = []
+    for path in paths:
+        with open(path) as f:
+            parts.append(f.read().splitlines())
+    assert sorted(line for part in parts for line in part) == sorted(lines)
+    for part in parts:
+        subjects = {line.split()[0] for line in part}
+        assert not any(line.split()[0] in subjects for p in parts if p is not part for line in p)
+        # the triples of a subject are in the order of the file
+        assert [line for line in lines if line.split()[0] in subjects] == part
+
+
+@pytest.mark.parametrize("filename", ["test1.nt", "oban-test.nt"])
+def test_read_nt_processes(filename):
+    """
+    Read from an RDF N-Triple file using RdfSource, in a pool of processes.
+    """
+    graphs = []
+    for processes in (1, 2):
+        s = RdfSource(Transformer())
+        g = s.parse(os.path.join(RESOURCE_DIR, "rdf", filename), processes=processes)
+        nodes, edges = load_graph_dictionary(g)
+        graphs.append(
+            (
+                {n: normalize(data) for n, data in nodes.items()},
+                sorted((k, normalize(e)) for k, es in edges.items() for e in es),
+            )
+        )
+    assert graphs[0] == graphs[1]
+
+
+def normalize(data):
+    return sorted((k, sorted(v) if isinstance(v, list) else v) for k, v in data.items())
+
+
+def test_read_nt_node_cache_directory():
+    """
+    Read from an RDF N-Triple file using RdfSource, spilling
+    the records of the nodes to disk.
+    """
+    graphs = []
+    for kwargs in ({}, {"node_cache_directory": TARGET_DIR}):
+        s = RdfSource(Transformer())
+        g = s.parse(os.path.join(RESOURCE_DIR, "rdf", "oban-test.nt"), **kwargs)
+        nodes, edges = load_graph_dictionary(g)
+        graphs.append(
+            (
+                {n: normalize(data) for n, data in nodes.items()},
+                sorted((k, normalize(e)) for k, es in edges.items() for e in es),
+            )
+        )
+    assert graphs[0] == graphs[1]
+
+
+def test_read_nt_processes_directory(tmp_path, monkeypatch):
+    """
+    Read from an RDF N-Triple file using RdfSource, in a pool of processes,
+    splitting the triples into the node cache directory.
+    """
+    directories = []
+
+    def recording_split_triples(f, directory, parts):
+        directories.append(directory)
+        return split_triples(f, directory, parts)
+
+    monkeypatch.setattr(rdf_source, "split_triples", recording_split_triples)
+    s = RdfSource(Transformer())
+    g = s.parse(
+        os.path.join(RESOURCE_DIR, "rdf", "test1.nt"),
+        processes=2,
+        node_cache_directory=str(tmp_path),
+    )
+    records = [rec for rec in g if rec]
+    assert records
+    assert os.path.dirname(directories[0]) == str(tmp_path)
+    assert not list(tmp_path.iterdir())
+
+
+def _read_nt(filename):
+    s = RdfSource(Transformer())
+    return len([rec for rec in s.parse(filename, processes=2) if rec])
+
+
+def test_read_nt_processes_daemonic():
+    """
+    Read from an RDF N-Triple file using RdfSource, with several processes,
+    within a (daemonic) process of a pool, which reads it by itself.
+    """
+    filename = os.path.join(RESOURCE_DIR, "rdf", "test1.nt")
+    with Pool(processes=1) as pool:
+        count = pool.apply(_read_nt, (filename,))
+    assert count == len([rec for rec in RdfSource(Transformer()).parse(filename) if rec])
+
+
+def test_read_nt_node_cache_directory_closed(tmp_path, monkeypatch):
+    """
+    Read from an RDF N-Triple file using RdfSource, spilling the records
+    of the nodes to disk, and close the parse before its end, which
+    removes the records spilled to disk.
+    """
+    monkeypatch.setattr(
+        rdf_source,
+        "NodeStore",
+        lambda directory: NodeStore(directory, cache_size=1, batch_size=1),
+    )
+    s = RdfSource(Transformer())
+    g = s.parse(
+        os.path.join(RESOURCE_DIR, "rdf", "test1.nt"),
+        node_cache_directory=str(tmp_path),
+    )
+    for rec in g:
+        if rec and len(rec) == 2:
+            break
+    assert list(tmp_path.iterdir())
+    g.close()
+    assert not list(tmp_path.iterdir())
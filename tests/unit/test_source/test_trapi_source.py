@@ -384,3 +384,59 @@ def test_read_compressed_trapi():
     # Check nodes and edges
     assert len(nodes.keys()) == 2
     assert len(edges.keys()) == 1
+
+
+def test_read_trapi_json_edges_before_nodes():
+    """
+    Read from a TRAPI Response listing its edges ahead of its nodes,
+    with the biolink_version after the message.
+    """
+    t = Transformer()
+    s = TrapiSource(t)
+
+    temp_trapi = {
+        "message": {
+            "knowledge_graph": {
+                "edges": {
+                    "e1": {
+                        "subject": "HGNC:12345",
+                        "predicate": "biolink:gene_associated_with_condition",
+                        "object": "MONDO:6789"
+                    }
+                },
+                "nodes": {
+                    "HGNC:12345": {
+                        "name": "Test Gene",
+                        "categories": ["biolink:Gene"]
+                    },
+                    "MONDO:6789": {
+                        "name": "Test Disease",
+                        "categories": ["biolink:Disease"]
+                    }
+                }
+            }
+        },
+        "biolink_version": "4.2.1"
+    }
+
+    temp_file = os.path.join(TARGET_DIR, "test_trapi_edges_first.json")
+    with open(temp_file, 'w') as f:
+        json.dump(temp_trapi, f)
+
+    records = list(s.parse(temp_file))
+    assert [len(rec) for rec in records] == [2, 2, 4]
+    assert records[2][:2] == ("HGNC:12345", "MONDO:6789")
+    assert s.biolink_version == "4.2.1"
+
+
+def test_read_trapi_json_batches():
+    """
+    Read batches of records from a TRAPI JSON.
+    """
+    t = Transformer()
+    s = TrapiSource(t)
+
+    batches = list(s.parse_batches(os.path.join(RESOURCE_DIR, "rsa_sample.json"), batch_size=3))
+    assert [len(batch) for batch in batches] == [3, 3, 2]
+    assert all(len(rec) == 2 for rec in batches[0])
+    assert all(len(rec) == 4 for rec in batches[-1])
@@ -1,8 +1,11 @@
 import os
+import tarfile
+
+import pytest
 
 from kgx.source import TsvSource
 from kgx.transformer import Transformer
-from tests import RESOURCE_DIR
+from tests import RESOURCE_DIR, TARGET_DIR
 
 
 def test_read_tsv():
@@ -146,6 +149,117 @@ def test_read_tsv_tar_gz_compressed_inverted_file_order():
     assert len(edges) == 1
 
 
+@pytest.mark.parametrize("processes", [1, 3])
+def test_read_tsv_tar_gz_parallel(processes):
+    """
+    Read a compressed TSV TAR archive, of several node and edge files
+    (edge files first), in parallel processes using TsvSource.
+    """
+    filename = os.path.join(TARGET_DIR, "test-parallel.tar.gz")
+    with tarfile.open(filename, "w:gz") as tar:
+        for i in range(3):
+            for name in ("test_edges.tsv", "test_nodes.tsv"):
+                tar.add(os.path.join(RESOURCE_DIR, name), arcname=f"part{i}/{name}")
+
+    t = Transformer()
+    s = TsvSource(t)
+    g = s.parse(
+        filename=filename,
+        format="tsv",
+        compression="tar.gz",
+        processes=processes,
+        knowledge_source="infores:test",
+    )
+    records = [rec for rec in g if rec]
+    kinds = ["edge" if len(rec) == 4 else "node" for rec in records]
+    assert kinds == ["node"] * 9 + ["edge"] * 3
+    assert all(rec[3]["knowledge_source"] == "infores:test" for rec in records[9:])
+    assert "id" in s.node_properties
+    assert "predicate" in s.edge_properties
+
+
+def test_read_tsv_tar_gz_archive_directory(tmp_path):
+    """
+    Read a compressed TSV TAR archive, of more node files than
+    processes, in parallel processes using TsvSource, extracting
+    its members into a given directory.
+    """
+    filename = os.path.join(TARGET_DIR, "test-archive-directory.tar.gz")
+    with tarfile.open(filename, "w:gz") as tar:
+        for i in range(6):
+            for name in ("test_nodes.tsv", "test_edges.tsv"):
+                tar.add(os.path.join(RESOURCE_DIR, name), arcname=f"part{i}/{name}")
+
+    archive_directory = tmp_path / "archive"
+    archive_directory.mkdir()
+    t = Transformer()
+    s = TsvSource(t)
+    g = s.parse(
+        filename=filename,
+        format="tsv",
+        compression="tar.gz",
+        processes=2,
+        archive_directory=str(archive_directory),
+    )
+    records = [next(g)]
+    assert len(list(archive_directory.iterdir())) == 1
+    records += [rec for rec in g if rec]
+    kinds = ["edge" if len(rec) == 4 else "node" for rec in records]
+    assert kinds == ["node"] * 18 + ["edge"] * 6
+    # the extracted members, and spooled records, are removed
+    assert not list(archive_directory.iterdir())
+
+
+def test_read_tsv_parallel():
+    """
+    Read a TSV using TsvSource, turning its chunks into records
+    in parallel processes, which yields the same records, in the
+    same order, as reading it in a single process.
+    """
+    results = []
+    for processes in (1, 2):
+        t = Transformer()
+        s = TsvSource(t)
+        records = []
+        for name in ("graph_nodes.tsv", "graph_edges.tsv"):
+            g = s.parse(
+                filename=os.path.join(RESOURCE_DIR, name),
+                format="tsv",
+                processes=processes,
+                knowledge_source="infores:test",
+            )
+            for rec in g:
+                if rec:
+                    if len(rec) == 4:
+                        # edges without an id are given a random one
+                        rec[-1].pop("id")
+                    records.append(rec)
+        results.append((records, s.node_properties, s.edge_properties, t.get_errors()))
+    assert results[0] == results[1]
+    assert len(results[1][0]) == 1073
+
+
+def test_read_tsv_edge_hash_ids():
+    """
+    Read edges without an id using TsvSource, giving them
+    ids derived from a hash of each edge, on every run.
+    """
+    ids = []
+    for _ in range(2):
+        t = Transformer()
+        s = TsvSource(t)
+        s.set_edge_id_type("hash")
+        g = s.parse(filename=os.path.join(RESOURCE_DIR, "graph_edges.tsv"), format="tsv")
+        edges = [rec[3] for rec in g if rec]
+        ids.append([e["id"] for e in edges])
+    assert ids[0] == ids[1]
+    # duplicated edges are given the same id
+    triples = {(e["subject"], e["predicate"], e["object"]) for e in edges}
+    assert len(set(ids[0])) == len(triples) < len(ids[0])
+    with pytest.raises(ValueError):
+        s.set_edge_id_type("serial")
+
+
 def test_incorrect_nodes():
     """
     Test basic validation of a node, where the node is invalid.
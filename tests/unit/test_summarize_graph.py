@@ -20,6 +20,8 @@ from kgx.graph_operations.summarize_graph import (
     COUNT_BY_SPO,
 )
 from kgx.transformer import Transformer
+from kgx.utils.node_index import NodeCatalog
+from kgx.utils.kgx_utils import GraphEntityType
 from tests import RESOURCE_DIR, TARGET_DIR
 
 try:
@@ -332,3 +334,106 @@ def test_summarize_graph_inspector():
         ]
         == 16
     )
+
+
+def test_summarize_graph_merge():
+    """
+    Test merging graph summaries compiled from shards of a graph.
+    """
+    input_args = {
+        "filename": [
+            os.path.join(RESOURCE_DIR, "graph_nodes.tsv"),
+            os.path.join(RESOURCE_DIR, "graph_edges.tsv"),
+        ],
+        "format": "tsv",
+    }
+    summary_args = {
+        "name": "Test Graph Summary",
+        "node_facet_properties": ["provided_by"],
+        "edge_facet_properties": ["knowledge_source"],
+    }
+    records = []
+    transformer = Transformer(stream=True)
+    transformer.transform(
+        input_args=input_args, inspector=lambda t, rec: records.append((t, rec))
+    )
+
+    expected = GraphSummary(**summary_args)
+    for entity_type, rec in records:
+        expected(entity_type, rec)
+
+    # nodes and edges are each summarized in two shards
+    node_shards = [GraphSummary(**summary_args) for _ in range(2)]
+    nodes = [r for r in records if r[0] == GraphEntityType.NODE]
+    for entity_type, rec in nodes:
+        # duplicate nodes are sharded together
+        node_shards[ord(rec[0][-1]) % 2](entity_type, rec)
+    summary = GraphSummary(**summary_args)
+    for shard in node_shards:
+        summary.merge(shard)
+
+    edge_shards = [GraphSummary(**summary_args) for _ in range(2)]
+    edges = [r for r in records if r[0] == GraphEntityType.EDGE]
+    for shard in edge_shards:
+        shard.share_node_catalog(summary)
+    for i, (entity_type, rec) in enumerate(edges):
+        edge_shards[i % 2](entity_type, rec)
+    for shard in edge_shards:
+        shard.node_catalog = NodeCatalog()
+        summary.merge(shard)
+
+    stats = summary.get_graph_summary()
+    expected_stats = expected.get_graph_summary()
+    # id prefixes are listed in the order first seen
+    id_prefixes = stats["node_stats"].pop(NODE_ID_PREFIXES_BY_CATEGORY)
+    expected_id_prefixes = expected_stats["node_stats"].pop(NODE_ID_PREFIXES_BY_CATEGORY)
+    assert {k: set(v) for k, v in id_prefixes.items()} == {
+        k: set(v) for k, v in expected_id_prefixes.items()
+    }
+    assert stats == expected_stats
+
+    with pytest.raises(RuntimeError):
+        summary.merge(GraphSummary())
+
+
+def test_summarize_graph_merge_duplicate_nodes():
+    """
+    Test merging graph summaries compiled from shards of a graph,
+    where duplicate nodes are split across the shards.
+    """
+    input_args = {
+        "filename": [os.path.join(RESOURCE_DIR, "graph_nodes.tsv")],
+        "format": "tsv",
+    }
+    summary_args = {"node_facet_properties": ["provided_by"]}
+    records = []
+    transformer = Transformer(stream=True)
+    transformer.transform(
+        input_args=input_args, inspector=lambda t, rec: records.append((t, rec))
+    )
+
+    expected = GraphSummary(**summary_args)
+    for entity_type, rec in records:
+        expected(entity_type, rec)
+
+    node_shards = [GraphSummary(**summary_args) for _ in range(2)]
+    for i, (entity_type, rec) in enumerate(records):
+        node_shards[i % 2](entity_type, rec)
+    assert node_shards[1].node_catalog.count_common(node_shards[0].node_catalog) > 0
+    summary = GraphSummary(**summary_args)
+    for k, shard in enumerate(node_shards):
+        # the nodes of the shard are only read again if duplicated in earlier shards
+        summary.merge(shard, nodes=[rec for i, (_, rec) in enumerate(records) if i % 2 == k])
+
+    node_stats = summary.get_node_stats()
+    expected_node_stats = expected.get_node_stats()
+    assert node_stats[TOTAL_NODES] == 512
+    assert node_stats[COUNT_BY_CATEGORY] == expected_node_stats[COUNT_BY_CATEGORY]
+    assert node_stats[COUNT_BY_ID_PREFIXES] == expected_node_stats[COUNT_BY_ID_PREFIXES]
+    assert (
+        node_stats[COUNT_BY_ID_PREFIXES_BY_CATEGORY]
+        == expected_node_stats[COUNT_BY_ID_PREFIXES_BY_CATEGORY]
+    )
+    assert "DUPLICATE_NODE" in summary.get_errors("Warning")
+    # the category index ids shared by all the summaries
+    assert GraphSummary.Category.get_category_curie_by_index(0) == "unknown"